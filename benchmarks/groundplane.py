@@ -0,0 +1,107 @@
+"""Ground plane render time versus scene size: drawing the full scene on
+every tile, recording the scene once and replaying it per tile in one
+process and with one process per CPU. All must produce the same textures,
+whose names are hashes of their pixels. The full scene column only
+rasterizes, the others also encode and write PNGs. The last column renders
+a 500/250/125 pixels per metre pyramid.
+
+Needs pycairo. Run from the repository root: python -m benchmarks.groundplane
+"""
+import cairo, hashlib, os, re, tempfile, time
+import numpy as np
+from commonroad import utils
+from commonroad.generator import primitive, road_generation
+from commonroad.renderer import groundplane
+from commonroad.renderer.scene import SceneIndex
+
+SIZES = [10, 40, 160]
+PYRAMID = (500, 250, 125)
+
+def long_road(segments):
+    primitives = [primitive.StraightLine({"length": "1", "isStart": "true"})]
+    for i in range(1, segments):
+        if i % 8 == 0:
+            primitives.append(primitive.Intersection({"turn": "straight", "rule": "stop"}))
+        elif i % 8 == 4:
+            primitives.append(primitive.ZebraCrossing({"length": "0.5"}))
+        elif i % 8 == 6:
+            primitives.append(primitive.BlockedAreaObstacle({"length": "1", "width": "0.2"}))
+        elif i % 2 == 1:
+            primitives.append(primitive.LeftCircularArc({"radius": "2", "angle": "40"}))
+        else:
+            primitives.append(primitive.RightCircularArc({"radius": "2", "angle": "40"}))
+    road = road_generation.generate_road(primitives, 0)
+    return road_generation.export(road, road_generation.Config())
+
+def full_scene_hashes(scene, models):
+    """Pixel hashes of the tiles of `models`, each drawn with all drawables
+    of the scene, without culling or recording."""
+    tile_extent = groundplane.TILE_SIZE / groundplane.PIXEL_PER_UNIT
+    bounding_box = utils.BoundingBox(
+        scene.bounding_box.x_min - groundplane.PADDING,
+        scene.bounding_box.y_min - groundplane.PADDING,
+        scene.bounding_box.x_max + groundplane.PADDING,
+        scene.bounding_box.y_max + groundplane.PADDING)
+    (_, calls) = groundplane.scene_drawables(scene, groundplane.boundary_runs(scene))
+    surface = cairo.ImageSurface(cairo.FORMAT_A8, groundplane.TILE_SIZE, groundplane.TILE_SIZE)
+    hashes = {}
+    for (x, y) in re.findall(r"name='Tile/(\d+)-(\d+)'", models):
+        ctx = cairo.Context(surface)
+        ctx.set_operator(cairo.OPERATOR_CLEAR)
+        ctx.paint()
+        ctx.set_operator(cairo.OPERATOR_OVER)
+        ctx.translate(0, groundplane.TILE_SIZE / 2)
+        ctx.scale(1, -1)
+        ctx.translate(0, -groundplane.TILE_SIZE / 2)
+        ctx.scale(groundplane.PIXEL_PER_UNIT, groundplane.PIXEL_PER_UNIT)
+        ctx.translate(-bounding_box.x_min, -bounding_box.y_min)
+        ctx.translate(-int(x) * tile_extent, -int(y) * tile_extent)
+        ctx.set_source_rgb(1, 1, 1)
+        for (function, argument) in calls:
+            function(ctx, argument)
+        surface.flush()
+        pixels = np.frombuffer(surface.get_data(), dtype=np.uint8).reshape(
+            groundplane.TILE_SIZE, surface.get_stride())[:, :groundplane.TILE_SIZE]
+        hashes["{0}-{1}".format(x, y)] = hashlib.sha256(pixels.copy()).hexdigest()
+    return hashes
+
+def tile_hashes(models):
+    return dict(re.findall(r"name='Tile/(\d+-\d+)'>.*?<name>Tile/(\w+)</name>", models, re.S))
+
+def measure(scene, jobs=1, resolutions=(groundplane.PIXEL_PER_UNIT,)):
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        models = groundplane.draw(scene, tmp, jobs, resolutions=resolutions)
+        return (time.perf_counter() - start, models)
+
+def main():
+    jobs = os.cpu_count()
+    print("{:>8} {:>8} {:>6} {:>10} {:>10} {:>10} {:>10} {:>10} {:>12}".format("segments",
+        "lanelets", "tiles", "drawables", "full [s]", "record [s]", "1 job [s]",
+        "{0} jobs [s]".format(jobs), "pyramid [s]"))
+    for segments in SIZES:
+        scene = SceneIndex(long_road(segments))
+        (_, calls) = groundplane.scene_drawables(scene, groundplane.boundary_runs(scene))
+        bounding_box = scene.bounding_box
+        start = time.perf_counter()
+        groundplane.record_scene(groundplane.PreparedTiles(
+            bounding_box, calls, {}, None, None, None, groundplane.PIXEL_PER_UNIT, None))
+        record_time = time.perf_counter() - start
+        (serial_time, serial_models) = measure(scene)
+        (parallel_time, parallel_models) = measure(scene, jobs)
+        if parallel_models != serial_models:
+            raise AssertionError("parallel rendering changed the tiles")
+        start = time.perf_counter()
+        full_hashes = full_scene_hashes(scene, serial_models[0])
+        full_time = time.perf_counter() - start
+        if full_hashes != tile_hashes(serial_models[0]):
+            raise AssertionError("culled and recorded tiles differ from drawing the full scene")
+        (pyramid_time, pyramid_models) = measure(scene, jobs, PYRAMID)
+        if pyramid_models[0] != serial_models[0]:
+            raise AssertionError("the pyramid changed the full resolution tiles")
+        print("{:>8} {:>8} {:>6} {:>10} {:>10.2f} {:>10.2f} {:>10.2f} {:>10.2f} {:>12.2f}".format(
+            segments, len(scene.lanelets), serial_models[0].count("name='Tile/"),
+            len(calls), full_time, record_time, serial_time, parallel_time, pyramid_time))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Write time and peak memory of the streaming XML writer compared to the
+former PyXB toxml() + minidom pretty printing.
+
+Run from the repository root: python -m benchmarks.xml_writer
+"""
+import os, tempfile, time, tracemalloc
+import xml.dom.minidom
+from lxml import etree
+from commonroad import scenario, writer
+from commonroad.generator import primitive, road_generation
+
+SIZES = [50, 200]
+
+def long_road(segments):
+    primitives = [primitive.StraightLine({"length": "1", "isStart": "true"})]
+    for i in range(1, segments):
+        if i % 3 == 0:
+            primitives.append(primitive.StraightLine({"length": "1"}))
+        elif i % 3 == 1:
+            primitives.append(primitive.LeftCircularArc({"radius": "1.5", "angle": "30"}))
+        else:
+            primitives.append(primitive.RightCircularArc({"radius": "1.5", "angle": "30"}))
+    road = road_generation.generate_road(primitives, 0)
+    return road_generation.export(road, road_generation.Config())
+
+def write_pyxb(doc, path):
+    with open(path, "w") as file:
+        doc_parsed = xml.dom.minidom.parseString(scenario.to_schema(doc).toxml())
+        file.write(doc_parsed.toprettyxml())
+
+def write_streaming(doc, path):
+    with open(path, "w") as file:
+        writer.write(doc, file)
+
+def measure(function, doc, path):
+    start = time.perf_counter()
+    function(doc, path)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function(doc, path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+def main():
+    schema = etree.XMLSchema(etree.parse(os.path.join(
+        os.path.dirname(scenario.__file__), "schema-extended.xsd")))
+    print("{:>8} {:>8} {:>10} {:>10} {:>12} {:>12} {:>10}".format("segments",
+        "points", "pyxb [s]", "stream [s]", "pyxb [KiB]", "stream [KiB]",
+        "size [KiB]"))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "road.xml")
+        for segments in SIZES:
+            doc = long_road(segments)
+            points = sum(len(l.leftBoundary.points) + len(l.rightBoundary.points)
+                for l in doc.lanelet)
+            (old_time, old_peak) = measure(write_pyxb, doc, path)
+            (new_time, new_peak) = measure(write_streaming, doc, path)
+            if not schema.validate(etree.parse(path)):
+                raise AssertionError(str(schema.error_log))
+            print("{:>8} {:>8} {:>10.3f} {:>10.3f} {:>12.0f} {:>12.0f} {:>10.0f}".format(
+                segments, points, old_time, new_time, old_peak / 1024,
+                new_peak / 1024, os.path.getsize(path) / 1024))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Checks that the binary scenario format round-trips losslessly.
+
+Generates a scenario from each preset, writes it as XML, reads the XML
+back, converts it to the binary format (through a memory mapped file) and
+writes XML again. Both XML documents must be byte-identical.
+
+Run from the repository root:
+python -m checks.binary_roundtrip presets/driving.xml presets/parking.xml
+"""
+import io, os, sys, tempfile
+from lxml import etree
+from commonroad import binary, reader, writer
+from commonroad.generator import road_generation
+
+def to_xml(doc):
+    text = io.StringIO()
+    writer.write(doc, text)
+    return text.getvalue().encode("utf-8")
+
+def check(preset, directory):
+    primitives = road_generation.generate(etree.parse(preset))
+    xml = to_xml(road_generation.export(primitives, road_generation.Config()))
+    doc = reader.read(io.BytesIO(xml))
+
+    path = os.path.join(directory, "scenario" + binary.EXTENSION)
+    with open(path, "wb") as file:
+        binary.write(doc, file)
+    with open(path, "rb") as file:
+        assert binary.is_binary(file)
+    scenario = binary.load(path)
+    if to_xml(scenario.to_scenario()) != xml:
+        raise AssertionError("{0}: XML differs after binary round trip".format(
+            preset))
+    for (i, lanelet) in enumerate(doc.lanelet):
+        single = scenario.lanelet_by_id(lanelet.id)
+        if (single.leftBoundary.points != lanelet.leftBoundary.points).any():
+            raise AssertionError("{0}: lanelet {1} differs".format(preset, i))
+    print("{0}: ok, {1} bytes XML, {2} bytes binary".format(preset, len(xml),
+        os.path.getsize(path)))
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        for preset in sys.argv[1:]:
+            check(preset, directory)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Checks the start-up import budget of the command line tools.
+
+Runs each command with `python -X importtime` and fails if the summed
+import time exceeds its budget or if a module that should be loaded lazily
+was imported. The budgets leave headroom over typical times; the forbidden
+modules do not depend on the machine.
+
+Run from the repository root: python -m checks.import_time
+"""
+import os, subprocess, sys
+
+HEAVY = ["matplotlib", "scipy", "commonroad.schema", "pyxb", "cairo", "gi",
+    "pyarrow", "pkg_resources"]
+
+# (command line, budget in ms, modules that must not be imported)
+COMMANDS = [
+    (["road-generator.py", "--help"], 100, HEAVY + ["numpy", "lxml"]),
+    (["gazebo-renderer.py", "--help"], 100, HEAVY + ["numpy", "lxml"]),
+    (["generate-world.py", "--help"], 100, HEAVY + ["numpy", "lxml"]),
+    (["corpus-export.py", "--help"], 100, HEAVY + ["numpy", "lxml"]),
+    (["road-generator.py", "presets/driving.xml", "--seed", "1",
+        "-o", os.devnull], 500, HEAVY),
+]
+
+def import_times(command):
+    result = subprocess.run([sys.executable, "-X", "importtime"] + command,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        universal_newlines=True, check=True)
+    modules = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        (_, cumulative, name) = line[len("import time:"):].split("|")
+        # nested imports are indented and part of their parent's time
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+        modules[name.strip()] = int(cumulative)
+    return (total / 1000, modules)
+
+def main():
+    failed = False
+    for (command, budget, forbidden) in COMMANDS:
+        (total, modules) = import_times(command)
+        loaded = sorted(m for m in forbidden
+            if any(n == m or n.startswith(m + ".") for n in modules))
+        ok = total <= budget and not loaded
+        failed = failed or not ok
+        print("{0:4} {1:7.1f} ms (budget {2} ms)  {3}".format(
+            "ok" if ok else "FAIL", total, budget, " ".join(command)))
+        if loaded:
+            print("     imports lazily loaded modules: " + ", ".join(loaded))
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
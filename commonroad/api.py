@@ -0,0 +1,58 @@
+"""In-process road generation and rendering.
+
+    from commonroad import api
+    doc = api.generate("presets/driving.xml", seed=42)
+    api.render(doc, "world")
+
+This is what road-generator.py and gazebo-renderer.py do, without writing
+and re-parsing XML in between.
+"""
+import os
+from importlib import resources
+from lxml import etree
+from commonroad.generator import road_generation
+
+_preset_schema = None
+
+def preset_schema():
+    global _preset_schema
+    if _preset_schema is None:
+        with resources.files("commonroad.generator").joinpath(
+                "template-schema.xsd").open("rb") as file:
+            _preset_schema = etree.XMLSchema(etree.parse(file))
+    return _preset_schema
+
+def load_preset(preset):
+    """Parses and validates a preset from a file name or binary file object.
+    Already parsed presets (lxml elements or trees) are passed through."""
+    if isinstance(preset, (etree._Element, etree._ElementTree)):
+        return preset
+    return etree.parse(preset, etree.XMLParser(schema=preset_schema()))
+
+def generate(preset, seed=None, config=None):
+    """Generates a `commonroad.scenario.Scenario` from a preset.
+
+    The same preset and seed always give the same scenario, without seed
+    the system randomness is used.
+    """
+    if config is None:
+        config = road_generation.Config()
+    primitives = road_generation.generate(load_preset(preset), seed)
+    return road_generation.export(primitives, config)
+
+def render(doc, target_dir, add_vehicle=False, jobs=1, tile_cache=None, png_level=6,
+        resolutions=(500,), marking_mode="texture", tile_times=None):
+    """Renders a scenario to a Gazebo world in `target_dir`, the ground
+    tiles with `jobs` processes, reusing those in `tile_cache` (a
+    `commonroad.renderer.tilecache.TileCache`) if given and compressed
+    with zlib level `png_level`. Further ground `resolutions` (pixels per
+    metre, the highest divided by powers of two) are written as
+    worlds/world-<resolution>.sdf. `marking_mode` "mesh" draws road
+    markings as a mesh on a plain ground instead of textures. Raster and
+    encode times of the tiles are added to `tile_times` (a
+    `commonroad.renderer.groundplane.TileTimes`) if given."""
+    # cairo and Rsvg are only needed (and imported) for rendering
+    from commonroad.renderer import sdf
+    os.makedirs(target_dir, exist_ok=True)
+    sdf.generate_sdf(doc, target_dir, add_vehicle, jobs, tile_cache, png_level,
+        resolutions, marking_mode, tile_times)
@@ -0,0 +1,361 @@
+"""Memory-mappable binary scenario format.
+
+Layout (little endian, every section starts 8 byte aligned)::
+
+    header    HEADER: magic, format version, number of sections
+    table     one SECTION entry (name, byte offset, record count) per section
+    sections  plain numpy arrays, dtypes given by SECTION_DTYPES
+
+All coordinates live in the "points" section, an (n, 2) float64 array.
+Lanelet boundaries, polygons and island junctions store [start, end) index
+ranges into it, predecessor/successor lists ranges into "refs". Strings
+(types, line markings, driving directions, ...) are stored once in "text"
+and referenced by their index in "strings", -1 meaning None.
+
+A reader memory maps the file and only touches the records and points it
+actually accesses, see `BinaryScenario.lanelet`.
+"""
+import io, mmap
+import numpy as np
+from commonroad import scenario
+
+MAGIC = b"CRBIN\0\0\0"
+VERSION = 1
+EXTENSION = ".crb"
+
+HEADER = np.dtype([("magic", "S8"), ("version", "<u4"), ("sections", "<u4")])
+SECTION = np.dtype([("name", "S16"), ("offset", "<u8"), ("count", "<u8")])
+
+RANGE = np.dtype([("start", "<u8"), ("end", "<u8")])
+LANELET = np.dtype([
+    ("id", "<i8"),
+    ("leftBoundary", RANGE),
+    ("rightBoundary", RANGE),
+    ("predecessor", RANGE),
+    ("successor", RANGE),
+    ("adjacentLeft", "<i8"),
+    ("adjacentRight", "<i8"),
+    ("stopLineAttributes", "<f8", (3,)),
+    ("type", "<i4"),
+    ("leftLineMarking", "<i4"),
+    ("rightLineMarking", "<i4"),
+    ("adjacentLeftDrivingDir", "<i4"),
+    ("adjacentRightDrivingDir", "<i4"),
+    ("stopLine", "<i4"),
+    ("isStart", "u1"),
+    ("hasStopLineAttributes", "u1"),
+])
+OBSTACLE = np.dtype([
+    ("id", "<i8"),
+    ("rectangle", RANGE),
+    ("circle", RANGE),
+    ("polygon", RANGE),
+    ("role", "<i4"),
+    ("type", "<i4"),
+])
+RECTANGLE = np.dtype([("length", "<f8"), ("width", "<f8"),
+    ("orientation", "<f8"), ("centerPoint", "<f8", (2,))])
+CIRCLE = np.dtype([("radius", "<f8"), ("centerPoint", "<f8", (2,))])
+ORIENTED = np.dtype([("id", "<i8"), ("orientation", "<f8"),
+    ("centerPoint", "<f8", (2,)), ("type", "<i4")])
+
+SECTION_DTYPES = {
+    "points": np.dtype(("<f8", (2,))),
+    "refs": np.dtype("<i8"),
+    "text": np.dtype("u1"),
+    "strings": RANGE,
+    "lanelet": LANELET,
+    "obstacle": OBSTACLE,
+    "rectangle": RECTANGLE,
+    "circle": CIRCLE,
+    "polygon": RANGE,
+    "trafficSign": ORIENTED,
+    "ramp": ORIENTED,
+    "islandJunction": RANGE,
+    "roadMarking": ORIENTED,
+}
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+class _Builder:
+    def __init__(self):
+        self.points = []
+        self.point_count = 0
+        self.refs = []
+        self.strings = {}
+
+    def add_points(self, points):
+        start = self.point_count
+        self.points.append(points)
+        self.point_count += len(points)
+        return (start, self.point_count)
+
+    def add_refs(self, ids):
+        start = len(self.refs)
+        self.refs.extend(ids)
+        return (start, len(self.refs))
+
+    def string(self, value):
+        if value is None:
+            return -1
+        return self.strings.setdefault(str(value), len(self.strings))
+
+    def text_sections(self):
+        encoded = [s.encode("utf-8") for s in self.strings]
+        ends = np.cumsum([len(e) for e in encoded], dtype=np.uint64)
+        strings = np.zeros(len(encoded), RANGE)
+        strings["end"] = ends
+        strings["start"] = ends - [len(e) for e in encoded]
+        text = np.frombuffer(b"".join(encoded), np.uint8)
+        return (text, strings)
+
+def _adjacent(builder, adjacent):
+    if adjacent is None:
+        return (0, -1)
+    return (adjacent.ref, builder.string(adjacent.drivingDir))
+
+def _oriented(builder, objects, with_type=True):
+    records = np.zeros(len(objects), ORIENTED)
+    for (record, obj) in zip(records, objects):
+        record["id"] = obj.id
+        record["orientation"] = obj.orientation
+        record["centerPoint"] = obj.centerPoint
+        record["type"] = builder.string(obj.type) if with_type else -1
+    return records
+
+def _sections(doc):
+    builder = _Builder()
+
+    lanelets = np.zeros(len(doc.lanelet), LANELET)
+    for (record, lanelet) in zip(lanelets, doc.lanelet):
+        record["id"] = lanelet.id
+        record["leftBoundary"] = builder.add_points(lanelet.leftBoundary.points)
+        record["rightBoundary"] = builder.add_points(lanelet.rightBoundary.points)
+        record["predecessor"] = builder.add_refs(lanelet.predecessor)
+        record["successor"] = builder.add_refs(lanelet.successor)
+        (record["adjacentLeft"], record["adjacentLeftDrivingDir"]) = _adjacent(
+            builder, lanelet.adjacentLeft)
+        (record["adjacentRight"], record["adjacentRightDrivingDir"]) = _adjacent(
+            builder, lanelet.adjacentRight)
+        if lanelet.stopLineAttributes is not None:
+            record["hasStopLineAttributes"] = 1
+            record["stopLineAttributes"] = (
+                lanelet.stopLineAttributes.lineWidth,
+                lanelet.stopLineAttributes.segmentLength,
+                lanelet.stopLineAttributes.segmentGap)
+        record["type"] = builder.string(lanelet.type)
+        record["leftLineMarking"] = builder.string(lanelet.leftBoundary.lineMarking)
+        record["rightLineMarking"] = builder.string(lanelet.rightBoundary.lineMarking)
+        record["stopLine"] = builder.string(lanelet.stopLine)
+        record["isStart"] = bool(lanelet.isStart)
+
+    obstacles = np.zeros(len(doc.obstacle), OBSTACLE)
+    rectangles = []
+    circles = []
+    polygons = []
+    for (record, obstacle) in zip(obstacles, doc.obstacle):
+        shape = obstacle.shape
+        record["id"] = obstacle.id
+        record["role"] = builder.string(obstacle.role)
+        record["type"] = builder.string(obstacle.type)
+        record["rectangle"] = (len(rectangles), len(rectangles) + len(shape.rectangle))
+        record["circle"] = (len(circles), len(circles) + len(shape.circle))
+        record["polygon"] = (len(polygons), len(polygons) + len(shape.polygon))
+        rectangles.extend((r.length, r.width, r.orientation, r.centerPoint)
+            for r in shape.rectangle)
+        circles.extend((c.radius, c.centerPoint) for c in shape.circle)
+        polygons.extend(builder.add_points(p.points) for p in shape.polygon)
+
+    islands = [builder.add_points(j.points) for j in doc.islandJunction]
+
+    signs = _oriented(builder, doc.trafficSign)
+    ramps = _oriented(builder, doc.ramp, with_type=False)
+    markings = _oriented(builder, doc.roadMarking)
+    (text, strings) = builder.text_sections()
+    if builder.points:
+        points = np.concatenate([np.asarray(p, dtype="<f8").reshape(-1, 2)
+            for p in builder.points])
+    else:
+        points = np.empty((0, 2), "<f8")
+
+    return [
+        ("points", points),
+        ("refs", np.array(builder.refs, dtype="<i8")),
+        ("text", text),
+        ("strings", strings),
+        ("lanelet", lanelets),
+        ("obstacle", obstacles),
+        ("rectangle", np.array(rectangles, dtype=RECTANGLE)),
+        ("circle", np.array(circles, dtype=CIRCLE)),
+        ("polygon", np.array(polygons, dtype=RANGE)),
+        ("trafficSign", signs),
+        ("ramp", ramps),
+        ("islandJunction", np.array(islands, dtype=RANGE)),
+        ("roadMarking", markings),
+    ]
+
+def write(doc, file):
+    """Writes a `commonroad.scenario.Scenario` to a binary file object."""
+    sections = _sections(doc)
+    table = np.zeros(len(sections), SECTION)
+    offset = HEADER.itemsize + SECTION.itemsize * len(sections)
+    for (entry, (name, array)) in zip(table, sections):
+        offset = _align(offset)
+        entry["name"] = name.encode("ascii")
+        entry["offset"] = offset
+        entry["count"] = len(array)
+        offset += array.nbytes
+    header = np.array([(MAGIC, VERSION, len(sections))], dtype=HEADER)
+
+    file.write(header.tobytes())
+    file.write(table.tobytes())
+    position = HEADER.itemsize + table.nbytes
+    for (entry, (name, array)) in zip(table, sections):
+        file.write(b"\0" * (int(entry["offset"]) - position))
+        file.write(np.ascontiguousarray(array).tobytes())
+        position = int(entry["offset"]) + array.nbytes
+
+class BinaryScenario:
+    """Read-only view of a binary scenario in a buffer (bytes or mmap).
+
+    Arrays returned by this class are views into the buffer; they are not
+    writable and keep the buffer alive.
+    """
+
+    def __init__(self, buffer):
+        if len(buffer) < HEADER.itemsize:
+            raise ValueError("not a binary scenario: file too short")
+        header = np.frombuffer(buffer, HEADER, 1)[0]
+        if header["magic"] != MAGIC.rstrip(b"\0"):
+            raise ValueError("not a binary scenario: bad magic")
+        if header["version"] != VERSION:
+            raise ValueError("unsupported binary scenario version {0}".format(
+                header["version"]))
+        table = np.frombuffer(buffer, SECTION, int(header["sections"]),
+            HEADER.itemsize)
+        self._buffer = buffer
+        self.sections = {}
+        for entry in table:
+            name = entry["name"].decode("ascii")
+            if name in SECTION_DTYPES:
+                self.sections[name] = np.frombuffer(buffer, SECTION_DTYPES[name],
+                    int(entry["count"]), int(entry["offset"]))
+        text = self.sections["text"].tobytes()
+        self.strings = [text[start:end].decode("utf-8")
+            for (start, end) in self.sections["strings"].tolist()]
+        self._lanelet_index = None
+
+    def _string(self, index):
+        return None if index < 0 else self.strings[index]
+
+    def _points(self, points_range):
+        return self.sections["points"][points_range["start"]:points_range["end"]]
+
+    def _refs(self, refs_range):
+        return self.sections["refs"][refs_range["start"]:refs_range["end"]].tolist()
+
+    def _adjacent(self, ref, driving_dir):
+        if driving_dir < 0:
+            return None
+        return scenario.AdjacentRef(int(ref), self._string(driving_dir))
+
+    def lanelet_count(self):
+        return len(self.sections["lanelet"])
+
+    def lanelet(self, index):
+        """Builds lanelet number `index`, reading only its own data."""
+        record = self.sections["lanelet"][index]
+        lanelet = scenario.Lanelet(
+            scenario.Boundary(self._points(record["leftBoundary"]),
+                self._string(record["leftLineMarking"])),
+            scenario.Boundary(self._points(record["rightBoundary"]),
+                self._string(record["rightLineMarking"])),
+            self._string(record["type"]))
+        lanelet.id = int(record["id"])
+        lanelet.isStart = bool(record["isStart"])
+        lanelet.predecessor = self._refs(record["predecessor"])
+        lanelet.successor = self._refs(record["successor"])
+        lanelet.adjacentLeft = self._adjacent(record["adjacentLeft"],
+            record["adjacentLeftDrivingDir"])
+        lanelet.adjacentRight = self._adjacent(record["adjacentRight"],
+            record["adjacentRightDrivingDir"])
+        lanelet.stopLine = self._string(record["stopLine"])
+        if record["hasStopLineAttributes"]:
+            lanelet.stopLineAttributes = scenario.LineMarkingAttributes(
+                *record["stopLineAttributes"].tolist())
+        return lanelet
+
+    def lanelet_by_id(self, id):
+        if self._lanelet_index is None:
+            self._lanelet_index = {lanelet_id: i for (i, lanelet_id)
+                in enumerate(self.sections["lanelet"]["id"].tolist())}
+        return self.lanelet(self._lanelet_index[id])
+
+    def _obstacle(self, record):
+        rectangles = self.sections["rectangle"][
+            record["rectangle"]["start"]:record["rectangle"]["end"]]
+        circles = self.sections["circle"][
+            record["circle"]["start"]:record["circle"]["end"]]
+        polygons = self.sections["polygon"][
+            record["polygon"]["start"]:record["polygon"]["end"]]
+        shape = scenario.Shape(
+            [scenario.Rectangle(float(r["length"]), float(r["width"]),
+                float(r["orientation"]), r["centerPoint"]) for r in rectangles],
+            [scenario.Circle(float(c["radius"]), c["centerPoint"])
+                for c in circles],
+            [scenario.Polygon(self._points(p)) for p in polygons])
+        obstacle = scenario.Obstacle(self._string(record["role"]),
+            self._string(record["type"]), shape)
+        obstacle.id = int(record["id"])
+        return obstacle
+
+    def _oriented(self, cls, record, with_type=True):
+        if with_type:
+            obj = cls(self._string(record["type"]), float(record["orientation"]),
+                record["centerPoint"])
+        else:
+            obj = cls(float(record["orientation"]), record["centerPoint"])
+        obj.id = int(record["id"])
+        return obj
+
+    def to_scenario(self):
+        doc = scenario.Scenario()
+        doc.lanelet = [self.lanelet(i) for i in range(self.lanelet_count())]
+        doc.obstacle = [self._obstacle(r) for r in self.sections["obstacle"]]
+        doc.trafficSign = [self._oriented(scenario.TrafficSign, r)
+            for r in self.sections["trafficSign"]]
+        doc.ramp = [self._oriented(scenario.Ramp, r, with_type=False)
+            for r in self.sections["ramp"]]
+        doc.islandJunction = [scenario.IslandJunction(self._points(r))
+            for r in self.sections["islandJunction"]]
+        doc.roadMarking = [self._oriented(scenario.RoadMarking, r)
+            for r in self.sections["roadMarking"]]
+        return doc
+
+def load(source):
+    """Opens a binary scenario from a file name, binary file object or bytes.
+
+    Regular files are memory mapped, anything else (e.g. pipes) is read
+    into memory.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return BinaryScenario(source)
+    if isinstance(source, str):
+        with open(source, "rb") as file:
+            return load(file)
+    # only map plain files, not decompressing wrappers around them
+    if isinstance(getattr(source, "raw", None), io.FileIO):
+        try:
+            return BinaryScenario(mmap.mmap(source.fileno(), 0,
+                access=mmap.ACCESS_READ))
+        except (OSError, ValueError):
+            pass
+    return BinaryScenario(source.read())
+
+def read(source):
+    return load(source).to_scenario()
+
+def is_binary(file):
+    """Checks the magic of a buffered binary file without consuming it."""
+    return file.peek(len(MAGIC))[:len(MAGIC)] == MAGIC
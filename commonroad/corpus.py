@@ -0,0 +1,177 @@
+"""Columnar export of scenario corpora to Apache Parquet for analytics.
+
+Every table has a "scenario" column naming the scenario a row belongs to,
+the other column names follow `commonroad.scenario`. Boundary and polygon
+points are stored as separate x/y lists.
+
+    lanelet      one row per lanelet, with markings, successor/predecessor
+                 ids, boundary points and boundary lengths
+    obstacle     one row per obstacle, shapes as lists of structs
+    trafficSign, ramp, roadMarking
+                 one row per object with orientation and center point
+
+Needs the pyarrow package.
+"""
+import os
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+COORDINATES = pa.list_(pa.float64())
+IDS = pa.list_(pa.int64())
+
+RECTANGLE = pa.struct([("length", pa.float64()), ("width", pa.float64()),
+    ("orientation", pa.float64()), ("x", pa.float64()), ("y", pa.float64())])
+CIRCLE = pa.struct([("radius", pa.float64()), ("x", pa.float64()),
+    ("y", pa.float64())])
+POLYGON = pa.struct([("x", COORDINATES), ("y", COORDINATES)])
+
+def _oriented_schema(with_type=True):
+    fields = [("scenario", pa.string()), ("id", pa.int64())]
+    if with_type:
+        fields.append(("type", pa.string()))
+    return pa.schema(fields + [("orientation", pa.float64()),
+        ("x", pa.float64()), ("y", pa.float64())])
+
+TABLES = {
+    "lanelet": pa.schema([
+        ("scenario", pa.string()),
+        ("id", pa.int64()),
+        ("type", pa.string()),
+        ("isStart", pa.bool_()),
+        ("leftLineMarking", pa.string()),
+        ("rightLineMarking", pa.string()),
+        ("stopLine", pa.string()),
+        ("predecessor", IDS),
+        ("successor", IDS),
+        ("adjacentLeft", pa.int64()),
+        ("adjacentLeftDrivingDir", pa.string()),
+        ("adjacentRight", pa.int64()),
+        ("adjacentRightDrivingDir", pa.string()),
+        ("leftX", COORDINATES),
+        ("leftY", COORDINATES),
+        ("rightX", COORDINATES),
+        ("rightY", COORDINATES),
+        ("leftLength", pa.float64()),
+        ("rightLength", pa.float64()),
+    ]),
+    "obstacle": pa.schema([
+        ("scenario", pa.string()),
+        ("id", pa.int64()),
+        ("role", pa.string()),
+        ("type", pa.string()),
+        ("rectangle", pa.list_(RECTANGLE)),
+        ("circle", pa.list_(CIRCLE)),
+        ("polygon", pa.list_(POLYGON)),
+    ]),
+    "trafficSign": _oriented_schema(),
+    "ramp": _oriented_schema(with_type=False),
+    "roadMarking": _oriented_schema(),
+}
+
+def _length(points):
+    return float(np.linalg.norm(np.diff(points, axis=0), axis=1).sum())
+
+def _lanelet_row(name, lanelet):
+    left = lanelet.leftBoundary.points
+    right = lanelet.rightBoundary.points
+    adjacent_left = lanelet.adjacentLeft
+    adjacent_right = lanelet.adjacentRight
+    return {
+        "scenario": name,
+        "id": lanelet.id,
+        "type": lanelet.type,
+        "isStart": bool(lanelet.isStart),
+        "leftLineMarking": lanelet.leftBoundary.lineMarking,
+        "rightLineMarking": lanelet.rightBoundary.lineMarking,
+        "stopLine": lanelet.stopLine,
+        "predecessor": list(lanelet.predecessor),
+        "successor": list(lanelet.successor),
+        "adjacentLeft": adjacent_left.ref if adjacent_left else None,
+        "adjacentLeftDrivingDir": adjacent_left.drivingDir if adjacent_left else None,
+        "adjacentRight": adjacent_right.ref if adjacent_right else None,
+        "adjacentRightDrivingDir": adjacent_right.drivingDir if adjacent_right else None,
+        "leftX": left[:, 0].tolist(),
+        "leftY": left[:, 1].tolist(),
+        "rightX": right[:, 0].tolist(),
+        "rightY": right[:, 1].tolist(),
+        "leftLength": _length(left),
+        "rightLength": _length(right),
+    }
+
+def _obstacle_row(name, obstacle):
+    shape = obstacle.shape
+    return {
+        "scenario": name,
+        "id": obstacle.id,
+        "role": obstacle.role,
+        "type": obstacle.type,
+        "rectangle": [{"length": float(r.length), "width": float(r.width),
+            "orientation": float(r.orientation), "x": float(r.centerPoint[0]),
+            "y": float(r.centerPoint[1])} for r in shape.rectangle],
+        "circle": [{"radius": float(c.radius), "x": float(c.centerPoint[0]),
+            "y": float(c.centerPoint[1])} for c in shape.circle],
+        "polygon": [{"x": p.points[:, 0].tolist(), "y": p.points[:, 1].tolist()}
+            for p in shape.polygon],
+    }
+
+def _oriented_row(name, obj, with_type=True):
+    row = {
+        "scenario": name,
+        "id": obj.id,
+        "orientation": float(obj.orientation),
+        "x": float(obj.centerPoint[0]),
+        "y": float(obj.centerPoint[1]),
+    }
+    if with_type:
+        row["type"] = obj.type
+    return row
+
+def scenario_rows(doc, name):
+    """Rows of all tables for one `commonroad.scenario.Scenario`, as a dict
+    of table name to list of row dicts (picklable, e.g. for worker pools)."""
+    return {
+        "lanelet": [_lanelet_row(name, l) for l in doc.lanelet],
+        "obstacle": [_obstacle_row(name, o) for o in doc.obstacle],
+        "trafficSign": [_oriented_row(name, s) for s in doc.trafficSign],
+        "ramp": [_oriented_row(name, r, with_type=False) for r in doc.ramp],
+        "roadMarking": [_oriented_row(name, m) for m in doc.roadMarking],
+    }
+
+class CorpusWriter:
+    """Writes one <table>.parquet file per table into `directory`, in row
+    groups of up to `batch_size` rows."""
+
+    def __init__(self, directory, batch_size=100000):
+        os.makedirs(directory, exist_ok=True)
+        self.batch_size = batch_size
+        self._writers = {name: pq.ParquetWriter(
+            os.path.join(directory, name + ".parquet"), schema)
+            for (name, schema) in TABLES.items()}
+        self._rows = {name: [] for name in TABLES}
+
+    def add(self, doc, name):
+        self.add_rows(scenario_rows(doc, name))
+
+    def add_rows(self, rows):
+        for (table, table_rows) in rows.items():
+            self._rows[table].extend(table_rows)
+            if len(self._rows[table]) >= self.batch_size:
+                self._flush(table)
+
+    def _flush(self, table):
+        if self._rows[table]:
+            self._writers[table].write_table(pa.Table.from_pylist(
+                self._rows[table], schema=TABLES[table]))
+            self._rows[table] = []
+
+    def close(self):
+        for table in TABLES:
+            self._flush(table)
+            self._writers[table].close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,119 @@
+"""Derives lanelet connectivity from the lanelet geometry.
+
+Two lanelets are linked where their boundary end points coincide within a
+tolerance, which works for any layout instead of a chain of primitives:
+
+    successor       both boundaries of a lanelet end where those of the
+                    successor begin
+    opposite        the left boundaries are the same line in reverse
+                    (adjacentLeft with drivingDir "opposite"), likewise for
+                    the right boundaries (adjacentRight)
+    same            the right boundary of a lanelet is the left boundary of
+                    its right neighbour (adjacentRight / adjacentLeft with
+                    drivingDir "same")
+
+Boundaries are compared by their first and last points only. Opposite
+direction neighbours which do not share a boundary, like the lanelets on
+both sides of a traffic island, are passed as explicit pairs.
+"""
+import numpy as np
+from commonroad import scenario
+
+TOLERANCE = 1e-3
+NEIGHBOURS = np.array([(x, y) for x in (-1, 0, 1) for y in (-1, 0, 1)])
+
+def _cell_ids(*cells):
+    # one integer per cell, common to all arrays of `cells`
+    stacked = np.vstack(cells)
+    low = stacked.min(axis=0)
+    span = [int(n) for n in stacked.max(axis=0) - low + 1]
+    if span[0] * span[1] < 2 ** 62:
+        ids = (stacked[:, 0] - low[0]) * span[1] + (stacked[:, 1] - low[1])
+    else:
+        ids = np.unique(stacked, axis=0, return_inverse=True)[1].reshape(-1)
+    return np.split(ids, np.cumsum([len(c) for c in cells])[:-1])
+
+def snap(keys, queries, tolerance=TOLERANCE):
+    """Returns index arrays (query, key) of all pairs of rows of `queries`
+    and `keys` which differ by at most `tolerance` in every coordinate.
+
+    The first two coordinates of the keys are hashed into a grid of
+    `tolerance` sized cells and each query only checks the keys in the 3x3
+    cells around its own, O(n log n) for any layout.
+    """
+    key_cells = np.floor(keys[:, :2] / tolerance).astype(np.int64)
+    query_cells = np.floor(queries[:, :2] / tolerance).astype(np.int64)
+    neighbours = (query_cells[:, None, :] + NEIGHBOURS).reshape(-1, 2)
+    (key_ids, neighbour_ids) = _cell_ids(key_cells, neighbours)
+    order = np.argsort(key_ids, kind="stable")
+    sorted_ids = key_ids[order]
+    low = np.searchsorted(sorted_ids, neighbour_ids, side="left")
+    high = np.searchsorted(sorted_ids, neighbour_ids, side="right")
+
+    counts = high - low
+    query = np.repeat(np.arange(len(neighbour_ids)) // len(NEIGHBOURS), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    key = order[np.repeat(low, counts) + offsets]
+    close = (np.abs(keys[key] - queries[query]) <= tolerance).all(axis=1)
+    (query, key) = (query[close], key[close])
+    # deterministic order independent of the sorting
+    index = np.lexsort((key, query))
+    return (query[index], key[index])
+
+def _points(boundaries, index):
+    return np.array([b.points[index] for b in boundaries], dtype=float)
+
+def connect(lanelets, opposite_pairs=(), tolerance=TOLERANCE):
+    """Sets successor, predecessor, adjacentLeft and adjacentRight of all
+    `lanelets` with ids, replacing previous connectivity. The lanelets of
+    `opposite_pairs` are left neighbours in opposite direction without
+    sharing a boundary, e.g. around a traffic island."""
+    lanelets = [l for l in lanelets if len(l.leftBoundary.points) > 0
+        and len(l.rightBoundary.points) > 0]
+    for lanelet in lanelets:
+        lanelet.successor = []
+        lanelet.predecessor = []
+        lanelet.adjacentLeft = None
+        lanelet.adjacentRight = None
+    if not lanelets:
+        return
+
+    left = [l.leftBoundary for l in lanelets]
+    right = [l.rightBoundary for l in lanelets]
+    (left_first, left_last) = (_points(left, 0), _points(left, -1))
+    (right_first, right_last) = (_points(right, 0), _points(right, -1))
+    starts = np.hstack((left_first, right_first))
+    ends = np.hstack((left_last, right_last))
+    left_ends = np.hstack((left_first, left_last))
+    right_ends = np.hstack((right_first, right_last))
+
+    for (i, j) in zip(*snap(starts, ends, tolerance)):
+        if i != j:
+            lanelets[i].successor.append(lanelets[j].id)
+            lanelets[j].predecessor.append(lanelets[i].id)
+
+    for (i, j) in zip(*snap(left_ends,
+            np.hstack((left_last, left_first)), tolerance)):
+        if i != j and lanelets[i].adjacentLeft is None:
+            lanelets[i].adjacentLeft = scenario.AdjacentRef(
+                ref=lanelets[j].id, drivingDir="opposite")
+    for (i, j) in zip(*snap(right_ends,
+            np.hstack((right_last, right_first)), tolerance)):
+        if i != j and lanelets[i].adjacentRight is None:
+            lanelets[i].adjacentRight = scenario.AdjacentRef(
+                ref=lanelets[j].id, drivingDir="opposite")
+
+    for (i, j) in zip(*snap(left_ends, right_ends, tolerance)):
+        if i == j:
+            continue
+        if lanelets[i].adjacentRight is None:
+            lanelets[i].adjacentRight = scenario.AdjacentRef(
+                ref=lanelets[j].id, drivingDir="same")
+        if lanelets[j].adjacentLeft is None:
+            lanelets[j].adjacentLeft = scenario.AdjacentRef(
+                ref=lanelets[i].id, drivingDir="same")
+
+    for (a, b) in opposite_pairs:
+        if a.adjacentLeft is None and b.adjacentLeft is None:
+            a.adjacentLeft = scenario.AdjacentRef(ref=b.id, drivingDir="opposite")
+            b.adjacentLeft = scenario.AdjacentRef(ref=a.id, drivingDir="opposite")
@@ -0,0 +1,76 @@
+import numpy as np
+
+def round_significant(values, digits):
+    values = np.asarray(values, dtype=float)
+    magnitude = np.floor(np.log10(np.abs(np.where(values == 0, 1, values))))
+    shift = digits - 1 - magnitude
+    # multiply/divide by exact powers of ten only
+    up = 10.0 ** np.maximum(shift, 0)
+    down = 10.0 ** np.maximum(-shift, 0)
+    return np.round(values * up / down) * down / up
+
+def rounding(decimals=None, significant_digits=None):
+    """Returns a function rounding arrays to `decimals` decimal places or
+    to `significant_digits` significant digits."""
+    if (decimals is None) == (significant_digits is None):
+        raise ValueError("pass exactly one of decimals and significant_digits")
+    if significant_digits is not None:
+        if significant_digits < 1:
+            raise ValueError("need at least one significant digit")
+        return lambda values: round_significant(values, significant_digits)
+    return lambda values: np.round(values, decimals)
+
+def degenerate_segments(points):
+    return np.count_nonzero((np.diff(points, axis=0) == 0).all(axis=1))
+
+def _round_points(points, round_values):
+    # in place, as paired lanelets share boundary buffers; rounding twice
+    # gives the same result
+    if points.size > 0:
+        points[...] = round_values(points)
+
+def _round_scalar(value, round_values):
+    return float(round_values(value))
+
+def quantize(doc, decimals=None, significant_digits=None):
+    """Rounds all coordinates, orientations and sizes of a scenario.
+
+    Raises ValueError if the rounding collapses boundary segments to zero
+    length which had a length before.
+    """
+    round_values = rounding(decimals, significant_digits)
+    boundaries = [b for lanelet in doc.lanelet
+        for b in (lanelet.leftBoundary, lanelet.rightBoundary)]
+    before = [degenerate_segments(b.points) for b in boundaries]
+
+    for boundary in boundaries:
+        _round_points(boundary.points, round_values)
+    for lanelet in doc.lanelet:
+        attributes = lanelet.stopLineAttributes
+        if attributes is not None:
+            attributes.lineWidth = _round_scalar(attributes.lineWidth, round_values)
+            attributes.segmentLength = _round_scalar(attributes.segmentLength,
+                round_values)
+            attributes.segmentGap = _round_scalar(attributes.segmentGap, round_values)
+    for obstacle in doc.obstacle:
+        for rect in obstacle.shape.rectangle:
+            rect.length = _round_scalar(rect.length, round_values)
+            rect.width = _round_scalar(rect.width, round_values)
+            rect.orientation = _round_scalar(rect.orientation, round_values)
+            _round_points(rect.centerPoint, round_values)
+        for circle in obstacle.shape.circle:
+            circle.radius = _round_scalar(circle.radius, round_values)
+            _round_points(circle.centerPoint, round_values)
+        for polygon in obstacle.shape.polygon:
+            _round_points(polygon.points, round_values)
+    for obj in doc.trafficSign + doc.ramp + doc.roadMarking:
+        obj.orientation = _round_scalar(obj.orientation, round_values)
+        _round_points(obj.centerPoint, round_values)
+    for junction in doc.islandJunction:
+        _round_points(junction.points, round_values)
+
+    collapsed = sum(degenerate_segments(b.points) - n
+        for (b, n) in zip(boundaries, before))
+    if collapsed > 0:
+        raise ValueError("rounding collapsed {0} boundary segments to zero "
+            "length, use a higher precision".format(collapsed))
@@ -1,10 +1,8 @@
 import numpy as np
 import math
-from shapely.geometry import LineString, CAP_STYLE, JOIN_STYLE
-import scipy.integrate as integrate
-from commonroad import schema
+from commonroad import scenario
 from functools import partial
-from scipy.optimize import root_scalar
+# shapely and scipy are imported where needed, they dominate start-up time
 
 class MissingPointsException(Exception):
     pass
@@ -35,16 +33,23 @@ def convert_line_marking(marking):
     else:
         return marking
 
+def make_lanelet(left, right, left_line=None, right_line=None):
+    return scenario.Lanelet(scenario.Boundary(left, left_line),
+        scenario.Boundary(right, right_line))
+
 class Export:
-    def __init__(self, objects, lanelet_pairs):
+    def __init__(self, objects, opposite_pairs=()):
         self.objects = objects
-        self.lanelet_pairs = lanelet_pairs
+        # opposite direction neighbours without a shared boundary, which
+        # connectivity cannot derive from the geometry
+        self.opposite_pairs = list(opposite_pairs)
 
 class Primitive:
     def get_points(self):
         return []
 
     def get_bounding_box(self, street_width):
+        from shapely.geometry import LineString, CAP_STYLE, JOIN_STYLE
         points = self.get_points()
         if len(points) == 0:
             raise MissingPointsException("get_points() returned empty array")
@@ -75,9 +80,9 @@ class Primitive:
         return (p1, math.atan2(dir[1], dir[0]), 1 / radius)
 
     def export(self, config):
-        points = self.get_points()
-        lanelet1 = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-        lanelet2 = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
+        points = np.array(self.get_points(), dtype=float)
+        lanelet1 = make_lanelet([], [])
+        lanelet2 = make_lanelet([], [])
         if hasattr(self, "_is_start") and self._is_start:
             lanelet1.isStart = True
 
@@ -85,34 +90,25 @@ class Primitive:
         lanelet1.leftBoundary.lineMarking = convert_line_marking(self._middle_line if hasattr(self, "_middle_line") else None)
         lanelet2.rightBoundary.lineMarking = convert_line_marking(self._left_line if hasattr(self, "_left_line") else None)
 
-        for i in range(len(points)):
-            if i != len(points) - 1:
-                p1 = np.array(points[i])
-                p2 = np.array(points[i+1])
-                ortho_left = np.array([-(p2[1] - p1[1]), p2[0] - p1[0]])
-                ortho_left = ortho_left / np.linalg.norm(ortho_left) * config.road_width
-                ortho_right = ortho_left * (-1)
-            else:
-                p1 = np.array(points[i])
-
-            left = p1 + ortho_left
-            right = p1 + ortho_right
-
-            lanelet1.leftBoundary.point.append(
-                schema.point(x=points[i][0], y=points[i][1]))
-            lanelet1.rightBoundary.point.append(
-                schema.point(x=right[0], y=right[1]))
-            lanelet2.leftBoundary.point.append(
-                schema.point(x=points[i][0], y=points[i][1]))
-            lanelet2.rightBoundary.point.append(
-                schema.point(x=left[0], y=left[1]))
-        # TODO add last point
-
-        # reverse boundary of left lanelet to match driving direction
-        lanelet2.leftBoundary.point.reverse()
-        lanelet2.rightBoundary.point.reverse()
-
-        return Export([lanelet1, lanelet2], [(lanelet1, lanelet2)])
+        direction = np.diff(points, axis=0)
+        ortho_left = np.column_stack((-direction[:, 1], direction[:, 0]))
+        ortho_left = ortho_left / np.linalg.norm(ortho_left, axis=1)[:, None] * config.road_width
+        # the end points are offset along the directions by which
+        # generate_road aligns neighbouring primitives, so boundaries meet
+        ortho_left = np.vstack((ortho_left, ortho_left[-1:]))
+        for (index, angle) in [(0, self.get_beginning()[1] + math.pi),
+                (-1, self.get_ending()[1])]:
+            ortho_left[index] = [-math.sin(angle) * config.road_width,
+                math.cos(angle) * config.road_width]
+
+        # both lanelets share the centerline, the left lanelet drives
+        # in reverse direction and sees it as a reversed view
+        lanelet1.leftBoundary.points = points
+        lanelet1.rightBoundary.points = points - ortho_left
+        lanelet2.leftBoundary.points = points[::-1]
+        lanelet2.rightBoundary.points = (points + ortho_left)[::-1]
+
+        return Export([lanelet1, lanelet2])
 
 class TransrotPrimitive(Primitive):
     def __init__(self, child, translation, angle):
@@ -142,7 +138,9 @@ class TransrotPrimitive(Primitive):
         return (self._get_matrix().dot(np.append(point, 1)))[0:2]
 
     def get_points(self):
-        return list(map(self._transform_point, self._child.get_points()))
+        points = np.array(self._child.get_points(), dtype=float)
+        matrix = self._get_matrix()
+        return points.dot(matrix[0:2, 0:2].T) + matrix[0:2, 2]
 
     def get_beginning(self):
         begin = self._child.get_beginning()
@@ -156,52 +154,16 @@ class TransrotPrimitive(Primitive):
         export = self._child.export(config)
         objects = export.objects
 
+        scenario.transform_in_place(
+            [points for obj in objects for points in scenario.point_arrays(obj)],
+            self._get_matrix())
         for obj in objects:
-            if isinstance(obj, schema.lanelet):
-                for i in range(len(obj.leftBoundary.point)):
-                    x = obj.leftBoundary.point[i].x
-                    y = obj.leftBoundary.point[i].y
-                    transformed = self._transform_point([x, y])
-                    obj.leftBoundary.point[i].x = transformed[0]
-                    obj.leftBoundary.point[i].y = transformed[1]
-                for i in range(len(obj.rightBoundary.point)):
-                    x = obj.rightBoundary.point[i].x
-                    y = obj.rightBoundary.point[i].y
-                    transformed = self._transform_point([x, y])
-                    obj.rightBoundary.point[i].x = transformed[0]
-                    obj.rightBoundary.point[i].y = transformed[1]
-            elif isinstance(obj, schema.obstacle):
+            if isinstance(obj, scenario.Obstacle):
                 for rect in obj.shape.rectangle:
-                    x = rect.centerPoint.x
-                    y = rect.centerPoint.y
-                    transformed = self._transform_point([x, y])
                     rect.orientation -= self._angle
-                    rect.centerPoint = schema.point(x=transformed[0], y=transformed[1])
-            elif isinstance(obj, schema.trafficSign):
-                x = obj.centerPoint.x
-                y = obj.centerPoint.y
-                transformed = self._transform_point([x, y])
-                obj.orientation += self._angle
-                obj.centerPoint = schema.point(x=transformed[0], y=transformed[1])
-            elif isinstance(obj, schema.ramp):
-                x = obj.centerPoint.x
-                y = obj.centerPoint.y
-                transformed = self._transform_point([x, y])
+            elif isinstance(obj, (scenario.TrafficSign, scenario.Ramp,
+                    scenario.RoadMarking)):
                 obj.orientation += self._angle
-                obj.centerPoint = schema.point(x=transformed[0], y=transformed[1])
-            elif isinstance(obj, schema.trafficIslandJunction):
-                for i in range(len(obj.point)):
-                    x = obj.point[i].x
-                    y = obj.point[i].y
-                    transformed = self._transform_point([x, y])
-                    obj.point[i].x = transformed[0]
-                    obj.point[i].y = transformed[1]
-            elif isinstance(obj, schema.roadMarking):
-                x = obj.centerPoint.x
-                y = obj.centerPoint.y
-                transformed = self._transform_point([x, y])
-                obj.orientation += self._angle
-                obj.centerPoint = schema.point(x=transformed[0], y=transformed[1])
         return export
 
 class StraightLine(Primitive):
@@ -236,15 +198,12 @@ class LeftCircularArc(Primitive):
         return "LeftCircularArc(radius={}, angle={})".format(self._radius, self._angle)
 
     def get_points(self):
-        points = []
-        current_angle = 0
-        while current_angle <= self._angle:
-            points.append([
-                math.cos(current_angle - math.pi/2) * self._radius,
-                self._radius + math.sin(current_angle - math.pi/2) * self._radius
-            ])
-            current_angle += 0.01 # TODO what else
-        return points
+        # steps of at most 0.01, ending exactly at get_ending()
+        angles = np.linspace(0, self._angle, max(2, math.ceil(self._angle / 0.01) + 1))
+        return [[
+            math.cos(current_angle - math.pi/2) * self._radius,
+            self._radius + math.sin(current_angle - math.pi/2) * self._radius
+        ] for current_angle in angles]
 
     def get_beginning(self):
         return (np.array([0, 0]), math.pi, 1 / self._radius)
@@ -267,15 +226,12 @@ class RightCircularArc(Primitive):
         return "RightCircularArc(radius={}, angle={})".format(self._radius, self._angle)
 
     def get_points(self):
-        points = []
-        current_angle = 0
-        while current_angle <= self._angle:
-            points.append([
-                math.cos(math.pi/2 - current_angle) * self._radius,
-                - self._radius + math.sin(math.pi/2 - current_angle) * self._radius
-            ])
-            current_angle += 0.01 # TODO what else
-        return points
+        # steps of at most 0.01, ending exactly at get_ending()
+        angles = np.linspace(0, self._angle, max(2, math.ceil(self._angle / 0.01) + 1))
+        return [[
+            math.cos(math.pi/2 - current_angle) * self._radius,
+            - self._radius + math.sin(math.pi/2 - current_angle) * self._radius
+        ] for current_angle in angles]
 
     def get_beginning(self):
         return (np.array([0, 0]), math.pi, - 1 / self._radius)
@@ -336,6 +292,7 @@ class CubicBezier(Primitive):
         return self._points
 
 def euler_spiral(l, A):
+    import scipy.integrate as integrate
     factor = A * math.sqrt(math.pi)
     return [factor * integrate.quad(lambda t: math.cos(math.pi * t * t / 2), 0, l)[0],
         factor * integrate.quad(lambda t: math.sin(math.pi * t * t / 2), 0, l)[0]]
@@ -404,65 +361,38 @@ class Intersection(Primitive):
             return (np.array([0, self._size]), 0.5 * math.pi, 0)
 
     def export(self, config):
-        southRight = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-        southRight.leftBoundary.lineMarking = "dashed"
-        southRight.rightBoundary.lineMarking = "solid"
-        southRight.leftBoundary.point.append(schema.point(x=0, y=-self._size))
-        southRight.leftBoundary.point.append(schema.point(x=0, y=-config.road_width))
-        southRight.rightBoundary.point.append(schema.point(x=config.road_width, y=-self._size))
-        southRight.rightBoundary.point.append(schema.point(x=config.road_width, y=-config.road_width))
-
-        southLeft = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-        southLeft.rightBoundary.lineMarking = "solid"
-        southLeft.leftBoundary.point.append(schema.point(x=0, y=-config.road_width))
-        southLeft.leftBoundary.point.append(schema.point(x=0, y=-self._size))
-        southLeft.rightBoundary.point.append(schema.point(x=-config.road_width, y=-config.road_width))
-        southLeft.rightBoundary.point.append(schema.point(x=-config.road_width, y=-self._size))
-
-        northRight = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-        northRight.leftBoundary.lineMarking = "dashed"
-        northRight.rightBoundary.lineMarking = "solid"
-        northRight.leftBoundary.point.append(schema.point(x=0, y=self._size))
-        northRight.leftBoundary.point.append(schema.point(x=0, y=config.road_width))
-        northRight.rightBoundary.point.append(schema.point(x=-config.road_width, y=self._size))
-        northRight.rightBoundary.point.append(schema.point(x=-config.road_width, y=config.road_width))
-
-        northLeft = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-        northLeft.rightBoundary.lineMarking = "solid"
-        northLeft.leftBoundary.point.append(schema.point(x=0, y=config.road_width))
-        northLeft.leftBoundary.point.append(schema.point(x=0, y=self._size))
-        northLeft.rightBoundary.point.append(schema.point(x=config.road_width, y=config.road_width))
-        northLeft.rightBoundary.point.append(schema.point(x=config.road_width, y=self._size))
-
-        eastRight = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-        eastRight.rightBoundary.lineMarking = "solid"
-        eastRight.leftBoundary.point.append(schema.point(x=self._size, y=0))
-        eastRight.leftBoundary.point.append(schema.point(x=config.road_width, y=0))
-        eastRight.rightBoundary.point.append(schema.point(x=self._size, y=config.road_width))
-        eastRight.rightBoundary.point.append(schema.point(x=config.road_width, y=config.road_width))
-
-        eastLeft = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-        eastLeft.rightBoundary.lineMarking = "solid"
-        eastLeft.leftBoundary.lineMarking = "dashed"
-        eastLeft.leftBoundary.point.append(schema.point(x=config.road_width, y=0))
-        eastLeft.leftBoundary.point.append(schema.point(x=self._size, y=0))
-        eastLeft.rightBoundary.point.append(schema.point(x=config.road_width, y=-config.road_width))
-        eastLeft.rightBoundary.point.append(schema.point(x=self._size, y=-config.road_width))
-
-        westRight = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-        westRight.rightBoundary.lineMarking = "solid"
-        westRight.leftBoundary.point.append(schema.point(x=-self._size, y=0))
-        westRight.leftBoundary.point.append(schema.point(x=-config.road_width, y=0))
-        westRight.rightBoundary.point.append(schema.point(x=-self._size, y=-config.road_width))
-        westRight.rightBoundary.point.append(schema.point(x=-config.road_width, y=-config.road_width))
-
-        westLeft = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-        westLeft.leftBoundary.lineMarking = "dashed"
-        westLeft.rightBoundary.lineMarking = "solid"
-        westLeft.leftBoundary.point.append(schema.point(x=-config.road_width, y=0))
-        westLeft.leftBoundary.point.append(schema.point(x=-self._size, y=0))
-        westLeft.rightBoundary.point.append(schema.point(x=-config.road_width, y=config.road_width))
-        westLeft.rightBoundary.point.append(schema.point(x=-self._size, y=config.road_width))
+        southRight = make_lanelet(
+            [[0, -self._size], [0, -config.road_width]],
+            [[config.road_width, -self._size], [config.road_width, -config.road_width]],
+            "dashed", "solid")
+        southLeft = make_lanelet(
+            [[0, -config.road_width], [0, -self._size]],
+            [[-config.road_width, -config.road_width], [-config.road_width, -self._size]],
+            None, "solid")
+        northRight = make_lanelet(
+            [[0, self._size], [0, config.road_width]],
+            [[-config.road_width, self._size], [-config.road_width, config.road_width]],
+            "dashed", "solid")
+        northLeft = make_lanelet(
+            [[0, config.road_width], [0, self._size]],
+            [[config.road_width, config.road_width], [config.road_width, self._size]],
+            None, "solid")
+        eastRight = make_lanelet(
+            [[self._size, 0], [config.road_width, 0]],
+            [[self._size, config.road_width], [config.road_width, config.road_width]],
+            None, "solid")
+        eastLeft = make_lanelet(
+            [[config.road_width, 0], [self._size, 0]],
+            [[config.road_width, -config.road_width], [self._size, -config.road_width]],
+            "dashed", "solid")
+        westRight = make_lanelet(
+            [[-self._size, 0], [-config.road_width, 0]],
+            [[-self._size, -config.road_width], [-config.road_width, -config.road_width]],
+            None, "solid")
+        westLeft = make_lanelet(
+            [[-config.road_width, 0], [-self._size, 0]],
+            [[-config.road_width, config.road_width], [-self._size, config.road_width]],
+            "dashed", "solid")
 
         if self._rule == "equal":
             northRight.stopLine = "dashed"
@@ -484,122 +414,89 @@ class Intersection(Primitive):
 
         result = [southRight, southLeft, northLeft, northRight,
             eastLeft, eastRight, westLeft, westRight]
-        pairs = [(southRight, southLeft)]
 
         if self._target_dir == "left":
-            right_lanelet = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-            right_lanelet.rightBoundary.lineMarking = "dashed"
-            right_lanelet.leftBoundary.lineMarking = "dashed"
-            for angle in np.arange(0, math.pi/2, math.pi/20):
-                right_lanelet.rightBoundary.point.append(schema.point(x=-config.road_width + math.cos(angle) * config.road_width * 2,
-                    y=-config.road_width + math.sin(angle) * config.road_width * 2))
-                right_lanelet.leftBoundary.point.append(schema.point(x=-config.road_width + math.cos(angle) * config.road_width,
-                    y=-config.road_width + math.sin(angle) * config.road_width))
-            left_lanelet = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-            for angle in np.arange(math.pi/2, 0, -math.pi/20):
-                left_lanelet.leftBoundary.point.append(schema.point(x=-config.road_width + math.cos(angle) * config.road_width,
-                    y=-config.road_width + math.sin(angle) * config.road_width))
-                left_lanelet.rightBoundary.point.append(schema.point(x=-config.road_width,
-                    y=-config.road_width))
+            angles = np.linspace(0, math.pi/2, 11)
+            right_lanelet = make_lanelet(
+                [[-config.road_width + math.cos(angle) * config.road_width,
+                    -config.road_width + math.sin(angle) * config.road_width] for angle in angles],
+                [[-config.road_width + math.cos(angle) * config.road_width * 2,
+                    -config.road_width + math.sin(angle) * config.road_width * 2] for angle in angles],
+                "dashed", "dashed")
+            angles = np.linspace(math.pi/2, 0, 11)
+            left_lanelet = make_lanelet(
+                [[-config.road_width + math.cos(angle) * config.road_width,
+                    -config.road_width + math.sin(angle) * config.road_width] for angle in angles],
+                [[-config.road_width, -config.road_width] for angle in angles])
             result.append(right_lanelet)
             result.append(left_lanelet)
-            pairs.append((right_lanelet, left_lanelet))
-            pairs.append((westLeft, westRight))
-            result.append(schema.trafficSign(type="stvo-209-10",
-                orientation=math.pi*1.5, centerPoint=schema.point(
-                x=config.road_width + 0.1, y=-config.road_width - 0.25)))
-            result.append(schema.roadMarking(type=schema.roadMarkingType.turn_right,
-                                             orientation=math.pi,
-                                             centerPoint=schema.point(x=(config.road_width +
-                                                                         config.turn_road_marking_width) * 0.5,
-                                                                      y=-config.road_width - 0.25)
-                                             ))
+            result.append(scenario.TrafficSign("stvo-209-10", math.pi*1.5,
+                [config.road_width + 0.1, -config.road_width - 0.25]))
+            result.append(scenario.RoadMarking("turn_right", math.pi,
+                [(config.road_width + config.turn_road_marking_width) * 0.5,
+                    -config.road_width - 0.25]))
             if self._rule != 'yield':
-                result.append(schema.roadMarking(type=schema.roadMarkingType.turn_left,
-                                                 orientation=math.pi * 0.5,
-                                                 centerPoint=schema.point(x=-config.road_width - 0.25,
-                                                                          y=-(config.road_width +
-                                                                             config.turn_road_marking_width) * 0.5)
-                                                 ))
-                result.append(schema.trafficSign(type="stvo-209-20",
-                                                 orientation=math.pi, centerPoint=schema.point(
-                                                 x=-config.road_width - 0.25, y=-config.road_width - 0.1)))
+                result.append(scenario.RoadMarking("turn_left", math.pi * 0.5,
+                    [-config.road_width - 0.25,
+                        -(config.road_width + config.turn_road_marking_width) * 0.5]))
+                result.append(scenario.TrafficSign("stvo-209-20", math.pi,
+                    [-config.road_width - 0.25, -config.road_width - 0.1]))
         elif self._target_dir == "right":
-            right_lanelet = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-            right_lanelet.leftBoundary.lineMarking = "dashed"
-            for angle in np.arange(math.pi, math.pi/2, -math.pi/20):
-                right_lanelet.rightBoundary.point.append(schema.point(x=config.road_width,
-                    y=-config.road_width))
-                right_lanelet.leftBoundary.point.append(schema.point(x=config.road_width + math.cos(angle) * config.road_width,
-                    y=-config.road_width + math.sin(angle) * config.road_width))
-            left_lanelet = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-            left_lanelet.rightBoundary.lineMarking = "dashed"
-            for angle in np.arange(math.pi/2, math.pi, math.pi/20):
-                left_lanelet.leftBoundary.point.append(schema.point(x=config.road_width + math.cos(angle) * config.road_width,
-                    y=-config.road_width + math.sin(angle) * config.road_width))
-                left_lanelet.rightBoundary.point.append(schema.point(x=config.road_width + math.cos(angle) * config.road_width * 2,
-                    y=-config.road_width + math.sin(angle) * config.road_width * 2))
+            angles = np.linspace(math.pi, math.pi/2, 11)
+            right_lanelet = make_lanelet(
+                [[config.road_width + math.cos(angle) * config.road_width,
+                    -config.road_width + math.sin(angle) * config.road_width] for angle in angles],
+                [[config.road_width, -config.road_width] for angle in angles],
+                "dashed", None)
+            angles = np.linspace(math.pi/2, math.pi, 11)
+            left_lanelet = make_lanelet(
+                [[config.road_width + math.cos(angle) * config.road_width,
+                    -config.road_width + math.sin(angle) * config.road_width] for angle in angles],
+                [[config.road_width + math.cos(angle) * config.road_width * 2,
+                    -config.road_width + math.sin(angle) * config.road_width * 2] for angle in angles],
+                None, "dashed")
             result.append(right_lanelet)
             result.append(left_lanelet)
-            pairs.append((right_lanelet, left_lanelet))
-            pairs.append((eastLeft, eastRight))
-            result.append(schema.trafficSign(type="stvo-209-20",
-                orientation=math.pi*1.5, centerPoint=schema.point(
-                x=config.road_width + 0.1, y=-config.road_width - 0.25)))
-            result.append(schema.roadMarking(type=schema.roadMarkingType.turn_left,
-                                             orientation=math.pi,
-                                             centerPoint=schema.point(x=(config.road_width +
-                                                                         config.turn_road_marking_width) * 0.5,
-                                                                      y=-config.road_width - 0.25)))
+            result.append(scenario.TrafficSign("stvo-209-20", math.pi*1.5,
+                [config.road_width + 0.1, -config.road_width - 0.25]))
+            result.append(scenario.RoadMarking("turn_left", math.pi,
+                [(config.road_width + config.turn_road_marking_width) * 0.5,
+                    -config.road_width - 0.25]))
             if self._rule != 'yield':
-                result.append(schema.roadMarking(type=schema.roadMarkingType.turn_right,
-                                                 orientation=math.pi * 1.5,
-                                                 centerPoint=schema.point(x=config.road_width + 0.25,
-                                                                          y=(config.road_width +
-                                                                             config.turn_road_marking_width) * 0.5)
-                                                 ))
-                result.append(schema.trafficSign(type="stvo-209-10",
-                                                 orientation=0, centerPoint=schema.point(
-                                                 x=config.road_width + 0.25, y=config.road_width + 0.1)))
+                result.append(scenario.RoadMarking("turn_right", math.pi * 1.5,
+                    [config.road_width + 0.25,
+                        (config.road_width + config.turn_road_marking_width) * 0.5]))
+                result.append(scenario.TrafficSign("stvo-209-10", 0,
+                    [config.road_width + 0.25, config.road_width + 0.1]))
         elif self._target_dir == "straight":
-            right_lanelet = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-            right_lanelet.rightBoundary.point.append(schema.point(x=config.road_width, y=-config.road_width))
-            right_lanelet.rightBoundary.point.append(schema.point(x=config.road_width, y=config.road_width))
-            right_lanelet.leftBoundary.point.append(schema.point(x=0, y=-config.road_width))
-            right_lanelet.leftBoundary.point.append(schema.point(x=0, y=config.road_width))
-            left_lanelet = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-            left_lanelet.rightBoundary.point.append(schema.point(x=-config.road_width, y=config.road_width))
-            left_lanelet.rightBoundary.point.append(schema.point(x=-config.road_width, y=-config.road_width))
-            left_lanelet.leftBoundary.point.append(schema.point(x=0, y=config.road_width))
-            left_lanelet.leftBoundary.point.append(schema.point(x=0, y=-config.road_width))
+            right_lanelet = make_lanelet(
+                [[0, -config.road_width], [0, config.road_width]],
+                [[config.road_width, -config.road_width], [config.road_width, config.road_width]])
+            left_lanelet = make_lanelet(
+                [[0, config.road_width], [0, -config.road_width]],
+                [[-config.road_width, config.road_width], [-config.road_width, -config.road_width]])
             result.append(right_lanelet)
             result.append(left_lanelet)
-            pairs.append((right_lanelet, left_lanelet))
-            pairs.append((northLeft, northRight))
 
         type_map = {"priority-yield":"stvo-306", "priority-stop":"stvo-306",
             "yield":"stvo-205", "stop":"stvo-206"}
         if self._rule in type_map:
-            result.append(schema.trafficSign(type=type_map[self._rule],
-                orientation=math.pi*1.5, centerPoint=schema.point(
-                x=config.road_width + 0.1, y= -config.road_width - 0.5)))
-            result.append(schema.trafficSign(type=type_map[self._rule],
-                orientation=math.pi*0.5, centerPoint=schema.point(
-                x=-config.road_width - 0.1, y= config.road_width + 0.5)))
+            result.append(scenario.TrafficSign(type_map[self._rule], math.pi*1.5,
+                [config.road_width + 0.1, -config.road_width - 0.5]))
+            result.append(scenario.TrafficSign(type_map[self._rule], math.pi*0.5,
+                [-config.road_width - 0.1, config.road_width + 0.5]))
 
         # stop, right of way, right of way, right of way
         # todo: also add turning signal if we are not on the outer turn lane on the opposite side
         type_map_opposite = {"priority-yield":"stvo-206", "priority-stop":"stvo-306",
             "yield":"stvo-306", "stop":"stvo-306"}
         if self._rule in type_map:
-            result.append(schema.trafficSign(type=type_map_opposite[self._rule],
-                orientation=0, centerPoint=schema.point(
-                y=config.road_width + 0.1, x= config.road_width + 0.5)))
-            result.append(schema.trafficSign(type=type_map_opposite[self._rule],
-                orientation=math.pi, centerPoint=schema.point(
-                y=-config.road_width - 0.1, x= -config.road_width - 0.5)))
+            result.append(scenario.TrafficSign(type_map_opposite[self._rule], 0,
+                [config.road_width + 0.5, config.road_width + 0.1]))
+            result.append(scenario.TrafficSign(type_map_opposite[self._rule], math.pi,
+                [-config.road_width - 0.5, -config.road_width - 0.1]))
 
-        return Export(result, pairs)
+        return Export(result)
 
 class StraightLineObstacle(StraightLine):
     def __init__(self, args):
@@ -614,10 +511,10 @@ class StraightLineObstacle(StraightLine):
             y -= self._width / 2
         elif self._anchor == "right":
             y += self._width / 2
-        rect = schema.rectangle(length=self._length,
+        rect = scenario.Rectangle(length=self._length,
             width=self._width, orientation=0,
-            centerPoint=schema.point(x=self._length / 2, y=y))
-        obstacle = schema.obstacle(role="static", type="parkedVehicle", shape=schema.shape())
+            centerPoint=[self._length / 2, y])
+        obstacle = scenario.Obstacle(role="static", type="parkedVehicle")
         obstacle.shape.rectangle.append(rect)
 
         export = super().export(config)
@@ -631,18 +528,16 @@ class ParkingObstacle(StraightLine):
 
     def export(self, config):
         y = - config.road_width - 0.3 + self._width / 2
-        rect = schema.rectangle(length=self._length,
+        rect = scenario.Rectangle(length=self._length,
             width=self._width, orientation=0,
-            centerPoint=schema.point(x=self._length / 2, y=y))
-        obstacle = schema.obstacle(role="static", type="parkedVehicle", shape=schema.shape())
+            centerPoint=[self._length / 2, y])
+        obstacle = scenario.Obstacle(role="static", type="parkedVehicle")
         obstacle.shape.rectangle.append(rect)
 
-        parking_lane = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-        parking_lane.leftBoundary.point.append(schema.point(x=0, y=-config.road_width))
-        parking_lane.leftBoundary.point.append(schema.point(x=self._length, y=-config.road_width))
-        parking_lane.rightBoundary.point.append(schema.point(x=0, y=-config.road_width - 0.3))
-        parking_lane.rightBoundary.point.append(schema.point(x=self._length, y=-config.road_width - 0.3))
-        parking_lane.rightBoundary.lineMarking = "solid"
+        parking_lane = make_lanelet(
+            [[0, -config.road_width], [self._length, -config.road_width]],
+            [[0, -config.road_width - 0.3], [self._length, -config.road_width - 0.3]],
+            None, "solid")
 
         export = super().export(config)
         export.objects.append(obstacle)
@@ -654,12 +549,10 @@ class ParkingLot(StraightLine):
         super().__init__(args)
 
     def export(self, config):
-        parking_lane = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-        parking_lane.leftBoundary.point.append(schema.point(x=0, y=-config.road_width))
-        parking_lane.leftBoundary.point.append(schema.point(x=self._length, y=-config.road_width))
-        parking_lane.rightBoundary.point.append(schema.point(x=0, y=-config.road_width - 0.3))
-        parking_lane.rightBoundary.point.append(schema.point(x=self._length, y=-config.road_width - 0.3))
-        parking_lane.rightBoundary.lineMarking = "solid"
+        parking_lane = make_lanelet(
+            [[0, -config.road_width], [self._length, -config.road_width]],
+            [[0, -config.road_width - 0.3], [self._length, -config.road_width - 0.3]],
+            None, "solid")
 
         export = super().export(config)
         export.objects.append(parking_lane)
@@ -671,11 +564,10 @@ class BlockedAreaObstacle(StraightLine):
         self._obst_width = float(args["width"])
 
     def export(self, config):
-        rect = schema.rectangle(length=self._length, width=self._obst_width,
-            orientation=0, centerPoint=schema.point(x=self._length/2,
-            y=-config.road_width+self._obst_width/2))
-        obstacle = schema.obstacle(role="static", type="blockedArea",
-            shape=schema.shape())
+        rect = scenario.Rectangle(length=self._length, width=self._obst_width,
+            orientation=0, centerPoint=[self._length/2,
+            -config.road_width+self._obst_width/2])
+        obstacle = scenario.Obstacle(role="static", type="blockedArea")
         obstacle.shape.rectangle.append(rect)
 
         export = super().export(config)
@@ -692,12 +584,10 @@ class ZebraCrossing(StraightLine):
         })
 
     def export(self, config):
-        zebra = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
+        zebra = make_lanelet(
+            [[0, -config.road_width], [0, config.road_width]],
+            [[self._length, -config.road_width], [self._length, config.road_width]])
         zebra.type = "zebraCrossing"
-        zebra.leftBoundary.point.append(schema.point(x=0, y=-config.road_width))
-        zebra.leftBoundary.point.append(schema.point(x=0, y=config.road_width))
-        zebra.rightBoundary.point.append(schema.point(x=self._length, y=-config.road_width))
-        zebra.rightBoundary.point.append(schema.point(x=self._length, y=config.road_width))
 
         export = super().export(config)
         export.objects.append(zebra)
@@ -713,20 +603,18 @@ class TrafficSign(StraightLine):
 
     def export(self, config):
         if self._on_opposite_side:
-            traffic_sign = schema.trafficSign(type=self._traffic_sign,
-                orientation=0.0, centerPoint=schema.point(x=self._length / 2,
-                y=config.road_width + 0.15))
+            traffic_sign = scenario.TrafficSign(self._traffic_sign, 0.0,
+                [self._length / 2, config.road_width + 0.15])
         else:
-            traffic_sign = schema.trafficSign(type=self._traffic_sign,
-                orientation=math.pi, centerPoint=schema.point(x=self._length / 2,
-                y=-config.road_width - 0.15))
+            traffic_sign = scenario.TrafficSign(self._traffic_sign, math.pi,
+                [self._length / 2, -config.road_width - 0.15])
 
         export = super().export(config)
         export.objects.append(traffic_sign)
 
-        if self._traffic_sign in [str(item)[1:-1] for item in schema.roadMarkingType.items()]:
-            road_marking = schema.roadMarking(type=schema.roadMarkingType(self._traffic_sign), orientation=-math.pi/2,
-                                              centerPoint=schema.point(x=self._length / 2, y=-config.road_width/2))
+        if self._traffic_sign in scenario.ROAD_MARKING_TYPES:
+            road_marking = scenario.RoadMarking(self._traffic_sign, -math.pi/2,
+                [self._length / 2, -config.road_width/2])
             export.objects.append(road_marking)
         return export
 
@@ -738,30 +626,24 @@ class Ramp(StraightLine):
         super().__init__(dict(length=1.8+float(args["signDistance"])*2+2*self._padding))
 
     def export(self, config):
-        ramp = schema.ramp(orientation=math.pi, centerPoint=schema.point(x=self._signDistance+self._padding, y=0))
+        ramp = scenario.Ramp(math.pi, [self._signDistance+self._padding, 0])
 
         export = super().export(config)
         export.objects.append(ramp)
-        export.objects.append(schema.trafficSign(type="stvo-110-10", orientation=math.pi,
-                                                 centerPoint=schema.point(x=self._padding,
-                                                                          y=-config.road_width - 0.1)))
-        export.objects.append(schema.trafficSign(type="stvo-108-10", orientation=math.pi,
-                                                 centerPoint=schema.point(x=self._length-self._padding,
-                                                                          y=-config.road_width - 0.1)))
-        export.objects.append(schema.trafficSign(type="stvo-108-10", orientation=0,
-                                                 centerPoint=schema.point(x=self._padding,
-                                                                          y=config.road_width + 0.1)))
-        export.objects.append(schema.trafficSign(type="stvo-110-10", orientation=0,
-                                                 centerPoint=schema.point(x=self._length-self._padding,
-                                                                          y=config.road_width + 0.1)))
+        export.objects.append(scenario.TrafficSign("stvo-110-10", math.pi,
+            [self._padding, -config.road_width - 0.1]))
+        export.objects.append(scenario.TrafficSign("stvo-108-10", math.pi,
+            [self._length-self._padding, -config.road_width - 0.1]))
+        export.objects.append(scenario.TrafficSign("stvo-108-10", 0,
+            [self._padding, config.road_width + 0.1]))
+        export.objects.append(scenario.TrafficSign("stvo-110-10", 0,
+            [self._length-self._padding, config.road_width + 0.1]))
         return export
 
 def add_quad_bezier_points(lanelet_points, t_step, p0, p1, p2, p3):
-    t = 0.0
-    while t <= 1:
-        point = _compute_cubic_bezier(t, p0, p1, p2, p3)
-        lanelet_points.append(schema.point(x=point[0], y=point[1]))
-        t += t_step
+    # including t = 1, which summing up t_step misses
+    for t in np.linspace(0, 1, int(round(1 / t_step)) + 1):
+        lanelet_points.append(_compute_cubic_bezier(t, p0, p1, p2, p3))
 
 def quad_bezier_line_intersection(p0, p1, p2, p3, A, d):
     coefficients = []
@@ -805,49 +687,31 @@ class TrafficIsland(Primitive):
         return (np.array([0, 0]), math.pi, 0)
 
     def get_ending(self):
-        return (np.array([self._length + self._zebraLength, 0]), 0, 0)
+        return (np.array([self._length, 0]), 0, 0)
 
     def export(self, config):
+        from scipy.optimize import root_scalar
         points = self.get_points()
 
         # straight padding lines
-        padding_right = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-        padding_left = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-        padding_right.rightBoundary.lineMarking = "solid"
-        padding_right.leftBoundary.lineMarking = "dashed"
-        padding_left.rightBoundary.lineMarking = "solid"
-        padding_left.leftBoundary.lineMarking = "dashed"
-        padding_right.leftBoundary.point.append(schema.point(x=points[0][0], y=points[0][1]))
-        padding_left.leftBoundary.point.append(schema.point(x=points[0][0], y=points[0][1]))
         starting_point = np.array(points[0])
         right_starting_point = starting_point - self._orthogonal_direction * config.road_width
-        padding_right.rightBoundary.point.append(schema.point(x=right_starting_point[0], y=right_starting_point[1]))
         left_starting_point = starting_point + self._orthogonal_direction * config.road_width
-        padding_left.rightBoundary.point.append(schema.point(x=left_starting_point[0], y=left_starting_point[1]))
 
         # cubic beziers connecting to zebra section
-        split_right = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-        split_right.rightBoundary.lineMarking = "solid"
-        split_right.leftBoundary.lineMarking = "solid"
-
-        split_left = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-        split_left.rightBoundary.lineMarking = "solid"
-        split_left.leftBoundary.lineMarking = "solid"
-
         split_starting_point = starting_point + self._principal_direction * self._padding
-        split_right.leftBoundary.point.append(schema.point(x=split_starting_point[0], y=split_starting_point[1]))
-        split_left.leftBoundary.point.append(schema.point(x=split_starting_point[0], y=split_starting_point[1]))
         right_split_starting = split_starting_point - self._orthogonal_direction * config.road_width
-        split_right.rightBoundary.point.append(schema.point(x=right_split_starting[0], y=right_split_starting[1]))
         left_split_starting = split_starting_point + self._orthogonal_direction * config.road_width
-        split_left.rightBoundary.point.append(schema.point(x=left_split_starting[0], y=left_split_starting[1]))
 
-        padding_right.leftBoundary.point.append(schema.point(x=split_starting_point[0], y=split_starting_point[1]))
-        padding_left.leftBoundary.point.append(schema.point(x=split_starting_point[0], y=split_starting_point[1]))
-        padding_right.rightBoundary.point.append(schema.point(x=right_split_starting[0], y=right_split_starting[1]))
-        padding_left.rightBoundary.point.append(schema.point(x=left_split_starting[0], y=left_split_starting[1]))
-        padding_left.leftBoundary.point.reverse()
-        padding_left.rightBoundary.point.reverse()
+        padding_right = make_lanelet([starting_point, split_starting_point],
+            [right_starting_point, right_split_starting], "dashed", "solid")
+        padding_left = make_lanelet([split_starting_point, starting_point],
+            [left_split_starting, left_starting_point], "dashed", "solid")
+
+        split_right_left = [split_starting_point]
+        split_right_right = [right_split_starting]
+        split_left_left = [split_starting_point]
+        split_left_right = [left_split_starting]
 
         zebra_start_right_center = split_starting_point + self._principal_direction * self._curve_area_length \
                                             - self._orthogonal_direction * self._islandWidth * 0.5
@@ -859,14 +723,14 @@ class TrafficIsland(Primitive):
         right_center_p1 = split_starting_point + self._principal_direction * p1_offset
         right_center_p2 = zebra_start_right_center - self._principal_direction * p1_offset
         right_center_p3 = zebra_start_right_center
-        add_quad_bezier_points(split_right.leftBoundary.point, t_step, right_center_p0, right_center_p1,
+        add_quad_bezier_points(split_right_left, t_step, right_center_p0, right_center_p1,
                                right_center_p2, right_center_p3)
 
         right_outer_p0 = right_split_starting
         right_outer_p1 = right_split_starting + self._principal_direction * p1_offset
         right_outer_p2 = zebra_start_right_outer - self._principal_direction * p1_offset
         right_outer_p3 = zebra_start_right_outer
-        add_quad_bezier_points(split_right.rightBoundary.point, t_step, right_outer_p0, right_outer_p1, right_outer_p2,
+        add_quad_bezier_points(split_right_right, t_step, right_outer_p0, right_outer_p1, right_outer_p2,
                                right_outer_p3)
 
         # left lanelet
@@ -878,20 +742,18 @@ class TrafficIsland(Primitive):
         left_center_p1 = split_starting_point + self._principal_direction * p1_offset
         left_center_p2 = zebra_start_left_center - self._principal_direction * p1_offset
         left_center_p3 = zebra_start_left_center
-        add_quad_bezier_points(split_left.leftBoundary.point, t_step, left_center_p0, left_center_p1, left_center_p2,
+        add_quad_bezier_points(split_left_left, t_step, left_center_p0, left_center_p1, left_center_p2,
                                left_center_p3)
 
         left_outer_p0 = left_split_starting
         left_outer_p1 = left_split_starting + self._principal_direction * p1_offset
         left_outer_p2 = zebra_start_left_outer - self._principal_direction * p1_offset
         left_outer_p3 = zebra_start_left_outer
-        add_quad_bezier_points(split_left.rightBoundary.point, t_step, left_outer_p0, left_outer_p1, left_outer_p2,
+        add_quad_bezier_points(split_left_right, t_step, left_outer_p0, left_outer_p1, left_outer_p2,
                                left_outer_p3)
 
         # populate center blocked area object
-        starting_junction = schema.trafficIslandJunction()
-        starting_junction.point.append(schema.point(x=zebra_start_right_center[0], y=zebra_start_right_center[1]))
-        starting_junction.point.append(schema.point(x=zebra_start_left_center[0], y=zebra_start_left_center[1]))
+        starting_junction = [zebra_start_right_center, zebra_start_left_center]
 
         A = np.zeros(2)
         A[0] = math.sin(27 / 180 * math.pi)
@@ -902,8 +764,8 @@ class TrafficIsland(Primitive):
             sol = root_scalar(partial(quad_bezier_line_function, p0=left_center_p0, p1=left_center_p1,
                                       p2=left_center_p2, p3=left_center_p3, A=A, d=d), bracket=[0, 1], method='brentq')
             sol_point = _compute_cubic_bezier(sol.root, left_center_p0, left_center_p1, left_center_p2, left_center_p3)
-            starting_junction.point.append(schema.point(x=zebra_start_right_center[0], y=y))
-            starting_junction.point.append(schema.point(x=sol_point[0], y=sol_point[1]))
+            starting_junction.append([zebra_start_right_center[0], y])
+            starting_junction.append(sol_point)
 
         y = zebra_start_right_center[1]
         for x in np.arange(zebra_start_right_center[0], split_starting_point[0], -0.15):
@@ -917,108 +779,65 @@ class TrafficIsland(Primitive):
                 continue
             sol_point_right = _compute_cubic_bezier(sol_right.root, right_center_p0, right_center_p1, right_center_p2,
                                                     right_center_p3)
-            starting_junction.point.append(schema.point(x=sol_point_right[0], y=sol_point_right[1]))
+            starting_junction.append(sol_point_right)
 
             sol_left = root_scalar(partial(quad_bezier_line_function, p0=left_center_p0, p1=left_center_p1,
                                            p2=left_center_p2, p3=left_center_p3, A=A, d=d), bracket=[0, 1],
                                    method='brentq')
             sol_point_left = _compute_cubic_bezier(sol_left.root, left_center_p0, left_center_p1, left_center_p2,
                                                    left_center_p3)
-            starting_junction.point.append(schema.point(x=sol_point_left[0], y=sol_point_left[1]))
+            starting_junction.append(sol_point_left)
 
+        stop_line_attributes = None
         if self._zebraMarkingType == "lines":
-            split_right.stopLine = "dashed"
-            split_right.stopLineAttributes = schema.lineMarkingAttributes(lineWidth=0.02, segmentLength=0.04,
-                                                                          segmentGap=0.04)
+            stop_line_attributes = scenario.LineMarkingAttributes(lineWidth=0.02, segmentLength=0.04,
+                                                                  segmentGap=0.04)
 
         # zebra
-        zebra_start_right_center = zebra_start_right_center
-        zebra_start_right_outer = zebra_start_right_outer
         zebra_end_right_center = zebra_start_right_center + self._principal_direction * self._zebraLength
         zebra_end_right_outer = zebra_start_right_outer + self._principal_direction * self._zebraLength
-
-        zebra_start_left_center = zebra_start_left_center
-        zebra_start_left_outer = zebra_start_left_outer
         zebra_end_left_center = zebra_start_left_center + self._principal_direction * self._zebraLength
         zebra_end_left_outer = zebra_start_left_outer + self._principal_direction * self._zebraLength
 
-        crossing_right = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-        crossing_left = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
+        crossing_right = make_lanelet([], [])
+        crossing_left = make_lanelet([], [])
 
         if self._zebraMarkingType == "zebra":
-            split_right.rightBoundary.point.append(schema.point(x=zebra_end_right_outer[0],
-                                                                y=zebra_end_right_outer[1]))
-            split_right.leftBoundary.point.append(schema.point(x=zebra_end_right_center[0],
-                                                               y=zebra_end_right_center[1]))
-            split_left.rightBoundary.point.append(schema.point(x=zebra_end_left_outer[0],
-                                                               y=zebra_end_left_outer[1]))
-            split_left.leftBoundary.point.append(schema.point(x=zebra_end_left_center[0],
-                                                              y=zebra_end_left_center[1]))
+            split_right_right.append(zebra_end_right_outer)
+            split_right_left.append(zebra_end_right_center)
+            split_left_right.append(zebra_end_left_outer)
+            split_left_left.append(zebra_end_left_center)
 
+            crossing_right = make_lanelet([zebra_start_right_center, zebra_start_right_outer],
+                                          [zebra_end_right_center, zebra_end_right_outer])
             crossing_right.type = "zebraCrossing"
-            crossing_right.leftBoundary.point.append(schema.point(x=zebra_start_right_center[0],
-                                                                  y=zebra_start_right_center[1]))
-            crossing_right.leftBoundary.point.append(schema.point(x=zebra_start_right_outer[0],
-                                                                  y=zebra_start_right_outer[1]))
-            crossing_right.rightBoundary.point.append(schema.point(x=zebra_end_right_center[0],
-                                                                   y=zebra_end_right_center[1]))
-            crossing_right.rightBoundary.point.append(schema.point(x=zebra_end_right_outer[0],
-                                                                   y=zebra_end_right_outer[1]))
-
+            crossing_left = make_lanelet([zebra_start_left_center, zebra_start_left_outer],
+                                         [zebra_end_left_center, zebra_end_left_outer])
             crossing_left.type = "zebraCrossing"
-            crossing_left.leftBoundary.point.append(schema.point(x=zebra_start_left_center[0],
-                                                                  y=zebra_start_left_center[1]))
-            crossing_left.leftBoundary.point.append(schema.point(x=zebra_start_left_outer[0],
-                                                                  y=zebra_start_left_outer[1]))
-            crossing_left.rightBoundary.point.append(schema.point(x=zebra_end_left_center[0],
-                                                                   y=zebra_end_left_center[1]))
-            crossing_left.rightBoundary.point.append(schema.point(x=zebra_end_left_outer[0],
-                                                                   y=zebra_end_left_outer[1]))
         elif self._zebraMarkingType == "lines":
-            crossing_right.rightBoundary.lineMarking = "solid"
-            crossing_right.leftBoundary.lineMarking = "solid"
-            crossing_right.leftBoundary.point.append(schema.point(x=zebra_start_right_center[0],
-                                                                  y=zebra_start_right_center[1]))
-            crossing_right.leftBoundary.point.append(schema.point(x=zebra_end_right_center[0],
-                                                                  y=zebra_end_right_center[1]))
-            crossing_right.rightBoundary.point.append(schema.point(x=zebra_start_right_outer[0],
-                                                                   y=zebra_start_right_outer[1]))
-            crossing_right.rightBoundary.point.append(schema.point(x=zebra_end_right_outer[0],
-                                                                   y=zebra_end_right_outer[1]))
+            crossing_right = make_lanelet([zebra_start_right_center, zebra_end_right_center],
+                                          [zebra_start_right_outer, zebra_end_right_outer],
+                                          "solid", "solid")
             crossing_right.stopLine = "dashed"
-            crossing_right.stopLineAttributes = split_right.stopLineAttributes
-
-            crossing_left.rightBoundary.lineMarking = "solid"
-            crossing_left.leftBoundary.lineMarking = "solid"
-            crossing_left.leftBoundary.point.append(schema.point(x=zebra_start_left_center[0],
-                                                                 y=zebra_start_left_center[1]))
-            crossing_left.leftBoundary.point.append(schema.point(x=zebra_end_left_center[0],
-                                                                 y=zebra_end_left_center[1]))
-            crossing_left.rightBoundary.point.append(schema.point(x=zebra_start_left_outer[0],
-                                                                  y=zebra_start_left_outer[1]))
-            crossing_left.rightBoundary.point.append(schema.point(x=zebra_end_left_outer[0],
-                                                                  y=zebra_end_left_outer[1]))
-            crossing_left.leftBoundary.point.reverse()
-            crossing_left.rightBoundary.point.reverse()
+            crossing_right.stopLineAttributes = stop_line_attributes
+
+            crossing_left = make_lanelet([zebra_end_left_center, zebra_start_left_center],
+                                         [zebra_end_left_outer, zebra_start_left_outer],
+                                         "solid", "solid")
             crossing_left.stopLine = "dashed"
-            crossing_left.stopLineAttributes = split_right.stopLineAttributes
+            crossing_left.stopLineAttributes = stop_line_attributes
 
-        split_left.leftBoundary.point.reverse()
-        split_left.rightBoundary.point.reverse()
+        split_right = make_lanelet(split_right_left, split_right_right, "solid", "solid")
+        split_left = make_lanelet(split_left_left[::-1], split_left_right[::-1], "solid", "solid")
+        if self._zebraMarkingType == "lines":
+            split_right.stopLine = "dashed"
+            split_right.stopLineAttributes = stop_line_attributes
 
         # quad beziers merging at the back
-        merge_right = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-        merge_right.rightBoundary.lineMarking = "solid"
-        merge_right.leftBoundary.lineMarking = "solid"
-
-        merge_left = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-        merge_left.rightBoundary.lineMarking = "solid"
-        merge_left.leftBoundary.lineMarking = "solid"
-
-        merge_right.leftBoundary.point.append(schema.point(x=zebra_end_right_center[0], y=zebra_end_right_center[1]))
-        merge_left.leftBoundary.point.append(schema.point(x=zebra_end_left_center[0], y=zebra_end_left_center[1]))
-        merge_right.rightBoundary.point.append(schema.point(x=zebra_end_right_outer[0], y=zebra_end_right_outer[1]))
-        merge_left.rightBoundary.point.append(schema.point(x=zebra_end_left_outer[0], y=zebra_end_left_outer[1]))
+        merge_right_left = [zebra_end_right_center]
+        merge_left_left = [zebra_end_left_center]
+        merge_right_right = [zebra_end_right_outer]
+        merge_left_right = [zebra_end_left_outer]
 
         merge_center = split_starting_point + self._principal_direction * (self._curve_area_length * 2 +
                                                                            self._zebraLength)
@@ -1031,13 +850,13 @@ class TrafficIsland(Primitive):
         right_center_p1 = zebra_end_right_center + self._principal_direction * p1_offset
         right_center_p2 = merge_center - self._principal_direction * p1_offset
         right_center_p3 = merge_center
-        add_quad_bezier_points(merge_right.leftBoundary.point, t_step, right_center_p0, right_center_p1,
+        add_quad_bezier_points(merge_right_left, t_step, right_center_p0, right_center_p1,
                                right_center_p2, right_center_p3)
         right_outer_p0 = zebra_end_right_outer
         right_outer_p1 = zebra_end_right_outer + self._principal_direction * p1_offset
         right_outer_p2 = merge_outer_right - self._principal_direction * p1_offset
         right_outer_p3 = merge_outer_right
-        add_quad_bezier_points(merge_right.rightBoundary.point, t_step, right_outer_p0, right_outer_p1, right_outer_p2,
+        add_quad_bezier_points(merge_right_right, t_step, right_outer_p0, right_outer_p1, right_outer_p2,
                                right_outer_p3)
 
         # left lanelet
@@ -1045,27 +864,25 @@ class TrafficIsland(Primitive):
         left_center_p1 = zebra_end_left_center + self._principal_direction * p1_offset
         left_center_p2 = merge_center - self._principal_direction * p1_offset
         left_center_p3 = merge_center
-        add_quad_bezier_points(merge_left.leftBoundary.point, t_step, left_center_p0, left_center_p1, left_center_p2,
+        add_quad_bezier_points(merge_left_left, t_step, left_center_p0, left_center_p1, left_center_p2,
                                left_center_p3)
 
         left_outer_p0 = zebra_end_left_outer
         left_outer_p1 = zebra_end_left_outer + self._principal_direction * p1_offset
         left_outer_p2 = merge_outer_left - self._principal_direction * p1_offset
         left_outer_p3 = merge_outer_left
-        add_quad_bezier_points(merge_left.rightBoundary.point, t_step, left_outer_p0, left_outer_p1, left_outer_p2,
+        add_quad_bezier_points(merge_left_right, t_step, left_outer_p0, left_outer_p1, left_outer_p2,
                                left_outer_p3)
 
-        merge_left.leftBoundary.point.reverse()
-        merge_left.rightBoundary.point.reverse()
+        merge_right = make_lanelet(merge_right_left, merge_right_right, "solid", "solid")
+        merge_left = make_lanelet(merge_left_left[::-1], merge_left_right[::-1], "solid", "solid")
 
         if self._zebraMarkingType == "lines":
             merge_left.stopLine = "dashed"
-            merge_left.stopLineAttributes = split_right.stopLineAttributes
+            merge_left.stopLineAttributes = stop_line_attributes
 
         # junction object at the end
-        merging_junction = schema.trafficIslandJunction()
-        merging_junction.point.append(schema.point(x=zebra_end_right_center[0], y=zebra_end_right_center[1]))
-        merging_junction.point.append(schema.point(x=zebra_end_left_center[0], y=zebra_end_left_center[1]))
+        merging_junction = [zebra_end_right_center, zebra_end_left_center]
 
         A = np.zeros(2)
         A[0] = -math.sin(27 / 180 * math.pi)
@@ -1075,8 +892,8 @@ class TrafficIsland(Primitive):
             sol = root_scalar(partial(quad_bezier_line_function, p0=left_center_p0, p1=left_center_p1,
                                       p2=left_center_p2, p3=left_center_p3, A=A, d=d), bracket=[0, 1], method='brentq')
             sol_point = _compute_cubic_bezier(sol.root, left_center_p0, left_center_p1, left_center_p2, left_center_p3)
-            starting_junction.point.append(schema.point(x=zebra_end_right_center[0], y=y))
-            starting_junction.point.append(schema.point(x=sol_point[0], y=sol_point[1]))
+            starting_junction.append([zebra_end_right_center[0], y])
+            starting_junction.append(sol_point)
 
         y = zebra_end_right_center[1]
         for x in np.arange(zebra_end_right_center[0], merge_center[0], 0.15):
@@ -1090,46 +907,33 @@ class TrafficIsland(Primitive):
                 continue
             sol_point_right = _compute_cubic_bezier(sol_right.root, right_center_p0, right_center_p1, right_center_p2,
                                                     right_center_p3)
-            starting_junction.point.append(schema.point(x=sol_point_right[0], y=sol_point_right[1]))
+            starting_junction.append(sol_point_right)
 
             sol_left = root_scalar(partial(quad_bezier_line_function, p0=left_center_p0, p1=left_center_p1,
                                            p2=left_center_p2, p3=left_center_p3, A=A, d=d), bracket=[0, 1],
                                    method='brentq')
             sol_point_left = _compute_cubic_bezier(sol_left.root, left_center_p0, left_center_p1, left_center_p2,
                                                    left_center_p3)
-            starting_junction.point.append(schema.point(x=sol_point_left[0], y=sol_point_left[1]))
+            starting_junction.append(sol_point_left)
 
         # end straight padding lines
-        end_padding_right = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-        end_padding_left = schema.lanelet(leftBoundary=schema.boundary(), rightBoundary=schema.boundary())
-        end_padding_right.rightBoundary.lineMarking = "solid"
-        end_padding_right.leftBoundary.lineMarking = "dashed"
-        end_padding_left.rightBoundary.lineMarking = "solid"
-        end_padding_left.leftBoundary.lineMarking = "dashed"
-        end_padding_right.leftBoundary.point.append(schema.point(x=merge_center[0], y=merge_center[1]))
-        end_padding_left.leftBoundary.point.append(schema.point(x=merge_center[0], y=merge_center[1]))
-        end_padding_right.rightBoundary.point.append(schema.point(x=merge_outer_right[0], y=merge_outer_right[1]))
-        end_padding_left.rightBoundary.point.append(schema.point(x=merge_outer_left[0], y=merge_outer_left[1]))
-
         end_center = merge_center + self._principal_direction * self._padding
         end_right = end_center - self._orthogonal_direction * config.road_width
         end_left = end_center + self._orthogonal_direction * config.road_width
 
-        end_padding_right.leftBoundary.point.append(schema.point(x=end_center[0], y=end_center[1]))
-        end_padding_left.leftBoundary.point.append(schema.point(x=end_center[0], y=end_center[1]))
-        end_padding_right.rightBoundary.point.append(schema.point(x=end_right[0], y=end_right[1]))
-        end_padding_left.rightBoundary.point.append(schema.point(x=end_left[0], y=end_left[1]))
+        end_padding_right = make_lanelet([merge_center, end_center],
+            [merge_outer_right, end_right], "dashed", "solid")
+        end_padding_left = make_lanelet([end_center, merge_center],
+            [end_left, merge_outer_left], "dashed", "solid")
 
         export = Export([padding_right, padding_left, split_right, split_left, crossing_right, crossing_left,
                          merge_right, merge_left, end_padding_right, end_padding_left],
-                        [(padding_right, padding_left), (split_right, split_left), (crossing_right, crossing_left),
-                         (merge_right, merge_left), (end_padding_right, end_padding_left)])
-        export.objects.append(schema.trafficSign(type="stvo-222", orientation=-math.pi/2,
-                                                 centerPoint=schema.point(x=self._padding + self._signDistance, y=0.0)))
-        export.objects.append(schema.trafficSign(type="stvo-222", orientation=math.pi/2,
-                                                 centerPoint=schema.point(x=self._length-self._padding -
-                                                                            self._signDistance, y=0.0)))
-        export.objects.append(starting_junction)
-        export.objects.append(merging_junction)
-
-        return export
\ No newline at end of file
+                        [(split_right, split_left), (crossing_right, crossing_left), (merge_right, merge_left)])
+        export.objects.append(scenario.TrafficSign("stvo-222", -math.pi/2,
+                                                   [self._padding + self._signDistance, 0.0]))
+        export.objects.append(scenario.TrafficSign("stvo-222", math.pi/2,
+                                                   [self._length-self._padding - self._signDistance, 0.0]))
+        export.objects.append(scenario.IslandJunction(starting_junction))
+        export.objects.append(scenario.IslandJunction(merging_junction))
+
+        return export
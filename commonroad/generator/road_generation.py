@@ -1,9 +1,14 @@
-from commonroad.generator import primitive, preset_parser
+from commonroad.generator import connectivity, primitive, preset_parser
+from commonroad import scenario
 import math
-import matplotlib.pyplot as plt
 import numpy as np
 import random
-import sys
+
+class Config:
+    def __init__(self):
+        self.road_width = 0.4
+        # TODO: move this to an enum in the generated pyxb schema
+        self.turn_road_marking_width = 0.072
 
 def norm_angle(angle):
     while angle > 2 * math.pi:
@@ -40,8 +45,8 @@ def check_intersections(road, road_width):
                 return True
     return False
 
-def generate(root):
-    random.seed()
+def generate(root, seed=None):
+    random.seed(seed)
     while True:
         preset = preset_parser.eval(root)
         primitives = preset.primitives
@@ -50,3 +55,19 @@ def generate(root):
             break
 
     return road
+
+def export(primitives, config):
+    doc = scenario.Scenario()
+    id = 0
+    opposite_pairs = []
+    for p in primitives:
+        export = p.export(config)
+        opposite_pairs += export.opposite_pairs
+        for obj in export.objects:
+            id -= 1
+            if hasattr(obj, "id"):
+                obj.id = id
+            doc.append(obj)
+
+    connectivity.connect(doc.lanelet, opposite_pairs)
+    return doc
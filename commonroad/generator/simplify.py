@@ -0,0 +1,86 @@
+import numpy as np
+
+class SimplifyStats:
+    def __init__(self):
+        self.points_before = 0
+        self.points_after = 0
+        self.max_deviation = 0.0
+
+    def add(self, before, after, deviation):
+        self.points_before += before
+        self.points_after += after
+        self.max_deviation = max(self.max_deviation, deviation)
+
+    def reduction(self):
+        if self.points_before == 0:
+            return 0.0
+        return 1 - self.points_after / self.points_before
+
+    def __repr__(self):
+        return ("simplified boundaries: {0} -> {1} points ({2:.1%} reduction), "
+            "max deviation {3:.6f} m").format(self.points_before,
+            self.points_after, self.reduction(), self.max_deviation)
+
+def segment_distances(points, a, b):
+    # distance to the segment a-b, not to the infinite line through it
+    ab = b - a
+    length_sq = ab.dot(ab)
+    if length_sq == 0:
+        return np.linalg.norm(points - a, axis=1)
+    t = np.clip((points - a).dot(ab) / length_sq, 0, 1)
+    return np.linalg.norm(points - (a + t[:, None] * ab), axis=1)
+
+def douglas_peucker(points, tolerance):
+    """Indices of the points kept by Douglas-Peucker simplification.
+
+    Every dropped point lies within `tolerance` (in metres) of the
+    simplified polyline. The first and last point are always kept.
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return np.flatnonzero(keep)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        distances = segment_distances(points[first+1:last], points[first],
+            points[last])
+        i = np.argmax(distances)
+        if distances[i] > tolerance:
+            i += first + 1
+            keep[i] = True
+            stack.append((first, i))
+            stack.append((i, last))
+    return np.flatnonzero(keep)
+
+def max_deviation(points, keep):
+    points = np.asarray(points, dtype=float)
+    deviation = 0.0
+    for (first, last) in zip(keep, keep[1:]):
+        if last - first < 2:
+            continue
+        distances = segment_distances(points[first+1:last], points[first],
+            points[last])
+        deviation = max(deviation, distances.max())
+    return deviation
+
+def simplify_boundary(boundary, tolerance, stats):
+    points = boundary.points
+    keep = douglas_peucker(points, tolerance)
+    deviation = max_deviation(points, keep)
+    if deviation > tolerance:
+        raise ValueError("simplification exceeded tolerance: {0} > {1}".format(
+            deviation, tolerance))
+    stats.add(len(points), len(keep), deviation)
+    boundary.points = points[keep]
+
+def simplify_lanelets(lanelets, tolerance):
+    stats = SimplifyStats()
+    for lanelet in lanelets:
+        simplify_boundary(lanelet.leftBoundary, tolerance, stats)
+        simplify_boundary(lanelet.rightBoundary, tolerance, stats)
+    return stats
@@ -0,0 +1,136 @@
+"""Fast CommonRoad XML reader.
+
+Parses a document with lxml iterparse into a `commonroad.scenario.Scenario`,
+one top-level element at a time, and only reads the elements the renderer
+uses. Everything else (planning problems, trajectories, ...) is skipped.
+`read_pyxb` goes through the full PyXB bindings instead, `read_file` also
+handles binary scenarios and compressed files.
+"""
+import numpy as np
+from lxml import etree
+from commonroad import scenario, binary, streams
+
+def _float(element, tag):
+    return float(element.findtext(tag))
+
+def _point(element):
+    return scenario.as_point(_float(element, "x"), _float(element, "y"))
+
+def _points(element):
+    coords = [float(c.text) for p in element.iterfind("point")
+        for c in (p.find("x"), p.find("y"))]
+    return np.array(coords, dtype=float).reshape(-1, 2)
+
+def _boundary(element):
+    return scenario.Boundary(_points(element), element.findtext("lineMarking"))
+
+def _refs(element):
+    if element is None:
+        return []
+    return [int(ref.get("ref")) for ref in element.iterfind("lanelet")]
+
+def _adjacent(element):
+    if element is None:
+        return None
+    return scenario.AdjacentRef(int(element.get("ref")), element.get("drivingDir"))
+
+def _lanelet(element):
+    lanelet = scenario.Lanelet(_boundary(element.find("leftBoundary")),
+        _boundary(element.find("rightBoundary")), element.findtext("type"))
+    lanelet.id = int(element.get("id"))
+    lanelet.isStart = element.findtext("isStart") in ("true", "1")
+    lanelet.predecessor = _refs(element.find("predecessor"))
+    lanelet.successor = _refs(element.find("successor"))
+    lanelet.adjacentLeft = _adjacent(element.find("adjacentLeft"))
+    lanelet.adjacentRight = _adjacent(element.find("adjacentRight"))
+    lanelet.stopLine = element.findtext("stopLine")
+    attributes = element.find("stopLineAttributes")
+    if attributes is not None:
+        lanelet.stopLineAttributes = scenario.LineMarkingAttributes(
+            _float(attributes, "lineWidth"), _float(attributes, "segmentLength"),
+            _float(attributes, "segmentGap"))
+    return lanelet
+
+def _shape(element):
+    shape = scenario.Shape()
+    for rect in element.iterfind("rectangle"):
+        shape.rectangle.append(scenario.Rectangle(_float(rect, "length"),
+            _float(rect, "width"), _float(rect, "orientation"),
+            _point(rect.find("centerPoint"))))
+    for circle in element.iterfind("circle"):
+        shape.circle.append(scenario.Circle(_float(circle, "radius"),
+            _point(circle.find("centerPoint"))))
+    for polygon in element.iterfind("polygon"):
+        shape.polygon.append(scenario.Polygon(_points(polygon)))
+    return shape
+
+def _obstacle(element):
+    obstacle = scenario.Obstacle(element.findtext("role"),
+        element.findtext("type"), _shape(element.find("shape")))
+    obstacle.id = int(element.get("id"))
+    return obstacle
+
+def _traffic_sign(element):
+    sign = scenario.TrafficSign(element.findtext("type"),
+        _float(element, "orientation"), _point(element.find("centerPoint")))
+    sign.id = int(element.get("id"))
+    return sign
+
+def _ramp(element):
+    ramp = scenario.Ramp(_float(element, "orientation"),
+        _point(element.find("centerPoint")))
+    ramp.id = int(element.get("id"))
+    return ramp
+
+def _road_marking(element):
+    marking = scenario.RoadMarking(element.findtext("type"),
+        _float(element, "orientation"), _point(element.find("centerPoint")))
+    marking.id = int(element.get("id"))
+    return marking
+
+def _island_junction(element):
+    return scenario.IslandJunction(_points(element))
+
+ELEMENT_READERS = {
+    "lanelet": _lanelet,
+    "obstacle": _obstacle,
+    "trafficSign": _traffic_sign,
+    "ramp": _ramp,
+    "roadMarking": _road_marking,
+    "islandJunction": _island_junction,
+}
+
+def read(source):
+    """Reads a scenario from a file name or binary file object."""
+    doc = scenario.Scenario()
+    for (_, element) in etree.iterparse(source, tag=list(ELEMENT_READERS)):
+        parent = element.getparent()
+        # skip lanelet refs nested in predecessor/successor lists
+        if parent is None or parent.getparent() is not None:
+            continue
+        doc.append(ELEMENT_READERS[element.tag](element))
+        # free already processed elements
+        element.clear()
+        while element.getprevious() is not None:
+            del parent[0]
+    return doc
+
+def read_pyxb(source):
+    """Reads a scenario through the PyXB bindings (validating, but slow)."""
+    from commonroad import schema
+    if hasattr(source, "read"):
+        content = source.read()
+    else:
+        with open(source, "rb") as file:
+            content = file.read()
+    return scenario.from_schema(schema.CreateFromDocument(content))
+
+def read_file(name="-", compression=None, pyxb=False):
+    """Reads an XML or binary scenario, optionally compressed, from a file
+    name or "-" for stdin."""
+    with streams.open_input(name, compression) as file:
+        if binary.is_binary(file):
+            return binary.read(file)
+        elif pyxb:
+            return read_pyxb(file)
+        return read(file)
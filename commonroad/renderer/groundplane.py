@@ -1,22 +1,33 @@
 import cairo
 # have to use pycairo instead of cairocffi as Rsvg bindings don't work with the latter
 #import cairocffi as cairo
+import functools
 import math
 from commonroad import utils
+from commonroad.renderer import png, tilecache
 from os import path
 import os
+import time
 import hashlib
+import threading
 from tqdm import tqdm
 import numpy as np
 from enum import Enum
-from collections import namedtuple
-import gi
-gi.require_version('Rsvg', '2.0')
-from gi.repository import Rsvg
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+from multiprocessing import Pool
 
 PIXEL_PER_UNIT = 500
 TILE_SIZE = 2048
 PADDING = 3
+# zlib level of the tile PNGs, 1 is fastest, 9 smallest
+PNG_LEVEL = 6
+WRITER_THREADS = 2
+# extents of drawables beyond their points, covering line widths, miter
+# joins and antialiasing, and the text and arrows of road markings
+LINE_MARGIN = 0.2
+ROAD_MARKING_RADIUS = 1.0
 
 
 class MarkerImage(Enum):
@@ -25,6 +36,9 @@ class MarkerImage(Enum):
 
 StreetMarking = namedtuple('StreetMarking', ['marker_image', 'marker_text', 'crossed'])
 
+# points of consecutive lanelet boundaries drawn as one line
+BoundaryRun = namedtuple('BoundaryRun', ['points', 'line_marking'])
+
 
 ROADMARKING_TYPE_TO_VISUAL = {
     "10_zone_beginn": StreetMarking(marker_image=None, marker_text='10', crossed=False),
@@ -59,15 +73,15 @@ def draw_boundary(ctx, boundary):
     else:
         ctx.set_dash([])
 
-    ctx.move_to(boundary.point[0].x, boundary.point[0].y)
-    for p in boundary.point[1:]:
-        ctx.line_to(p.x, p.y)
+    ctx.move_to(*boundary.points[0])
+    for (x, y) in boundary.points[1:].tolist():
+        ctx.line_to(x, y)
     ctx.stroke()
 
 def draw_stop_line(ctx, lanelet):
     ctx.save()
-    p1 = lanelet.leftBoundary.point[-1]
-    p2 = lanelet.rightBoundary.point[-1]
+    p1 = lanelet.leftBoundary.points[-1]
+    p2 = lanelet.rightBoundary.points[-1]
 
     if lanelet.stopLine:
         lineWidth = 0.04
@@ -83,14 +97,14 @@ def draw_stop_line(ctx, lanelet):
             ctx.set_dash([])
             ctx.set_line_cap(cairo.LINE_CAP_BUTT)
         ctx.set_line_width(lineWidth)
-        ctx.move_to(p1.x, p1.y)
-        ctx.line_to(p2.x, p2.y)
+        ctx.move_to(p1[0], p1[1])
+        ctx.line_to(p2[0], p2[1])
         ctx.stroke()
     ctx.restore()
 
 def draw_rectangle(ctx, rectangle):
     ctx.save()
-    ctx.translate(rectangle.centerPoint.x, rectangle.centerPoint.y)
+    ctx.translate(rectangle.centerPoint[0], rectangle.centerPoint[1])
     ctx.rotate(-rectangle.orientation)
     ctx.rectangle(- rectangle.length / 2, - rectangle.width / 2,
         rectangle.length, rectangle.width)
@@ -98,13 +112,13 @@ def draw_rectangle(ctx, rectangle):
     ctx.restore()
 
 def draw_circle(ctx, circle):
-    ctx.arc(circle.centerPoint.x, circle.centerPoint.y, circle.radius, 0, 2*math.pi)
+    ctx.arc(circle.centerPoint[0], circle.centerPoint[1], circle.radius, 0, 2*math.pi)
     ctx.fill()
 
 def draw_polygon(ctx, polygon):
-    ctx.move_to(polygon.point[0].x, polygon.point[1].y)
-    for point in polygon.point[1:]:
-        ctx.line_to(point.x, point.y)
+    ctx.move_to(polygon.points[0][0], polygon.points[1][1])
+    for (x, y) in polygon.points[1:].tolist():
+        ctx.line_to(x, y)
     ctx.fill()
 
 def draw_shape(ctx, shape):
@@ -119,49 +133,71 @@ def draw_island_junction(ctx, island):
     ctx.save()
     ctx.set_dash([])
     ctx.set_line_width (0.02)
-    for i in range(0, len(island.point), 2):
-        ctx.move_to(island.point[i].x, island.point[i].y)
-        ctx.line_to(island.point[i+1].x, island.point[i+1].y)
+    for i in range(0, len(island.points), 2):
+        ctx.move_to(*island.points[i])
+        ctx.line_to(*island.points[i+1])
     ctx.stroke()
     ctx.restore()
 
+# stamps and SVG handles are built once per process
+
+@functools.lru_cache(maxsize=None)
+def text_stamp(text, pixel_per_unit):
+    """Outline of a speed limit number as a cairo path and its text
+    extents, hinted for `pixel_per_unit`."""
+    ctx = cairo.Context(cairo.ImageSurface(cairo.FORMAT_A8, 1, 1))
+    # outlines at the resolution they are drawn with
+    ctx.scale(pixel_per_unit, pixel_per_unit)
+    ctx.select_font_face("DIN 1451 Std", cairo.FONT_SLANT_NORMAL)
+    ctx.set_font_size(0.4)
+    ctx.text_path(text)
+    return (ctx.copy_path(), ctx.text_extents(text))
+
+@functools.lru_cache(maxsize=None)
+def svg_handle(file):
+    """Parsed SVG image, drawn with its render_cairo."""
+    # gi is slow to import and only needed for image markings
+    import gi
+    gi.require_version('Rsvg', '2.0')
+    from gi.repository import Rsvg
+    return Rsvg.Handle.new_from_file(file)
+
 def draw_road_marking(ctx, marking):
     marking_visual = ROADMARKING_TYPE_TO_VISUAL[marking.type]
+    # the resolution the scene is drawn at, _prepared.pixel_per_unit when
+    # recorded for the tiles
+    pixel_per_unit = math.hypot(*ctx.user_to_device_distance(1, 0))
+    # crossing lines are sized by '30' for all numbers
+    (x_bearing, y_bearing, text_width, text_height,
+     x_advance, y_advance) = text_stamp('30', pixel_per_unit)[1]
     if marking_visual.marker_text:
         ctx.save()
         ctx.set_dash([])
-        font = "DIN 1451 Std"
-        font_size = 0.4
-        text = '30'
-        font_args = [cairo.FONT_SLANT_NORMAL]
-        ctx.translate(marking.centerPoint.x, #- 0.145*math.cos(marking.orientation),
-                      marking.centerPoint.y) #- 0.145*math.sin(marking.orientation))
+        ctx.translate(marking.centerPoint[0], #- 0.145*math.cos(marking.orientation),
+                      marking.centerPoint[1]) #- 0.145*math.sin(marking.orientation))
         ctx.rotate(marking.orientation)
         # mirror text
         ctx.transform(cairo.Matrix(1.0, 0, 0, -1, 0, 0))
         ctx.translate(-0.145, 0.29)
-        ctx.select_font_face(font, *font_args)
-        ctx.set_font_size(font_size)
-        ctx.text_path(marking_visual.marker_text)
+        ctx.new_path()
+        ctx.append_path(text_stamp(marking_visual.marker_text, pixel_per_unit)[0])
         ctx.set_line_width(0.01)
-        (x_bearing, y_bearing, text_width, text_height,
-         x_advance, y_advance) = ctx.text_extents(text)
         ctx.fill_preserve()
         ctx.stroke()
         ctx.restore()
     if marking_visual.crossed:
         ctx.save()
-        ctx.move_to(marking.centerPoint.x + 0.145 * math.cos(marking.orientation),
-                    marking.centerPoint.y + 0.145 * math.sin(marking.orientation))
-        ctx.line_to(marking.centerPoint.x + 0.145 * math.cos(marking.orientation)
+        ctx.move_to(marking.centerPoint[0] + 0.145 * math.cos(marking.orientation),
+                    marking.centerPoint[1] + 0.145 * math.sin(marking.orientation))
+        ctx.line_to(marking.centerPoint[0] + 0.145 * math.cos(marking.orientation)
                     - text_height * math.cos(marking.orientation) + text_width * math.sin(marking.orientation),
-                    marking.centerPoint.y + 0.145 * math.sin(marking.orientation)
+                    marking.centerPoint[1] + 0.145 * math.sin(marking.orientation)
                     - text_height * math.sin(marking.orientation) - text_width * math.cos(marking.orientation))
-        ctx.move_to(marking.centerPoint.x + (0.145 - text_height) * math.cos(marking.orientation),
-                    marking.centerPoint.y + (0.145 - text_height) * math.sin(marking.orientation))
-        ctx.line_to(marking.centerPoint.x + 0.145 * math.cos(marking.orientation)
+        ctx.move_to(marking.centerPoint[0] + (0.145 - text_height) * math.cos(marking.orientation),
+                    marking.centerPoint[1] + (0.145 - text_height) * math.sin(marking.orientation))
+        ctx.line_to(marking.centerPoint[0] + 0.145 * math.cos(marking.orientation)
                     + text_width * math.sin(marking.orientation),
-                    marking.centerPoint.y + 0.145 * math.sin(marking.orientation)
+                    marking.centerPoint[1] + 0.145 * math.sin(marking.orientation)
                     - text_width * math.cos(marking.orientation))
         ctx.set_line_width(0.05)
         ctx.stroke()
@@ -169,18 +205,18 @@ def draw_road_marking(ctx, marking):
 
     if marking_visual.marker_image:
         ctx.save()
-        handle = Rsvg.Handle()
-        svg = handle.new_from_file(marking_visual.marker_image.value)
-        ctx.translate(marking.centerPoint.x, marking.centerPoint.y)
+        ctx.translate(marking.centerPoint[0], marking.centerPoint[1])
         ctx.rotate(marking.orientation)
         ctx.scale(0.001, 0.001)
-        svg.render_cairo(ctx)
+        # drawn into the scene recording, not painted from a nested one,
+        # which cairo resamples at the edges
+        svg_handle(marking_visual.marker_image.value).render_cairo(ctx)
         ctx.restore()
 
 
 def draw_stripes_rect(ctx, rectangle):
     ctx.save()
-    ctx.translate(rectangle.centerPoint.x, rectangle.centerPoint.y)
+    ctx.translate(rectangle.centerPoint[0], rectangle.centerPoint[1])
     ctx.rotate(-rectangle.orientation)
 
     ctx.set_line_width (0.02)
@@ -210,6 +246,8 @@ def draw_zebra_crossing(ctx, lanelet):
     right = boundary_to_equi_distant(lanelet.rightBoundary, 0.04, 0.02)
     flag = True
     ctx.save()
+    # one fill per stripe, stripes on curves overlap and a single fill
+    # would not add up their antialiasing coverage the same way
     for (l, r) in zip(left, right):
         if flag:
             ctx.move_to(l[0], l[1])
@@ -223,33 +261,19 @@ def draw_zebra_crossing(ctx, lanelet):
             flag = True
     ctx.restore()
 
-def distance_points(p1, p2):
-    dx = p2.x - p1.x
-    dy = p2.y - p1.y
-    return math.sqrt(dx*dx + dy*dy)
-
 def boundary_length(boundary):
-    length = 0
-    for (p1, p2) in zip(boundary.point, boundary.point[1:]):
-        length += distance_points(p1, p2)
-    return length
+    return boundary_point_lengths(boundary)[-1]
 
 def boundary_point_lengths(boundary):
-    result = [0]
-    len = 0
-    for (p1, p2) in zip(boundary.point, boundary.point[1:]):
-        len += distance_points(p1, p2)
-        result.append(len)
-    return result
+    segments = np.linalg.norm(np.diff(boundary.points, axis=0), axis=1)
+    return np.concatenate(([0], np.cumsum(segments)))
 
 def boundary_to_equi_distant(boundary, step_width, offset):
     lengths = boundary_point_lengths(boundary)
-    x = list(map(lambda p: p.x, boundary.point))
-    y = list(map(lambda p: p.y, boundary.point))
     eval_marks = np.arange(offset, lengths[-1], step_width)
-    xinterp = np.interp(eval_marks, lengths, x)
-    yinterp = np.interp(eval_marks, lengths, y)
-    return map(lambda i: (i[0],i[1]), zip(xinterp, yinterp))
+    xinterp = np.interp(eval_marks, lengths, boundary.points[:, 0])
+    yinterp = np.interp(eval_marks, lengths, boundary.points[:, 1])
+    return zip(xinterp.tolist(), yinterp.tolist())
 
 def draw_obstacle(ctx, obstacle):
     if obstacle.type == "blockedArea":
@@ -259,68 +283,364 @@ def draw_obstacle(ctx, obstacle):
     #else:
     #    draw_shape(ctx, obstacle.shape)
 
-def draw_all_boundaries(ctx, lanelet_list, boundary_name):
-    all_ids = [lanelet.id for lanelet in lanelet_list
-        if getattr(lanelet, boundary_name).lineMarking is not None]
-    while len(all_ids) > 0:
-        current_id = all_ids[0]
-        suc = expand_boundary(lanelet_list, get_lanelet_by_id(lanelet_list, current_id), boundary_name, "successor")
-        pred = expand_boundary(lanelet_list, get_lanelet_by_id(lanelet_list, current_id), boundary_name, "predecessor")
-        ids_in_run = pred[::-1] + [current_id] + suc
-
-        for id in ids_in_run:
-            all_ids.remove(id)
-
-        lanelets = list(map(lambda x: get_lanelet_by_id(lanelet_list, x), ids_in_run))
-
-        ctx.save()
-        ctx.set_line_width (0.02)
-        line_marking = getattr(lanelets[0], boundary_name).lineMarking
-        if line_marking == "dashed":
-            ctx.set_dash([0.2, 0.2])
-        elif line_marking == "solid" :
-            ctx.set_dash([])
-
-        ctx.move_to(getattr(lanelets[0], boundary_name).point[0].x,
-            getattr(lanelets[0], boundary_name).point[0].y)
+def boundary_runs(scene):
+    """Merges the left and right boundaries of lanelets following each
+    other with the same line marking into BoundaryRuns, once per scene."""
+    runs = []
+    for boundary_name in ["leftBoundary", "rightBoundary"]:
+        remaining = set(lanelet.id for lanelet in scene.lanelets
+            if getattr(lanelet, boundary_name).lineMarking is not None)
+        for lanelet in scene.lanelets:
+            if lanelet.id not in remaining:
+                continue
+            lanelets = boundary_run(scene, lanelet, boundary_name)
+            remaining.difference_update(l.id for l in lanelets)
+            runs.append(BoundaryRun(
+                np.concatenate([getattr(l, boundary_name).points for l in lanelets]),
+                getattr(lanelets[0], boundary_name).lineMarking))
+    return runs
+
+def draw_boundary_run(ctx, run):
+    ctx.save()
+    ctx.set_line_width (0.02)
+    if run.line_marking == "dashed":
+        ctx.set_dash([0.2, 0.2])
+    elif run.line_marking == "solid" :
+        ctx.set_dash([])
 
-        for lanelet in lanelets:
-            for p in getattr(lanelet, boundary_name).point:
-                ctx.line_to(p.x, p.y)
-        ctx.stroke()
-        ctx.restore()
+    points = run.points.tolist()
+    ctx.move_to(*points[0])
+    for (x, y) in points:
+        ctx.line_to(x, y)
+    ctx.stroke()
+    ctx.restore()
 
-def get_lanelet_by_id(lanelet_list, id):
-    for lanelet in lanelet_list:
-        if lanelet.id == id:
-            return lanelet
-    return None
+def boundary_run(scene, lanelet, boundary_name):
+    """Lanelets before and after `lanelet` with the same line marking on
+    the boundary, in driving order."""
+    seen = set([lanelet.id])
+    pred = expand_boundary(scene.predecessors, lanelet, boundary_name, seen)
+    suc = expand_boundary(scene.successors, lanelet, boundary_name, seen)
+    return pred[::-1] + [lanelet] + suc
 
-def expand_boundary(lanelet_list, lanelet, boundary_name, direction):
-    ids = []
+def expand_boundary(neighbours, lanelet, boundary_name, seen):
+    lanelets = []
     original_line_type = getattr(lanelet, boundary_name).lineMarking
     found = True
     while found:
         found = False
-        if getattr(lanelet, direction) is not None:
-            for next in getattr(lanelet, direction).lanelet:
-                next_lanelet = get_lanelet_by_id(lanelet_list, next.ref)
-                if getattr(next_lanelet, boundary_name).lineMarking == original_line_type:
-                    lanelet = next_lanelet
-                    ids.append(lanelet.id)
-                    found = True
+        for next_lanelet in neighbours[lanelet.id]:
+            if getattr(next_lanelet, boundary_name).lineMarking == original_line_type:
+                # closed loops end where they started
+                if next_lanelet.id in seen:
                     break
-    return ids
-
-def draw(doc, target_dir):
-    bounding_box = utils.get_bounding_box(doc)
-    bounding_box.x_min -= PADDING
-    bounding_box.y_min -= PADDING
-    bounding_box.x_max += PADDING
-    bounding_box.y_max += PADDING
-
-    width = math.ceil((bounding_box.x_max - bounding_box.x_min) * PIXEL_PER_UNIT)
-    height = math.ceil((bounding_box.y_max - bounding_box.y_min) * PIXEL_PER_UNIT)
+                seen.add(next_lanelet.id)
+                lanelet = next_lanelet
+                lanelets.append(lanelet)
+                found = True
+                break
+    return lanelets
+
+def scene_drawables(scene, runs):
+    """Everything drawn on the ground plane, in drawing order, as an (n, 4)
+    array of x_min, y_min, x_max, y_max extents and a list of
+    (function, argument) calls, each drawing with function(ctx, argument)."""
+    boxes = []
+    calls = []
+    def add(points, margin, function, argument):
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        boxes.append(np.concatenate((points.min(axis=0) - margin,
+            points.max(axis=0) + margin)))
+        calls.append((function, argument))
+
+    for (lanelet, box) in zip(scene.lanelets, scene.lanelet_boxes):
+        if lanelet.stopLine:
+            add([lanelet.leftBoundary.points[-1], lanelet.rightBoundary.points[-1]],
+                LINE_MARGIN, draw_stop_line, lanelet)
+        if lanelet.type == "zebraCrossing":
+            add(box, LINE_MARGIN, draw_zebra_crossing, lanelet)
+    for run in runs:
+        add(run.points, LINE_MARGIN, draw_boundary_run, run)
+    for obstacle in scene.doc.obstacle:
+        if obstacle.type == "blockedArea":
+            for rect in obstacle.shape.rectangle:
+                radius = math.hypot(rect.length / 2, rect.width / 2)
+                add(rect.centerPoint, radius + LINE_MARGIN, draw_stripes_rect, rect)
+    for island_junction in scene.doc.islandJunction:
+        if len(island_junction.points) > 0:
+            add(island_junction.points, LINE_MARGIN, draw_island_junction, island_junction)
+    for road_marking in scene.doc.roadMarking:
+        add(road_marking.centerPoint, ROAD_MARKING_RADIUS, draw_road_marking, road_marking)
+    return (np.array(boxes).reshape(-1, 4), calls)
+
+def road_tiles(scene, boxes, calls, bounding_box, width_num, height_num,
+        tile_extent=TILE_SIZE / PIXEL_PER_UNIT):
+    """The tiles (x, y) with anything drawn on them: lanelets with their
+    boundaries and all other drawables. Long boundary runs only count
+    where their lanelets are, so a diagonal road does not fill its whole
+    bounding box."""
+    lanelet_boxes = scene.lanelet_boxes[~np.isnan(scene.lanelet_boxes).any(axis=1)]
+    footprints = np.concatenate((
+        lanelet_boxes + [-LINE_MARGIN, -LINE_MARGIN, LINE_MARGIN, LINE_MARGIN],
+        boxes[[function is not draw_boundary_run for (function, _) in calls]]
+            .reshape(-1, 4)))
+    return set((x, y) for (x_first, y_first, x_last, y_last)
+        in tile_ranges(footprints, bounding_box, width_num, height_num, tile_extent)
+        for x in range(x_first, x_last + 1) for y in range(y_first, y_last + 1))
+
+def tile_ranges(boxes, bounding_box, width_num, height_num,
+        tile_extent=TILE_SIZE / PIXEL_PER_UNIT):
+    """First and last tile x, y overlapped by each box, clipped to the
+    grid of tiles `tile_extent` wide."""
+    origin = np.array([bounding_box.x_min, bounding_box.y_min] * 2)
+    tiles = np.floor((boxes - origin) / tile_extent).astype(int)
+    return np.clip(tiles, 0, [width_num - 1, height_num - 1] * 2).tolist()
+
+def tile_buckets(boxes, bounding_box, width_num, height_num,
+        tile_extent=TILE_SIZE / PIXEL_PER_UNIT):
+    """Indices of the drawables overlapping each tile (x, y), in drawing
+    order."""
+    buckets = defaultdict(list)
+    for (i, (x_first, y_first, x_last, y_last)) in enumerate(
+            tile_ranges(boxes, bounding_box, width_num, height_num, tile_extent)):
+        for x in range(x_first, x_last + 1):
+            for y in range(y_first, y_last + 1):
+                buckets[(x, y)].append(i)
+    return buckets
+
+# what a tile renderer needs to know of the scene, see prepare_tiles
+PreparedTiles = namedtuple('PreparedTiles',
+    ['bounding_box', 'calls', 'buckets', 'target_dir', 'cache', 'png_level',
+     'pixel_per_unit', 'factors'])
+
+_prepared = None
+_recording = None
+# one tile surface per process, reused for every tile
+_surface = None
+_writer = None
+_barrier = None
+
+class TileTimes:
+    """Raster and PNG encode times of the tiles rendered by draw, for
+    reporting."""
+
+    def __init__(self):
+        self.raster = []
+        self.encode = []
+
+    def statistics(self):
+        tiles = len(self.raster)
+        return "per tile: raster {0:.0f} ms, PNG encode {1:.0f} ms".format(
+            1000 * sum(self.raster) / tiles if tiles else 0,
+            1000 * sum(self.encode) / tiles if tiles else 0)
+
+class TileWriter:
+    """Encodes and writes tiles on WRITER_THREADS background threads while
+    the next tile is drawn. At most twice as many tiles wait, so drawing
+    blocks when encoding falls behind."""
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(WRITER_THREADS)
+        self.slots = threading.BoundedSemaphore(2 * WRITER_THREADS)
+        self.pending = []
+
+    def submit(self, function, *args):
+        self.slots.acquire()
+        future = self.executor.submit(function, *args)
+        future.add_done_callback(lambda _: self.slots.release())
+        self.pending.append(future)
+
+    def finish(self):
+        """Waits for all submitted tiles and stops the threads, returns
+        the encode times, raises the first write error."""
+        self.executor.shutdown()
+        return [future.result() for future in self.pending]
+
+def _write_atomic(file_path, content):
+    # identical tiles of other workers may write the same file
+    temporary_path = "{0}.{1}.{2}.tmp".format(file_path, os.getpid(), threading.get_ident())
+    with open(temporary_path, "wb") as file:
+        file.write(content)
+    os.replace(temporary_path, file_path)
+
+def write_tile(hash, pixels, png_data, key):
+    """Writes the texture and material of a tile, encoding `pixels` to PNG
+    unless `png_data` (from the tile cache) is given. Returns the encode
+    time."""
+    encode_time = 0
+    if png_data is None:
+        start = time.perf_counter()
+        png_data = png.encode_gray(pixels, _prepared.png_level)
+        encode_time = time.perf_counter() - start
+        if _prepared.cache is not None:
+            _prepared.cache.put(key, hash, png_data)
+    texture_file = "tile-{0}.png".format(hash)
+    _write_atomic(path.join(_prepared.target_dir, "materials", "textures", texture_file),
+        png_data)
+    _write_atomic(path.join(_prepared.target_dir, "materials", "scripts",
+        "tile-{0}.material".format(hash)),
+        ground_plane_material("Tile/" + hash, texture_file).encode())
+    return encode_time
+
+def prepare_tiles(prepared, barrier=None):
+    """Sets the PreparedTiles of this process for render_tile, also used as
+    worker process initializer."""
+    global _prepared, _recording, _writer, _barrier
+    _prepared = prepared
+    _recording = None
+    _writer = TileWriter()
+    _barrier = barrier
+
+def finish_tiles(_=None):
+    """Waits for the tiles of this process to be written, returns their
+    encode times. Workers first wait for each other at the barrier, so
+    that each of them runs this once."""
+    if _barrier is not None:
+        _barrier.wait()
+    return _writer.finish()
+
+def record_scene(prepared):
+    """Everything on the ground plane drawn once, in pixels from the lower
+    left corner of the bounding box, for the tiles to replay."""
+    # cairo records paths in 24.8 fixed point device coordinates, in metres
+    # they would snap to a 1/256 m grid. In pixels a tile only shifts them
+    # by whole pixels and flips them, which is exact.
+    bounding_box = prepared.bounding_box
+    pixel_per_unit = prepared.pixel_per_unit
+    surface = cairo.RecordingSurface(cairo.CONTENT_COLOR_ALPHA, cairo.Rectangle(0, 0,
+        math.ceil((bounding_box.x_max - bounding_box.x_min) * pixel_per_unit),
+        math.ceil((bounding_box.y_max - bounding_box.y_min) * pixel_per_unit)))
+    ctx = cairo.Context(surface)
+    ctx.scale(pixel_per_unit, pixel_per_unit)
+    ctx.translate(-bounding_box.x_min, -bounding_box.y_min)
+    ctx.set_source_rgb(1, 1, 1)
+    for (function, argument) in prepared.calls:
+        function(ctx, argument)
+    return surface
+
+def downsample(pixels):
+    """Half the resolution, each pixel the mean of 2x2."""
+    # strided adds, about 10x faster than summing a reshaped array
+    total = pixels[0::2, 0::2].astype(np.uint16)
+    total += pixels[1::2, 0::2]
+    total += pixels[0::2, 1::2]
+    total += pixels[1::2, 1::2]
+    total += 2
+    total >>= 2
+    return total.astype(np.uint8)
+
+def level_key(key, factor):
+    # tile cache entry of a pyramid level
+    return key if factor == 1 else "{0}-{1}".format(key, factor)
+
+def render_tile(tile):
+    """Renders tile (x, y) at the highest resolution and downsamples it to
+    the other levels, or takes them from the tile cache, and queues them
+    for writing to materials/ in the target directory. Returns the hash of
+    the pixels per level, whether it was a cache hit and the raster
+    time."""
+    global _recording, _surface
+    (x, y) = tile
+    bounding_box = _prepared.bounding_box
+    pixel_per_unit = _prepared.pixel_per_unit
+    tile_extent = TILE_SIZE / pixel_per_unit
+
+    key = None
+    cached = None
+    if _prepared.cache is not None:
+        calls = [_prepared.calls[i] for i in _prepared.buckets.get((x, y), [])]
+        key = tilecache.tile_key(
+            (bounding_box.x_min + x * tile_extent, bounding_box.y_min + y * tile_extent),
+            TILE_SIZE, pixel_per_unit, calls)
+        cached = [_prepared.cache.get(level_key(key, factor))
+            for factor in _prepared.factors]
+        # a hit needs all levels
+        if None in cached:
+            cached = None
+
+    if cached is not None:
+        for ((hash, png_data), factor) in zip(cached, _prepared.factors):
+            _writer.submit(write_tile, hash, None, png_data, level_key(key, factor))
+        return ([hash for (hash, _) in cached], True, 0)
+
+    start = time.perf_counter()
+    # recorded on the first tile this process renders
+    if _recording is None:
+        _recording = record_scene(_prepared)
+    # 8 bit alpha only, written as grayscale PNG: white where drawn
+    if _surface is None:
+        _surface = cairo.ImageSurface(cairo.FORMAT_A8, TILE_SIZE, TILE_SIZE)
+    surface = _surface
+    ctx = cairo.Context(surface)
+
+    # clear to black
+    ctx.set_operator(cairo.OPERATOR_CLEAR)
+    ctx.paint()
+    ctx.set_operator(cairo.OPERATOR_OVER)
+
+    # Inverse y-axis
+    ctx.translate(0, TILE_SIZE / 2)
+    ctx.scale(1, -1)
+    ctx.translate(0, -TILE_SIZE / 2)
+
+    ctx.translate(- x * TILE_SIZE, - y * TILE_SIZE)
+
+    # replayed as vectors, cairo skips what is outside the tile
+    ctx.set_source_surface(_recording)
+    ctx.paint()
+    surface.flush()
+
+    # copied, the surface is drawn on again while the writer encodes
+    pixels = np.frombuffer(surface.get_data(), dtype=np.uint8).reshape(
+        TILE_SIZE, surface.get_stride())[:, :TILE_SIZE].copy()
+    by_factor = {1: pixels}
+    for factor in range(1, int(math.log2(max(_prepared.factors))) + 1):
+        by_factor[2 ** factor] = downsample(by_factor[2 ** (factor - 1)])
+    levels = [by_factor[factor] for factor in _prepared.factors]
+    hashes = [hashlib.sha256(level).hexdigest() for level in levels]
+    raster_time = time.perf_counter() - start
+
+    for (hash, level, factor) in zip(hashes, levels, _prepared.factors):
+        _writer.submit(write_tile, hash, level, None,
+            level_key(key, factor) if key is not None else None)
+    return (hashes, False, raster_time)
+
+def pyramid(resolutions):
+    """The highest of `resolutions` (pixels per unit) and how much each
+    one is downsampled from it, powers of two."""
+    pixel_per_unit = max(resolutions)
+    factors = []
+    for resolution in resolutions:
+        factor = pixel_per_unit / resolution
+        if factor != 2 ** round(math.log2(factor)) or TILE_SIZE % factor != 0:
+            raise ValueError("resolution {0} is not {1} divided by a power of two"
+                .format(resolution, pixel_per_unit))
+        factors.append(int(factor))
+    return (pixel_per_unit, factors)
+
+def draw(scene, target_dir, jobs=1, cache=None, png_level=PNG_LEVEL,
+        resolutions=(PIXEL_PER_UNIT,), times=None):
+    """Renders the ground plane tiles of a scene, with `jobs` worker
+    processes if more than one and reusing tiles of the
+    `tilecache.TileCache` `cache` if given. Textures are written as PNG
+    with zlib compression `png_level` (0-9). The times of the rendered
+    tiles are added to the TileTimes `times` if given.
+
+    All `resolutions` (pixels per unit) are made in one pass, by rendering
+    the highest one and downsampling it, so they must be the highest one
+    divided by powers of two. Returns the SDF of the tile models for each
+    resolution, which depends on none of the other arguments."""
+    # scene is a commonroad.renderer.scene.SceneIndex
+    (pixel_per_unit, factors) = pyramid(resolutions)
+    tile_extent = TILE_SIZE / pixel_per_unit
+    bounding_box = utils.BoundingBox(
+        scene.bounding_box.x_min - PADDING,
+        scene.bounding_box.y_min - PADDING,
+        scene.bounding_box.x_max + PADDING,
+        scene.bounding_box.y_max + PADDING)
+
+    width = math.ceil((bounding_box.x_max - bounding_box.x_min) * pixel_per_unit)
+    height = math.ceil((bounding_box.y_max - bounding_box.y_min) * pixel_per_unit)
 
     width_num = math.ceil(width / TILE_SIZE)
     height_num = math.ceil(height / TILE_SIZE)
@@ -328,66 +648,51 @@ def draw(doc, target_dir):
     os.makedirs(path.join(target_dir, "materials", "textures"), exist_ok=True)
     os.makedirs(path.join(target_dir, "materials", "scripts"), exist_ok=True)
 
-    models = ""
-
-    for (x, y) in tqdm([(x,y) for x in range(width_num) for y in range(height_num)]):
-        surface = cairo.ImageSurface(cairo.FORMAT_RGB24, TILE_SIZE, TILE_SIZE)
-        ctx = cairo.Context(surface)
-
-        # fill black
-        ctx.set_source_rgb(0, 0, 0)
-        ctx.rectangle(0, 0, TILE_SIZE, TILE_SIZE)
-        ctx.fill()
-
-        # Inverse y-axis
-        ctx.translate(0, TILE_SIZE / 2)
-        ctx.scale(1, -1)
-        ctx.translate(0, -TILE_SIZE / 2)
-
-        ctx.scale(PIXEL_PER_UNIT, PIXEL_PER_UNIT)
-        ctx.translate(-bounding_box.x_min, -bounding_box.y_min)
-        ctx.translate(- x * TILE_SIZE / PIXEL_PER_UNIT, - y * TILE_SIZE / PIXEL_PER_UNIT)
-
-        ctx.set_source_rgb(1, 1, 1)
-        for lanelet in doc.lanelet:
-            draw_stop_line(ctx, lanelet)
-            if lanelet.type == "zebraCrossing":
-                draw_zebra_crossing(ctx, lanelet)
-            #draw_boundary(ctx, lanelet.leftBoundary)
-            #draw_boundary(ctx, lanelet.rightBoundary)
-
-        draw_all_boundaries(ctx, doc.lanelet, "leftBoundary")
-        draw_all_boundaries(ctx, doc.lanelet, "rightBoundary")
-
-        for obstacle in doc.obstacle:
-            draw_obstacle(ctx, obstacle)
-
-        for island_junction in doc.islandJunction:
-            draw_island_junction(ctx, island_junction)
-
-        for road_marking in doc.roadMarking:
-            draw_road_marking(ctx, road_marking)
-
-        sha_256 = hashlib.sha256()
-        sha_256.update(surface.get_data())
-        hash = sha_256.hexdigest()
-
-        texture_file = "tile-{0}.png".format(hash)
-        material_file = "tile-{0}.material".format(hash)
-        surface.write_to_png(
-            path.join(target_dir, "materials", "textures", texture_file))
-
-        with open(path.join(target_dir, "materials", "scripts", material_file), "w") as file:
-            file.write(ground_plane_material("Tile/" + hash, texture_file))
-
-        models += ground_plane_model(
-            bounding_box.x_min + (x + 0.5) * TILE_SIZE / PIXEL_PER_UNIT,
-            bounding_box.y_min + (y + 0.5) * TILE_SIZE / PIXEL_PER_UNIT,
-            TILE_SIZE / PIXEL_PER_UNIT,
-            "Tile/{0}-{1}".format(x, y),
-            "Tile/" + hash)
-
-    return models
+    (boxes, calls) = scene_drawables(scene, boundary_runs(scene))
+    prepared = PreparedTiles(bounding_box, calls,
+        dict(tile_buckets(boxes, bounding_box, width_num, height_num, tile_extent)),
+        target_dir, cache, png_level, pixel_per_unit, factors)
+    # tiles without roads stay black and are covered by one background plane
+    road = road_tiles(scene, boxes, calls, bounding_box, width_num, height_num,
+        tile_extent)
+    tiles = [(x,y) for x in range(width_num) for y in range(height_num)
+        if (x, y) in road]
+
+    if jobs > 1:
+        # each worker renders one tile at a time and only returns its hashes
+        barrier = multiprocessing.Barrier(jobs)
+        with Pool(jobs, initializer=prepare_tiles, initargs=(prepared, barrier)) as pool:
+            results = list(tqdm(pool.imap(render_tile, tiles), total=len(tiles)))
+            encode_times = sum(pool.map(finish_tiles, range(jobs), chunksize=1), [])
+    else:
+        prepare_tiles(prepared)
+        results = [render_tile(tile) for tile in tqdm(tiles)]
+        encode_times = finish_tiles()
+    if cache is not None:
+        # statistics are counted here, workers only have copies of the cache
+        for (_, hit, _) in results:
+            cache.count(hit)
+        cache.evict()
+    if times is not None:
+        times.raster += [raster_time for (_, hit, raster_time) in results if not hit]
+        times.encode += encode_times
+
+    all_models = []
+    for level in range(len(factors)):
+        models = background_plane_model(
+            bounding_box.x_min + width_num * tile_extent / 2,
+            bounding_box.y_min + height_num * tile_extent / 2,
+            width_num * tile_extent, height_num * tile_extent)
+        for ((x, y), (hashes, _, _)) in zip(tiles, results):
+            models += ground_plane_model(
+                bounding_box.x_min + (x + 0.5) * tile_extent,
+                bounding_box.y_min + (y + 0.5) * tile_extent,
+                tile_extent,
+                "Tile/{0}-{1}".format(x, y),
+                "Tile/" + hashes[level])
+        all_models.append(models)
+
+    return all_models
 
 def ground_plane_material(name, file):
     return """
@@ -409,6 +714,18 @@ def ground_plane_material(name, file):
     """.format(name=name, file=file)
 
 def ground_plane_model(x, y, tile_size, name, material):
+    return plane_model(x, y, 0, tile_size, tile_size, name, """
+              <uri>file://materials/scripts</uri>
+              <uri>file://materials/textures</uri>
+              <name>{material}</name>""".format(material=material))
+
+def background_plane_model(x, y, width, height):
+    # below the tiles, so they are drawn on top of it
+    return plane_model(x, y, -0.001, width, height, "Background", """
+              <uri>file://media/materials/scripts/gazebo.material</uri>
+              <name>Gazebo/Black</name>""")
+
+def plane_model(x, y, z, width, height, name, script):
     return """
     <model name='{name}'>
       <static>1</static>
@@ -417,7 +734,7 @@ def ground_plane_model(x, y, tile_size, name, material):
           <geometry>
             <plane>
               <normal>0 0 1</normal>
-              <size>{tile_size} {tile_size}</size>
+              <size>{width} {height}</size>
             </plane>
           </geometry>
           <surface>
@@ -442,14 +759,11 @@ def ground_plane_model(x, y, tile_size, name, material):
           <geometry>
             <plane>
               <normal>0 0 1</normal>
-              <size>{tile_size} {tile_size}</size>
+              <size>{width} {height}</size>
             </plane>
           </geometry>
           <material>
-            <script>
-              <uri>file://materials/scripts</uri>
-              <uri>file://materials/textures</uri>
-              <name>{material}</name>
+            <script>{script}
             </script>
           </material>
         </visual>
@@ -457,6 +771,6 @@ def ground_plane_model(x, y, tile_size, name, material):
         <enable_wind>0</enable_wind>
         <kinematic>0</kinematic>
       </link>
-      <pose frame=''>{x} {y} 0 0 -0 0</pose>
+      <pose frame=''>{x} {y} {z} 0 -0 0</pose>
     </model>
-    """.format(x=x, y=y, tile_size=tile_size, name=name, material=material)
+    """.format(x=x, y=y, z=z, width=width, height=height, name=name, script=script)
@@ -0,0 +1,409 @@
+"""Road markings as one merged triangle mesh instead of raster textures.
+
+The markings are built as shapely polygons from the same drawables as the
+ground plane tiles (see groundplane.scene_drawables), with the line widths,
+dashes and transforms of the groundplane draw_* functions. They are
+triangulated into a single COLLADA mesh lying just above a black ground
+plane, so the world does not depend on a texture resolution.
+"""
+from commonroad.renderer import groundplane
+from functools import lru_cache
+from os import path
+import math
+import numpy as np
+import os
+import re
+import shapely
+from xml.etree import ElementTree
+
+MESH_FILE = "road-markings.dae"
+# above the ground plane, below nothing else
+HEIGHT = 0.001
+LINE_WIDTH = 0.02
+FONT_FILE = path.join(path.dirname(__file__), "fonts", "DIN 1451 Std Engschrift.otf")
+
+def _buffer(lines, width):
+    # cairo strokes with butt caps and miter joins
+    lines = np.array([shapely.LineString(points) for points in lines], dtype=object)
+    return shapely.buffer(lines, width / 2, cap_style="flat", join_style="mitre")
+
+def _rotate(points, angle):
+    (cos, sin) = (math.cos(angle), math.sin(angle))
+    return points @ np.array([[cos, sin], [-sin, cos]])
+
+def _place(geometries, center, angle, scale=1):
+    """Geometries in a frame rotated by `angle` around `center`, like
+    ctx.translate(*center); ctx.rotate(angle); ctx.scale(scale, scale)."""
+    return shapely.transform(geometries,
+        lambda points: _rotate(points * scale, angle) + center)
+
+def dashes(points, on, off):
+    """Pieces of the polyline `points` drawn with dash pattern [on, off]."""
+    lengths = np.concatenate(([0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1))))
+    pieces = []
+    for start in np.arange(0, lengths[-1], on + off).tolist():
+        end = min(start + on, lengths[-1])
+        inner = (lengths > start) & (lengths < end)
+        marks = np.concatenate(([start], lengths[inner], [end]))
+        pieces.append(np.column_stack((np.interp(marks, lengths, points[:, 0]),
+            np.interp(marks, lengths, points[:, 1]))))
+    return pieces
+
+def _lines(pieces, width, dash=None):
+    if dash is not None:
+        pieces = [piece for points in pieces for piece in dashes(points, *dash)]
+    pieces = [points for points in pieces if len(points) > 1]
+    return list(_buffer(pieces, width)) if pieces else []
+
+def boundary_run_polygons(run):
+    dash = (0.2, 0.2) if run.line_marking == "dashed" else None
+    return _lines([run.points], LINE_WIDTH, dash)
+
+def stop_line_polygons(lanelet):
+    points = np.array([lanelet.leftBoundary.points[-1], lanelet.rightBoundary.points[-1]])
+    width = 0.04
+    dash = None
+    if lanelet.stopLine == "dashed":
+        dash = (0.08, 0.06)
+        if lanelet.stopLineAttributes:
+            width = lanelet.stopLineAttributes.lineWidth
+            dash = (lanelet.stopLineAttributes.segmentLength,
+                lanelet.stopLineAttributes.segmentGap)
+    return _lines([points], width, dash)
+
+def zebra_crossing_polygons(lanelet):
+    left = list(groundplane.boundary_to_equi_distant(lanelet.leftBoundary, 0.04, 0.02))
+    right = list(groundplane.boundary_to_equi_distant(lanelet.rightBoundary, 0.04, 0.02))
+    # stripes from every other pair of points, as filled by draw_zebra_crossing
+    return [shapely.Polygon([left[i], right[i], right[i + 1], left[i + 1]])
+        for i in range(0, min(len(left), len(right)) - 1, 2)]
+
+def stripes_polygons(rectangle):
+    (length, width) = (rectangle.length, rectangle.width)
+    sheering = width / 2
+    outline = np.array([(-length / 2, -width / 2), (length / 2, -width / 2),
+        (length / 2 - sheering, width / 2), (-length / 2 + sheering, width / 2)])
+    area = shapely.Polygon(outline)
+    lines = [np.array([(x, -width / 2), (x + width, width / 2)])
+        for x in np.arange(-length / 2 - width, length / 2, 0.08).tolist()]
+    lines.append(np.concatenate((outline, outline[:1])))
+    # everything clipped to the area, as in draw_stripes_rect
+    clipped = shapely.intersection(_buffer(lines, LINE_WIDTH), area)
+    return list(_place(clipped, rectangle.centerPoint, -rectangle.orientation))
+
+def island_junction_polygons(island):
+    points = island.points
+    return _lines([points[i:i + 2] for i in range(0, len(points) - 1, 2)], LINE_WIDTH)
+
+@lru_cache(maxsize=None)
+def text_polygons(text):
+    """Outline of a speed limit number in the font used by
+    draw_road_marking, y up, baseline at y = 0."""
+    # matplotlib is slow to import and only needed for speed limits
+    from matplotlib.font_manager import FontProperties
+    from matplotlib.textpath import TextPath
+    outline = TextPath((0, 0), text, size=0.4, prop=FontProperties(fname=FONT_FILE))
+    # glyph holes are rings inside others, even-odd gives the filled area
+    result = shapely.Polygon()
+    for ring in outline.to_polygons():
+        if len(ring) > 2:
+            result = shapely.symmetric_difference(result, shapely.make_valid(shapely.Polygon(ring)))
+    (x_min, y_min, x_max, y_max) = outline.get_extents().bounds
+    return (result, x_max - x_min, y_max - y_min)
+
+def road_marking_polygons(marking):
+    visual = groundplane.ROADMARKING_TYPE_TO_VISUAL[marking.type]
+    (center, orientation) = (marking.centerPoint, marking.orientation)
+    polygons = []
+    # crossing lines are sized by '30' for all numbers
+    (_, text_width, text_height) = text_polygons('30')
+    if visual.marker_text:
+        (text, _, _) = text_polygons(visual.marker_text)
+        # mirrored and moved like in draw_road_marking
+        text = shapely.transform(text, lambda points: points - [0.145, 0.29])
+        polygons.append(_place(text, center, orientation))
+    if visual.crossed:
+        (cos, sin) = (math.cos(orientation), math.sin(orientation))
+        start = center + 0.145 * np.array([cos, sin])
+        polygons += _lines([
+            np.array([start, start + [- text_height * cos + text_width * sin,
+                - text_height * sin - text_width * cos]]),
+            np.array([center + (0.145 - text_height) * np.array([cos, sin]),
+                start + [text_width * sin, - text_width * cos]])], 0.05)
+    if visual.marker_image:
+        polygons.append(_place(svg_polygons(visual.marker_image.value),
+            center, orientation, 0.001))
+    return polygons
+
+POLYGONS = {
+    groundplane.draw_boundary_run: boundary_run_polygons,
+    groundplane.draw_stop_line: stop_line_polygons,
+    groundplane.draw_zebra_crossing: zebra_crossing_polygons,
+    groundplane.draw_stripes_rect: stripes_polygons,
+    groundplane.draw_island_junction: island_junction_polygons,
+    groundplane.draw_road_marking: road_marking_polygons,
+}
+
+def _svg_transform(transform):
+    """3x3 matrix of an SVG transform attribute with rotate and translate."""
+    matrix = np.eye(3)
+    for (name, arguments) in re.findall(r"(\w+)\s*\(([^)]*)\)", transform or ""):
+        values = [float(v) for v in re.split(r"[\s,]+", arguments.strip())]
+        if name == "translate":
+            step = np.eye(3)
+            step[:2, 2] = (values + [0])[:2]
+        elif name == "rotate":
+            angle = math.radians(values[0])
+            (cx, cy) = values[1:3] if len(values) == 3 else (0, 0)
+            (cos, sin) = (math.cos(angle), math.sin(angle))
+            step = np.array([[cos, -sin, cx - cos * cx + sin * cy],
+                [sin, cos, cy - sin * cx - cos * cy], [0, 0, 1]])
+        else:
+            raise ValueError("unsupported SVG transform " + name)
+        matrix = matrix @ step
+    return matrix
+
+def _svg_arc(start, rx, ry, phi, large, sweep, end, steps=16):
+    """Points of an SVG elliptical arc after `start`, see the SVG spec
+    "conversion from endpoint to center parameterization"."""
+    if rx == 0 or ry == 0:
+        return [end]
+    (rx, ry, phi) = (abs(rx), abs(ry), math.radians(phi))
+    (cos, sin) = (math.cos(phi), math.sin(phi))
+    (dx, dy) = ((start[0] - end[0]) / 2, (start[1] - end[1]) / 2)
+    (x1, y1) = (cos * dx + sin * dy, -sin * dx + cos * dy)
+    scale = x1 ** 2 / rx ** 2 + y1 ** 2 / ry ** 2
+    if scale > 1:
+        (rx, ry) = (rx * math.sqrt(scale), ry * math.sqrt(scale))
+    numerator = rx ** 2 * ry ** 2 - rx ** 2 * y1 ** 2 - ry ** 2 * x1 ** 2
+    factor = math.sqrt(max(0, numerator / (rx ** 2 * y1 ** 2 + ry ** 2 * x1 ** 2)))
+    if large == sweep:
+        factor = -factor
+    (cx1, cy1) = (factor * rx * y1 / ry, -factor * ry * x1 / rx)
+    center = (cos * cx1 - sin * cy1 + (start[0] + end[0]) / 2,
+        sin * cx1 + cos * cy1 + (start[1] + end[1]) / 2)
+    theta = math.atan2((y1 - cy1) / ry, (x1 - cx1) / rx)
+    delta = math.atan2((-y1 - cy1) / ry, (-x1 - cx1) / rx) - theta
+    if sweep and delta < 0:
+        delta += 2 * math.pi
+    elif not sweep and delta > 0:
+        delta -= 2 * math.pi
+    points = []
+    for t in np.linspace(theta, theta + delta, steps + 1)[1:].tolist():
+        (x, y) = (rx * math.cos(t), ry * math.sin(t))
+        points.append((center[0] + cos * x - sin * y, center[1] + sin * x + cos * y))
+    points[-1] = end
+    return points
+
+def _svg_path(d):
+    """Rings of an SVG path with lines and elliptical arcs."""
+    tokens = re.findall(r"[A-Za-z]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?", d)
+    rings = []
+    ring = []
+    position = (0.0, 0.0)
+    command = None
+    i = 0
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            command = tokens[i]
+            i += 1
+            if command in "zZ":
+                if ring:
+                    rings.append(ring)
+                    position = ring[0]
+                ring = []
+                continue
+        relative = command.islower()
+        (x0, y0) = position if relative else (0, 0)
+        upper = command.upper()
+        if upper in "ML":
+            position = (x0 + float(tokens[i]), y0 + float(tokens[i + 1]))
+            i += 2
+            if upper == "M":
+                if ring:
+                    rings.append(ring)
+                ring = [position]
+                # further pairs are lines
+                command = "l" if relative else "L"
+            else:
+                ring.append(position)
+        elif upper == "H":
+            position = ((position[0] if relative else 0) + float(tokens[i]), position[1])
+            i += 1
+            ring.append(position)
+        elif upper == "V":
+            position = (position[0], (position[1] if relative else 0) + float(tokens[i]))
+            i += 1
+            ring.append(position)
+        elif upper == "A":
+            (rx, ry, phi, large, sweep, x, y) = [float(t) for t in tokens[i:i + 7]]
+            i += 7
+            end = (x0 + x, y0 + y)
+            ring += _svg_arc(position, rx, ry, phi, large != 0, sweep != 0, end)
+            position = end
+        else:
+            raise ValueError("unsupported SVG path command " + command)
+    if ring:
+        rings.append(ring)
+    return rings
+
+@lru_cache(maxsize=None)
+def svg_polygons(file):
+    """Filled paths of a marking SVG in the coordinates Rsvg draws it in:
+    viewBox mapped to (0, 0, width, height)."""
+    root = ElementTree.parse(file).getroot()
+    (vx, vy, vw, vh) = [float(v) for v in root.get("viewBox").split()]
+    scale = min(float(root.get("width")) / vw, float(root.get("height")) / vh)
+    viewport = np.array([[scale, 0, -vx * scale], [0, scale, -vy * scale], [0, 0, 1]])
+    polygons = []
+    def visit(element, matrix):
+        matrix = matrix @ _svg_transform(element.get("transform"))
+        if element.tag.endswith("}path") or element.tag == "path":
+            for ring in _svg_path(element.get("d")):
+                points = np.column_stack((ring, np.ones(len(ring)))) @ matrix.T
+                if len(points) > 2:
+                    polygons.append(shapely.make_valid(shapely.Polygon(points[:, :2])))
+        for child in element:
+            visit(child, matrix)
+    visit(root, viewport)
+    return shapely.union_all(polygons)
+
+def scene_polygons(scene):
+    """The markings of a scene as shapely geometries, in drawing order."""
+    (_, calls) = groundplane.scene_drawables(scene, groundplane.boundary_runs(scene))
+    return [polygon for (function, argument) in calls
+        for polygon in POLYGONS[function](argument)]
+
+def triangles(geometries):
+    """(n, 3, 2) counterclockwise triangles covering the geometries."""
+    # shared boundaries are drawn for the lanelets on both sides: exact
+    # copies are dropped before the union, which merges the rest to one
+    # polygon. Clipping and make_valid may leave lines and points.
+    geometries = shapely.normalize(np.array(geometries, dtype=object))
+    (_, first) = np.unique(shapely.to_wkb(geometries), return_index=True)
+    polygons = shapely.get_parts(shapely.union_all(geometries[np.sort(first)]))
+    polygons = polygons[shapely.get_type_id(polygons) == 3]
+    parts = shapely.get_parts(shapely.constrained_delaunay_triangles(polygons))
+    if len(parts) == 0:
+        return np.empty((0, 3, 2))
+    corners = shapely.get_coordinates(shapely.get_exterior_ring(parts)).reshape(-1, 4, 2)[:, :3]
+    edges = corners[:, 1:] - corners[:, :1]
+    clockwise = edges[:, 0, 0] * edges[:, 1, 1] - edges[:, 0, 1] * edges[:, 1, 0] < 0
+    corners[clockwise] = corners[clockwise][:, ::-1]
+    return corners
+
+def _floats(values):
+    return " ".join("{0:.5f}".format(v) for v in values.ravel().tolist())
+
+def collada(triangles, height=HEIGHT):
+    """COLLADA document of white, upward facing triangles at `height`."""
+    (vertices, indices) = np.unique(np.round(triangles.reshape(-1, 2), 6),
+        axis=0, return_inverse=True)
+    vertices = np.column_stack((vertices, np.full(len(vertices), height)))
+    # each corner: vertex index, normal index 0
+    corners = np.column_stack((indices.ravel(), np.zeros(indices.size, dtype=int)))
+    return """<?xml version="1.0" encoding="utf-8"?>
+<COLLADA xmlns="http://www.collada.org/2005/11/COLLADASchema" version="1.4.1">
+  <asset>
+    <unit meter="1.0" name="meter"/>
+    <up_axis>Z_UP</up_axis>
+  </asset>
+  <library_effects>
+    <effect id="marking-effect">
+      <profile_COMMON>
+        <technique sid="common">
+          <lambert>
+            <ambient><color>1 1 1 1</color></ambient>
+            <diffuse><color>1 1 1 1</color></diffuse>
+          </lambert>
+        </technique>
+      </profile_COMMON>
+    </effect>
+  </library_effects>
+  <library_materials>
+    <material id="marking-material">
+      <instance_effect url="#marking-effect"/>
+    </material>
+  </library_materials>
+  <library_geometries>
+    <geometry id="markings">
+      <mesh>
+        <source id="positions">
+          <float_array id="positions-array" count="{position_count}">{positions}</float_array>
+          <technique_common>
+            <accessor source="#positions-array" count="{vertex_count}" stride="3">
+              <param name="X" type="float"/>
+              <param name="Y" type="float"/>
+              <param name="Z" type="float"/>
+            </accessor>
+          </technique_common>
+        </source>
+        <source id="normals">
+          <float_array id="normals-array" count="3">0 0 1</float_array>
+          <technique_common>
+            <accessor source="#normals-array" count="1" stride="3">
+              <param name="X" type="float"/>
+              <param name="Y" type="float"/>
+              <param name="Z" type="float"/>
+            </accessor>
+          </technique_common>
+        </source>
+        <vertices id="vertices">
+          <input semantic="POSITION" source="#positions"/>
+        </vertices>
+        <triangles material="marking" count="{triangle_count}">
+          <input semantic="VERTEX" source="#vertices" offset="0"/>
+          <input semantic="NORMAL" source="#normals" offset="1"/>
+          <p>{corners}</p>
+        </triangles>
+      </mesh>
+    </geometry>
+  </library_geometries>
+  <library_visual_scenes>
+    <visual_scene id="scene">
+      <node id="markings-node">
+        <instance_geometry url="#markings">
+          <bind_material>
+            <technique_common>
+              <instance_material symbol="marking" target="#marking-material"/>
+            </technique_common>
+          </bind_material>
+        </instance_geometry>
+      </node>
+    </visual_scene>
+  </library_visual_scenes>
+  <scene>
+    <instance_visual_scene url="#scene"/>
+  </scene>
+</COLLADA>
+""".format(position_count=vertices.size, positions=_floats(vertices),
+        vertex_count=len(vertices), triangle_count=len(triangles),
+        corners=" ".join(map(str, corners.ravel().tolist())))
+
+def draw(scene, target_dir):
+    """Writes the markings of a scene as meshes/road-markings.dae, returns
+    the SDF of a black ground plane and the markings model."""
+    # scene is a commonroad.renderer.scene.SceneIndex
+    os.makedirs(path.join(target_dir, "meshes"), exist_ok=True)
+    with open(path.join(target_dir, "meshes", MESH_FILE), "w") as file:
+        file.write(collada(triangles(scene_polygons(scene))))
+
+    box = scene.bounding_box
+    padding = groundplane.PADDING
+    return groundplane.background_plane_model(
+        (box.x_min + box.x_max) / 2, (box.y_min + box.y_max) / 2,
+        box.x_max - box.x_min + 2 * padding, box.y_max - box.y_min + 2 * padding) + """
+    <model name='RoadMarkings'>
+      <static>1</static>
+      <link name='link'>
+        <visual name='visual'>
+          <cast_shadows>0</cast_shadows>
+          <geometry>
+            <mesh>
+              <uri>file://meshes/{0}</uri>
+            </mesh>
+          </geometry>
+        </visual>
+      </link>
+    </model>
+    """.format(MESH_FILE)
@@ -3,7 +3,7 @@ def draw(obst):
     i = 0
     for rect in obst.shape.rectangle:
         result += obstacle_model("Obstacle/{0}/{1}".format(obst.id, i),
-            rect.centerPoint.x, rect.centerPoint.y, rect.length,
+            rect.centerPoint[0], rect.centerPoint[1], rect.length,
             rect.width, 0.2, - rect.orientation)
         i += 1
     return result
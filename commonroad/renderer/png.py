@@ -0,0 +1,24 @@
+"""Minimal PNG encoder for 8-bit grayscale ground tiles, with a selectable
+zlib compression level (cairo's write_to_png has none). zlib releases the
+GIL, so tiles can be encoded on threads while the next one is drawn."""
+import numpy as np
+import struct
+import zlib
+
+SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+def _chunk(type, data):
+    return (struct.pack(">I", len(data)) + type + data
+        + struct.pack(">I", zlib.crc32(type + data)))
+
+def encode_gray(pixels, level=6):
+    """PNG of a (height, width) uint8 array at zlib compression `level`
+    (0-9)."""
+    (height, width) = pixels.shape
+    # every row starts with its filter type, 0 (none) compresses the mostly
+    # black tiles as well as the others
+    rows = np.zeros((height, width + 1), dtype=np.uint8)
+    rows[:, 1:] = pixels
+    header = struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)
+    return b"".join([SIGNATURE, _chunk(b"IHDR", header),
+        _chunk(b"IDAT", zlib.compress(rows.tobytes(), level)), _chunk(b"IEND", b"")])
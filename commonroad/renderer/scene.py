@@ -0,0 +1,50 @@
+from commonroad import utils
+from commonroad.route import Route
+from functools import cached_property
+import numpy as np
+
+class SceneIndex:
+    """Lookup structures over a `commonroad.scenario.Scenario`, built once
+    per render and shared by the renderer modules."""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.lanelets = doc.lanelet
+        self.by_id = {lanelet.id: lanelet for lanelet in self.lanelets}
+        self.successors = {lanelet.id: [self.by_id[id] for id in lanelet.successor
+            if id in self.by_id] for lanelet in self.lanelets}
+        self.predecessors = {lanelet.id: [self.by_id[id] for id in lanelet.predecessor
+            if id in self.by_id] for lanelet in self.lanelets}
+
+        # x_min, y_min, x_max, y_max per lanelet, NaN for lanelets without points
+        self.lanelet_boxes = np.full((len(self.lanelets), 4), np.nan)
+        for (i, lanelet) in enumerate(self.lanelets):
+            points = [b.points for b in (lanelet.leftBoundary, lanelet.rightBoundary)
+                if len(b.points) > 0]
+            if points:
+                points = np.concatenate(points)
+                self.lanelet_boxes[i, :2] = points.min(axis=0)
+                self.lanelet_boxes[i, 2:] = points.max(axis=0)
+
+        if np.isnan(self.lanelet_boxes).all():
+            raise ValueError("scenario has no lanelet points")
+        (x_min, y_min) = np.nanmin(self.lanelet_boxes[:, :2], axis=0).tolist()
+        (x_max, y_max) = np.nanmax(self.lanelet_boxes[:, 2:], axis=0).tolist()
+        self.bounding_box = utils.BoundingBox(x_min, y_min, x_max, y_max)
+
+    def lanelet(self, id):
+        return self.by_id.get(id)
+
+    def start_lanelet(self):
+        for lanelet in self.lanelets:
+            if lanelet.isStart:
+                return lanelet
+        return None
+
+    @cached_property
+    def route(self):
+        """The `commonroad.route.Route` from the start lanelet, None if
+        there is none."""
+        if self.start_lanelet() is None:
+            return None
+        return Route(self.doc)
@@ -1,31 +1,48 @@
-from commonroad.renderer import groundplane, obstacle, traffic_sign, ego_vehicle, special_objects
+from commonroad.renderer import groundplane, markings, obstacle, traffic_sign, ego_vehicle, special_objects
+from commonroad.renderer.scene import SceneIndex
 # we assume that the road width config set here is the same used during the generation
 from commonroad.generator import road_generation
-from commonroad import schema
 from os import path, makedirs
 
-def generate_sdf(xml_content, target_dir, add_vehicle):
-    doc = schema.CreateFromDocument(xml_content)
-
-    content = groundplane.draw(doc, target_dir)
+def generate_sdf(doc, target_dir, add_vehicle, jobs=1, tile_cache=None,
+        png_level=groundplane.PNG_LEVEL, resolutions=(groundplane.PIXEL_PER_UNIT,),
+        marking_mode="texture", tile_times=None):
+    # doc is a commonroad.scenario.Scenario, see commonroad.reader
+    # tile_cache is a commonroad.renderer.tilecache.TileCache or None,
+    # tile_times a groundplane.TileTimes or None
+    # the ground of worlds/world.sdf has the first of the resolutions, the
+    # others go to worlds/world-<resolution>.sdf
+    # marking_mode "mesh" draws the markings as a mesh instead of ground
+    # textures, without resolutions
+    scene = SceneIndex(doc)
+    if marking_mode == "mesh":
+        resolutions = resolutions[:1]
+        grounds = [markings.draw(scene, target_dir)]
+    else:
+        grounds = groundplane.draw(scene, target_dir, jobs, tile_cache, png_level,
+            resolutions, tile_times)
+    content = ""
     if add_vehicle:
-        content += ego_vehicle.draw(target_dir, doc.lanelet)
+        content += ego_vehicle.draw(target_dir, scene)
     for obst in doc.obstacle:
         if obst.type != "blockedArea":
             content += obstacle.draw(obst)
     for sign in doc.trafficSign:
         content += traffic_sign.draw(sign, target_dir)
     for ramp in doc.ramp:
-        content += special_objects.draw_ramp(ramp.centerPoint.x, ramp.centerPoint.y, ramp.orientation, ramp.id)
+        content += special_objects.draw_ramp(ramp.centerPoint[0], ramp.centerPoint[1], ramp.orientation, ramp.id)
 
     if not path.exists(path.join(target_dir, "worlds")):
         makedirs(path.join(target_dir, "worlds"))
 
-    with open(path.join(target_dir, "worlds", "world.sdf"), "w+") as file:
-        file.write("<sdf version='1.6'><world name='default'>")
-        file.write(sun_light())
-        file.write(content)
-        file.write("</world></sdf>")
+    for (i, (resolution, ground)) in enumerate(zip(resolutions, grounds)):
+        name = "world.sdf" if i == 0 else "world-{0}.sdf".format(resolution)
+        with open(path.join(target_dir, "worlds", name), "w+") as file:
+            file.write("<sdf version='1.6'><world name='default'>")
+            file.write(sun_light())
+            file.write(ground)
+            file.write(content)
+            file.write("</world></sdf>")
 
 def sun_light():
     return """
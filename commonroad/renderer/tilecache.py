@@ -0,0 +1,122 @@
+"""Persistent cache of rendered ground tiles, shared between renders.
+
+Entries are keyed by a hash of the vector content of a tile: what is drawn
+on it, where the tile is and its resolution. A hit skips rasterization and
+PNG encoding. Each entry is one file holding the pixel hash the texture is
+named by and the PNG. The least recently used entries are removed once the
+cache grows beyond its size.
+"""
+import hashlib
+import numpy as np
+import os
+import struct
+from os import path
+
+# bump when drawing code changes the pixels of unchanged vector content
+VERSION = 7
+DEFAULT_SIZE = 1 << 30
+SUFFIX = ".tile"
+# references between objects that do not change what is drawn
+IGNORED = frozenset(["id", "predecessor", "successor", "adjacentLeft", "adjacentRight"])
+
+def _update(sha, value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        sha.update(repr(value).encode() + b";")
+    elif isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value, dtype=float)
+        sha.update("a{0};".format(value.shape).encode())
+        sha.update(value.tobytes())
+    elif isinstance(value, (tuple, list)):
+        sha.update("l{0};".format(len(value)).encode())
+        for item in value:
+            _update(sha, item)
+    elif hasattr(value, "__slots__"):
+        sha.update(type(value).__name__.encode() + b"{")
+        for name in value.__slots__:
+            if name not in IGNORED:
+                sha.update(name.encode() + b"=")
+                _update(sha, getattr(value, name))
+        sha.update(b"}")
+    else:
+        raise TypeError("cannot fingerprint {0}".format(type(value).__name__))
+
+def tile_key(origin, tile_size, pixel_per_unit, calls):
+    """Hash of a tile at world position `origin` (its lower left corner)
+    drawing the (function, argument) `calls`."""
+    sha = hashlib.sha256()
+    sha.update(struct.pack("<qddqd", VERSION, origin[0], origin[1],
+        tile_size, pixel_per_unit))
+    for (function, argument) in calls:
+        sha.update(function.__qualname__.encode() + b"(")
+        _update(sha, argument)
+        sha.update(b")")
+    return sha.hexdigest()
+
+class TileCache:
+    def __init__(self, directory, max_size=DEFAULT_SIZE):
+        """Cache in `directory`, created if missing, holding up to
+        `max_size` bytes."""
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return path.join(self.directory, key + SUFFIX)
+
+    def get(self, key):
+        """(pixel hash, PNG bytes) of `key`, None on a miss."""
+        try:
+            with open(self._path(key), "rb") as file:
+                content = file.read()
+            # mark as recently used
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            return None
+        (hash, _, png) = content.partition(b"\n")
+        return (hash.decode(), png)
+
+    def put(self, key, hash, png):
+        # written under a temporary name, other processes may read the entry
+        entry_path = self._path(key)
+        temporary_path = "{0}.{1}.tmp".format(entry_path, os.getpid())
+        with open(temporary_path, "wb") as file:
+            file.write(hash.encode() + b"\n")
+            file.write(png)
+        os.replace(temporary_path, entry_path)
+
+    def count(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def evict(self):
+        """Removes least recently used entries until the cache fits its
+        size, returns the number removed."""
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith(SUFFIX):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        size = sum(entry[1] for entry in entries)
+        removed = 0
+        for (_, entry_size, entry_path) in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+            removed += 1
+        self.evictions += removed
+        return removed
+
+    def statistics(self):
+        total = self.hits + self.misses
+        return "tile cache: {0} hits, {1} misses ({2:.0%} hit rate), {3} evicted".format(
+            self.hits, self.misses, self.hits / total if total else 0, self.evictions)
@@ -67,7 +67,7 @@ SIGN_MESHES = {
 
 
 def draw(sign, target_dir):
-    return model(sign.centerPoint.x, sign.centerPoint.y, 0.0, sign.orientation,
+    return model(sign.centerPoint[0], sign.centerPoint[1], 0.0, sign.orientation,
                  "Sign/{0}".format(sign.id), SIGN_MESHES[sign.type]["mesh"],
                  SIGN_MESHES[sign.type]["collision_box_pose"],
                  SIGN_MESHES[sign.type]["collision_box_size"])
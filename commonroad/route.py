@@ -0,0 +1,102 @@
+"""The driving route as a curve parameterized by arc length.
+
+The route starts at the isStart lanelet and follows the first successor of
+each lanelet. Its centerline is sampled at STEPS points per lanelet,
+midway between the equidistantly resampled left and right boundaries.
+
+    route = Route(doc)
+    (s, d) = route.project(points)        # d > 0 left of the route
+    (x, y, heading) = route.at(s)
+"""
+import numpy as np
+import shapely
+
+STEPS = 20
+
+def _resample(points, count):
+    lengths = np.concatenate(([0], np.cumsum(
+        np.linalg.norm(np.diff(points, axis=0), axis=1))))
+    marks = np.linspace(0, lengths[-1], count, endpoint=False)
+    return np.column_stack((np.interp(marks, lengths, points[:, 0]),
+        np.interp(marks, lengths, points[:, 1])))
+
+def centerline(lanelet, count=STEPS):
+    return (_resample(lanelet.leftBoundary.points, count)
+        + _resample(lanelet.rightBoundary.points, count)) / 2
+
+class Route:
+    def __init__(self, doc, start=None):
+        """Builds the route of `doc`, from the lanelet `start` if given."""
+        by_id = {lanelet.id: lanelet for lanelet in doc.lanelet}
+        lanelet = start
+        if lanelet is None:
+            lanelet = next((l for l in doc.lanelet if l.isStart), None)
+        self.lanelets = []
+        visited = set()
+        while lanelet is not None and lanelet.id not in visited:
+            visited.add(lanelet.id)
+            self.lanelets.append(lanelet)
+            lanelet = next((by_id[id] for id in lanelet.successor if id in by_id), None)
+        if not self.lanelets:
+            raise ValueError("scenario has no start lanelet")
+
+        points = np.concatenate([centerline(l) for l in self.lanelets])
+        lanelet_index = np.repeat(np.arange(len(self.lanelets)), STEPS)
+        # drop repeated points of degenerate lanelets, s increases strictly
+        keep = np.concatenate(([True], (np.diff(points, axis=0) != 0).any(axis=1)))
+        self.points = points[keep]
+        # index into self.lanelets per point
+        self.lanelet_index = lanelet_index[keep]
+
+        direction = np.diff(self.points, axis=0)
+        self.segment_length = np.linalg.norm(direction, axis=1)
+        self.s = np.concatenate(([0], np.cumsum(self.segment_length)))
+        self.length = float(self.s[-1])
+        # heading of the segment starting at each point, the last point
+        # keeps the heading of the last segment
+        segment_heading = np.arctan2(direction[:, 1], direction[:, 0])
+        self.heading = np.append(segment_heading,
+            segment_heading[-1:] if len(segment_heading) > 0 else [0.0])
+        if len(self.points) > 1:
+            self.curvature = np.gradient(np.unwrap(self.heading), self.s)
+        else:
+            self.curvature = np.zeros(len(self.points))
+        self._segment_tree = None
+
+    def at(self, s):
+        """Position and heading at arc lengths `s`, clamped to the route."""
+        s = np.clip(np.asarray(s, dtype=float), 0, self.length)
+        if len(self.segment_length) == 0:
+            return (np.full(s.shape, self.points[0, 0]),
+                np.full(s.shape, self.points[0, 1]), np.zeros(s.shape))
+        segment = np.minimum(np.searchsorted(self.s, s, side="right") - 1,
+            len(self.segment_length) - 1)
+        t = (s - self.s[segment]) / self.segment_length[segment]
+        start = self.points[segment]
+        position = start + t[..., None] * (self.points[segment + 1] - start)
+        return (position[..., 0], position[..., 1], self.heading[segment])
+
+    def project(self, points):
+        """Frenet coordinates of (n, 2) `points`: arc length `s` of the
+        nearest point on the route and signed lateral offset `d`, positive
+        to the left."""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        if len(self.segment_length) == 0:
+            delta = points - self.points[0]
+            return (np.zeros(len(points)), np.linalg.norm(delta, axis=1))
+        if self._segment_tree is None:
+            self._segment_tree = shapely.STRtree(shapely.linestrings(
+                np.stack((self.points[:-1], self.points[1:]), axis=1)))
+        (index, segment) = self._segment_tree.query_nearest(
+            shapely.points(points), all_matches=False)
+        order = np.argsort(index)
+        segment = segment[order]
+
+        start = self.points[segment]
+        direction = (self.points[segment + 1] - start) / self.segment_length[segment, None]
+        delta = points - start
+        along = np.clip((delta * direction).sum(axis=1), 0, self.segment_length[segment])
+        s = self.s[segment] + along
+        offset = delta - along[:, None] * direction
+        side = np.sign(direction[:, 0] * delta[:, 1] - direction[:, 1] * delta[:, 0])
+        return (s, side * np.linalg.norm(offset, axis=1))
@@ -0,0 +1,334 @@
+"""Lightweight in-memory CommonRoad scenario.
+
+Attribute names mirror the CommonRoad XML elements so that code written
+against the PyXB bindings reads the same. Point sequences are stored as
+(n, 2) float numpy arrays instead of lists of point objects.
+"""
+import numpy as np
+from collections import namedtuple
+
+ROAD_MARKING_TYPES = frozenset([
+    "10_zone_beginn", "20_zone_beginn", "40_zone_beginn", "50_zone_beginn",
+    "60_zone_beginn", "70_zone_beginn", "80_zone_beginn", "90_zone_beginn",
+    "ende_10_zone", "ende_20_zone", "ende_40_zone", "ende_50_zone",
+    "ende_60_zone", "ende_70_zone", "ende_80_zone", "ende_90_zone",
+    "stvo-274.1", "stvo-274.2", "turn_left", "turn_right"
+])
+
+AdjacentRef = namedtuple("AdjacentRef", ["ref", "drivingDir"])
+
+def as_points(points):
+    if len(points) == 0:
+        return np.empty((0, 2))
+    return np.asarray(points, dtype=float).reshape(-1, 2)
+
+def as_point(x, y):
+    return np.array([x, y], dtype=float)
+
+class Boundary:
+    __slots__ = ("points", "lineMarking")
+
+    def __init__(self, points=(), lineMarking=None):
+        self.points = as_points(points)
+        self.lineMarking = lineMarking
+
+class LineMarkingAttributes:
+    __slots__ = ("lineWidth", "segmentLength", "segmentGap")
+
+    def __init__(self, lineWidth, segmentLength, segmentGap):
+        self.lineWidth = lineWidth
+        self.segmentLength = segmentLength
+        self.segmentGap = segmentGap
+
+class Lanelet:
+    __slots__ = ("id", "type", "isStart", "leftBoundary", "rightBoundary",
+        "predecessor", "successor", "adjacentLeft", "adjacentRight",
+        "stopLine", "stopLineAttributes")
+
+    def __init__(self, leftBoundary=None, rightBoundary=None, type=None):
+        self.id = None
+        self.type = type
+        self.isStart = False
+        self.leftBoundary = leftBoundary if leftBoundary is not None else Boundary()
+        self.rightBoundary = rightBoundary if rightBoundary is not None else Boundary()
+        # lists of lanelet ids
+        self.predecessor = []
+        self.successor = []
+        self.adjacentLeft = None
+        self.adjacentRight = None
+        self.stopLine = None
+        self.stopLineAttributes = None
+
+class Rectangle:
+    __slots__ = ("length", "width", "orientation", "centerPoint")
+
+    def __init__(self, length, width, orientation, centerPoint):
+        self.length = length
+        self.width = width
+        self.orientation = orientation
+        self.centerPoint = np.asarray(centerPoint, dtype=float)
+
+class Circle:
+    __slots__ = ("radius", "centerPoint")
+
+    def __init__(self, radius, centerPoint):
+        self.radius = radius
+        self.centerPoint = np.asarray(centerPoint, dtype=float)
+
+class Polygon:
+    __slots__ = ("points",)
+
+    def __init__(self, points):
+        self.points = as_points(points)
+
+class Shape:
+    __slots__ = ("rectangle", "circle", "polygon")
+
+    def __init__(self, rectangle=None, circle=None, polygon=None):
+        self.rectangle = rectangle or []
+        self.circle = circle or []
+        self.polygon = polygon or []
+
+class Obstacle:
+    __slots__ = ("id", "role", "type", "shape")
+
+    def __init__(self, role, type, shape=None):
+        self.id = None
+        self.role = role
+        self.type = type
+        self.shape = shape if shape is not None else Shape()
+
+class TrafficSign:
+    __slots__ = ("id", "type", "orientation", "centerPoint")
+
+    def __init__(self, type, orientation, centerPoint):
+        self.id = None
+        self.type = type
+        self.orientation = orientation
+        self.centerPoint = np.asarray(centerPoint, dtype=float)
+
+class Ramp:
+    __slots__ = ("id", "orientation", "centerPoint")
+
+    def __init__(self, orientation, centerPoint):
+        self.id = None
+        self.orientation = orientation
+        self.centerPoint = np.asarray(centerPoint, dtype=float)
+
+class RoadMarking:
+    __slots__ = ("id", "type", "orientation", "centerPoint")
+
+    def __init__(self, type, orientation, centerPoint):
+        self.id = None
+        self.type = type
+        self.orientation = orientation
+        self.centerPoint = np.asarray(centerPoint, dtype=float)
+
+class IslandJunction:
+    # has no id in CommonRoad XML
+    __slots__ = ("points",)
+
+    def __init__(self, points=()):
+        self.points = as_points(points)
+
+class Scenario:
+    __slots__ = ("lanelet", "obstacle", "trafficSign", "ramp",
+        "islandJunction", "roadMarking")
+
+    def __init__(self):
+        self.lanelet = []
+        self.obstacle = []
+        self.trafficSign = []
+        self.ramp = []
+        self.islandJunction = []
+        self.roadMarking = []
+
+    def append(self, obj):
+        if isinstance(obj, Lanelet):
+            self.lanelet.append(obj)
+        elif isinstance(obj, Obstacle):
+            self.obstacle.append(obj)
+        elif isinstance(obj, TrafficSign):
+            self.trafficSign.append(obj)
+        elif isinstance(obj, Ramp):
+            self.ramp.append(obj)
+        elif isinstance(obj, IslandJunction):
+            self.islandJunction.append(obj)
+        elif isinstance(obj, RoadMarking):
+            self.roadMarking.append(obj)
+        else:
+            raise TypeError("unsupported scenario object: {0!r}".format(obj))
+
+def _base_array(array):
+    while array.base is not None:
+        array = array.base
+    return array
+
+def point_arrays(obj):
+    """All coordinate arrays of a scenario object (possibly sharing memory)."""
+    if isinstance(obj, Lanelet):
+        return [obj.leftBoundary.points, obj.rightBoundary.points]
+    elif isinstance(obj, Obstacle):
+        return ([rect.centerPoint for rect in obj.shape.rectangle]
+            + [circ.centerPoint for circ in obj.shape.circle]
+            + [poly.points for poly in obj.shape.polygon])
+    elif isinstance(obj, (TrafficSign, Ramp, RoadMarking)):
+        return [obj.centerPoint]
+    elif isinstance(obj, IslandJunction):
+        return [obj.points]
+    return []
+
+def transform_in_place(arrays, matrix):
+    """Applies the 3x3 affine `matrix` to all arrays.
+
+    Arrays that are views of the same buffer (e.g. the reversed centerline
+    shared by two paired lanelets) are transformed exactly once.
+    """
+    rotation = matrix[0:2, 0:2].T
+    translation = matrix[0:2, 2]
+    done = set()
+    for array in arrays:
+        base = _base_array(array)
+        if id(base) in done or base.size == 0:
+            continue
+        done.add(id(base))
+        base[...] = base.dot(rotation) + translation
+
+def to_schema(scenario):
+    """Converts to PyXB bindings; only needed for final serialization."""
+    from commonroad import schema
+
+    def point(p):
+        return schema.point(x=float(p[0]), y=float(p[1]))
+
+    def boundary(b):
+        result = schema.boundary()
+        for p in b.points:
+            result.point.append(point(p))
+        result.lineMarking = b.lineMarking
+        return result
+
+    def ref_list(ids):
+        result = schema.laneletRefList()
+        for id in ids:
+            result.lanelet.append(schema.laneletRef(ref=id))
+        return result
+
+    doc = schema.commonRoad()
+    doc.commonRoadVersion = "1.0"
+    for l in scenario.lanelet:
+        lanelet = schema.lanelet(id=l.id, leftBoundary=boundary(l.leftBoundary),
+            rightBoundary=boundary(l.rightBoundary))
+        if l.type is not None:
+            lanelet.type = l.type
+        if l.isStart:
+            lanelet.isStart = True
+        lanelet.predecessor = ref_list(l.predecessor)
+        lanelet.successor = ref_list(l.successor)
+        if l.adjacentLeft is not None:
+            lanelet.adjacentLeft = schema.laneletAdjacentRef(
+                ref=l.adjacentLeft.ref, drivingDir=l.adjacentLeft.drivingDir)
+        if l.adjacentRight is not None:
+            lanelet.adjacentRight = schema.laneletAdjacentRef(
+                ref=l.adjacentRight.ref, drivingDir=l.adjacentRight.drivingDir)
+        lanelet.stopLine = l.stopLine
+        if l.stopLineAttributes is not None:
+            lanelet.stopLineAttributes = schema.lineMarkingAttributes(
+                lineWidth=l.stopLineAttributes.lineWidth,
+                segmentLength=l.stopLineAttributes.segmentLength,
+                segmentGap=l.stopLineAttributes.segmentGap)
+        doc.append(lanelet)
+    for o in scenario.obstacle:
+        obstacle = schema.obstacle(id=o.id, role=o.role, type=o.type,
+            shape=schema.shape())
+        for rect in o.shape.rectangle:
+            obstacle.shape.rectangle.append(schema.rectangle(length=rect.length,
+                width=rect.width, orientation=float(rect.orientation),
+                centerPoint=point(rect.centerPoint)))
+        for circ in o.shape.circle:
+            obstacle.shape.circle.append(schema.circle(radius=circ.radius,
+                centerPoint=point(circ.centerPoint)))
+        for poly in o.shape.polygon:
+            polygon = schema.polygon()
+            for p in poly.points:
+                polygon.point.append(point(p))
+            obstacle.shape.polygon.append(polygon)
+        doc.append(obstacle)
+    for s in scenario.trafficSign:
+        doc.append(schema.trafficSign(id=s.id, type=s.type,
+            orientation=float(s.orientation), centerPoint=point(s.centerPoint)))
+    for r in scenario.ramp:
+        doc.append(schema.ramp(id=r.id, orientation=float(r.orientation),
+            centerPoint=point(r.centerPoint)))
+    for j in scenario.islandJunction:
+        junction = schema.trafficIslandJunction()
+        for p in j.points:
+            junction.point.append(point(p))
+        doc.append(junction)
+    for m in scenario.roadMarking:
+        doc.append(schema.roadMarking(id=m.id, type=m.type,
+            orientation=float(m.orientation), centerPoint=point(m.centerPoint)))
+    return doc
+
+def from_schema(doc):
+    """Converts PyXB bindings (schema.CreateFromDocument) to a Scenario."""
+    def points(ps):
+        return as_points([(p.x, p.y) for p in ps])
+
+    def point(p):
+        return as_point(p.x, p.y)
+
+    def boundary(b):
+        return Boundary(points(b.point), b.lineMarking)
+
+    def refs(ref_list):
+        if ref_list is None:
+            return []
+        return [int(ref.ref) for ref in ref_list.lanelet]
+
+    def adjacent(ref):
+        if ref is None:
+            return None
+        return AdjacentRef(int(ref.ref), ref.drivingDir)
+
+    result = Scenario()
+    for l in doc.lanelet:
+        lanelet = Lanelet(boundary(l.leftBoundary), boundary(l.rightBoundary),
+            l.type)
+        lanelet.id = int(l.id)
+        lanelet.isStart = bool(l.isStart)
+        lanelet.predecessor = refs(l.predecessor)
+        lanelet.successor = refs(l.successor)
+        lanelet.adjacentLeft = adjacent(l.adjacentLeft)
+        lanelet.adjacentRight = adjacent(l.adjacentRight)
+        lanelet.stopLine = l.stopLine
+        if l.stopLineAttributes is not None:
+            lanelet.stopLineAttributes = LineMarkingAttributes(
+                float(l.stopLineAttributes.lineWidth),
+                float(l.stopLineAttributes.segmentLength),
+                float(l.stopLineAttributes.segmentGap))
+        result.append(lanelet)
+    for o in doc.obstacle:
+        shape = Shape(
+            [Rectangle(float(r.length), float(r.width), float(r.orientation),
+                point(r.centerPoint)) for r in o.shape.rectangle],
+            [Circle(float(c.radius), point(c.centerPoint)) for c in o.shape.circle],
+            [Polygon(points(p.point)) for p in o.shape.polygon])
+        obstacle = Obstacle(o.role, o.type, shape)
+        obstacle.id = int(o.id)
+        result.append(obstacle)
+    for s in doc.trafficSign:
+        sign = TrafficSign(s.type, float(s.orientation), point(s.centerPoint))
+        sign.id = int(s.id)
+        result.append(sign)
+    for r in doc.ramp:
+        ramp = Ramp(float(r.orientation), point(r.centerPoint))
+        ramp.id = int(r.id)
+        result.append(ramp)
+    for j in doc.islandJunction:
+        result.append(IslandJunction(points(j.point)))
+    for m in doc.roadMarking:
+        marking = RoadMarking(m.type, float(m.orientation), point(m.centerPoint))
+        marking.id = int(m.id)
+        result.append(marking)
+    return result
@@ -0,0 +1,84 @@
+"""Spatial queries over the lanelets of a scenario, backed by R-trees.
+
+    index = spatial.LaneletIndex(doc)
+    lanelet = index.locate(points)            # containing lanelet per point
+    (lanelet, side, distance) = index.nearest_boundary(points)
+
+`doc` is a `commonroad.scenario.Scenario`, generated or read from a file.
+All queries take an (n, 2) array of points and return arrays of positions
+in `index.lanelets` (-1 where nothing was found), `index.ids` maps them to
+lanelet ids.
+"""
+import numpy as np
+import shapely
+
+LEFT = 0
+RIGHT = 1
+
+def _line(points):
+    # linestrings need two points
+    return points if len(points) > 1 else np.repeat(points, 2, axis=0)
+
+def _scatter(size, index, values, missing):
+    result = np.full(size, missing, dtype=np.int64 if missing == -1 else float)
+    result[index] = values
+    return result
+
+class LaneletIndex:
+    def __init__(self, doc, types=None):
+        """Indexes the lanelets of `doc`, only those with a type in `types`
+        if given (None is the type of normal driving lanelets)."""
+        self.lanelets = [l for l in doc.lanelet
+            if len(l.leftBoundary.points) > 0 and len(l.rightBoundary.points) > 0
+            and (types is None or l.type in types)]
+        self.ids = np.array([l.id for l in self.lanelets], dtype=np.int64)
+
+        # lanelet area between the left and the reversed right boundary
+        polygons = np.array([shapely.Polygon(np.concatenate((l.leftBoundary.points,
+            l.rightBoundary.points[::-1]))) for l in self.lanelets], dtype=object)
+        invalid = ~shapely.is_valid(polygons)
+        polygons[invalid] = shapely.make_valid(polygons[invalid])
+        self.polygons = polygons
+        self.polygon_tree = shapely.STRtree(polygons)
+
+        # boundary 2 * i is the left, 2 * i + 1 the right one of lanelet i
+        self.boundaries = np.array([shapely.LineString(_line(b.points))
+            for l in self.lanelets for b in (l.leftBoundary, l.rightBoundary)],
+            dtype=object)
+        self.boundary_tree = shapely.STRtree(self.boundaries)
+
+    def locate(self, points):
+        """The lanelet containing each point, the first one in scenario
+        order where lanelets overlap. Points on a boundary belong to both
+        lanelets sharing it."""
+        (point, lanelet) = self.locate_all(points)
+        # reversed so the first match is written last
+        return _scatter(len(np.asarray(points).reshape(-1, 2)),
+            point[::-1], lanelet[::-1], -1)
+
+    def locate_all(self, points):
+        """All (point, lanelet) index pairs where the lanelet contains the
+        point, sorted by point."""
+        geometries = shapely.points(np.asarray(points, dtype=float).reshape(-1, 2))
+        (point, lanelet) = self.polygon_tree.query(geometries, predicate="intersects")
+        order = np.lexsort((lanelet, point))
+        return (point[order], lanelet[order])
+
+    def nearest_lanelet(self, points):
+        """The nearest lanelet to each point and the distance to it, zero
+        for points inside a lanelet."""
+        geometries = shapely.points(np.asarray(points, dtype=float).reshape(-1, 2))
+        ((point, lanelet), distance) = self.polygon_tree.query_nearest(geometries,
+            return_distance=True, all_matches=False)
+        return (_scatter(len(geometries), point, lanelet, -1),
+            _scatter(len(geometries), point, distance, np.nan))
+
+    def nearest_boundary(self, points):
+        """The lanelet owning the nearest boundary to each point, which
+        boundary it is (LEFT or RIGHT) and the distance to it."""
+        geometries = shapely.points(np.asarray(points, dtype=float).reshape(-1, 2))
+        ((point, boundary), distance) = self.boundary_tree.query_nearest(geometries,
+            return_distance=True, all_matches=False)
+        return (_scatter(len(geometries), point, boundary // 2, -1),
+            _scatter(len(geometries), point, boundary % 2, -1),
+            _scatter(len(geometries), point, distance, np.nan))
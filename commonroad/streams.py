@@ -0,0 +1,88 @@
+"""Transparently compressed binary streams for the command line tools.
+
+Compression is taken from an explicit argument, from the file extension
+(.gz, .zst) when writing, or from the magic bytes when reading, so it also
+works on stdin/stdout pipes ("-"). Data is (de)compressed incrementally.
+zstd needs the optional `zstandard` package.
+"""
+import gzip, io, sys
+
+COMPRESSIONS = ["gzip", "zstd"]
+EXTENSIONS = {".gz": "gzip", ".zst": "zstd"}
+MAGICS = {b"\x1f\x8b": "gzip", b"\x28\xb5\x2f\xfd": "zstd"}
+DEFAULT_LEVELS = {"gzip": 6, "zstd": 3}
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstd compression requires the 'zstandard' package") from e
+    return zstandard
+
+def compression_from_name(name):
+    for (extension, compression) in EXTENSIONS.items():
+        if name.endswith(extension):
+            return compression
+    return None
+
+def strip_compression_extension(name):
+    for extension in EXTENSIONS:
+        if name.endswith(extension):
+            return name[:-len(extension)]
+    return name
+
+def detect_compression(file):
+    """Compression of a buffered binary file, judged by its magic bytes."""
+    head = file.peek(4)
+    for (magic, compression) in MAGICS.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+def open_input(name="-", compression=None):
+    """Opens a file name or "-" (stdin) for binary reading.
+
+    The returned stream is buffered (supports peek) and decompressed
+    according to `compression`, which is detected if not given.
+    """
+    file = sys.stdin.buffer if name == "-" else open(name, "rb")
+    if compression is None:
+        compression = detect_compression(file)
+    if compression is None:
+        return file
+    elif compression == "gzip":
+        if name == "-":
+            return gzip.GzipFile(fileobj=file, mode="rb")
+        file.close()
+        return gzip.GzipFile(name, mode="rb")
+    elif compression == "zstd":
+        reader = _zstandard().ZstdDecompressor().stream_reader(file,
+            closefd=name != "-")
+        return io.BufferedReader(reader)
+    raise ValueError("unknown compression: {0}".format(compression))
+
+def open_output(name="-", compression=None, level=None):
+    """Opens a file name or "-" (stdout) for binary writing.
+
+    Without `compression` it is chosen by the extension of `name`; pass
+    "none" to force uncompressed output.
+    """
+    if compression is None:
+        compression = compression_from_name(name)
+    if compression == "none":
+        compression = None
+    if level is None and compression is not None:
+        level = DEFAULT_LEVELS[compression]
+    if compression is None:
+        return sys.stdout.buffer if name == "-" else open(name, "wb")
+    elif compression == "gzip":
+        # fixed mtime keeps the output reproducible
+        if name == "-":
+            return gzip.GzipFile(fileobj=sys.stdout.buffer, mode="wb",
+                compresslevel=level, mtime=0)
+        return gzip.GzipFile(name, mode="wb", compresslevel=level, mtime=0)
+    elif compression == "zstd":
+        file = sys.stdout.buffer if name == "-" else open(name, "wb")
+        return _zstandard().ZstdCompressor(level=level).stream_writer(file,
+            closefd=name != "-")
+    raise ValueError("unknown compression: {0}".format(compression))
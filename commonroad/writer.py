@@ -0,0 +1,179 @@
+"""Streaming CommonRoad XML writer.
+
+Writes a `commonroad.scenario.Scenario` element by element straight to a
+text file, without building PyXB bindings or a DOM first. Elements are
+emitted in the order required by schema-extended.xsd.
+"""
+
+# xml.sax.saxutils would pull in urllib and http.client at start-up
+def escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+def quoteattr(text):
+    return '"{0}"'.format(escape(text).replace('"', "&quot;")
+        .replace("\n", "&#10;").replace("\r", "&#13;").replace("\t", "&#9;"))
+
+def float_formatter(spec=None):
+    """Returns a function formatting floats, e.g. spec=".4f" or ".9g".
+
+    Without spec floats are written with repr precision.
+    """
+    if spec is None:
+        return repr
+    return lambda value: format(value, spec)
+
+class Writer:
+    def __init__(self, file, pretty=True, float_format=None):
+        self._file = file
+        self._pretty = pretty
+        self._format = float_format if float_format is not None else repr
+        self._level = 0
+        self._point_templates = {}
+
+    def _indent(self):
+        return "\t" * self._level if self._pretty else ""
+
+    def _newline(self):
+        return "\n" if self._pretty else ""
+
+    def _attributes(self, attributes):
+        return "".join(" {0}={1}".format(k, quoteattr(str(v)))
+            for (k, v) in attributes)
+
+    def start(self, tag, attributes=()):
+        self._file.write("{0}<{1}{2}>{3}".format(self._indent(), tag,
+            self._attributes(attributes), self._newline()))
+        self._level += 1
+
+    def end(self, tag):
+        self._level -= 1
+        self._file.write("{0}</{1}>{2}".format(self._indent(), tag,
+            self._newline()))
+
+    def empty(self, tag, attributes=()):
+        self._file.write("{0}<{1}{2}/>{3}".format(self._indent(), tag,
+            self._attributes(attributes), self._newline()))
+
+    def text(self, tag, value):
+        self._file.write("{0}<{1}>{2}</{1}>{3}".format(self._indent(), tag,
+            escape(str(value)), self._newline()))
+
+    def number(self, tag, value):
+        self.text(tag, self._format(float(value)))
+
+    def points(self, tag, points):
+        template = self._point_templates.get((tag, self._level))
+        if template is None:
+            if self._pretty:
+                indent = self._indent()
+                template = ("{0}<{1}>\n{0}\t<x>{{0}}</x>\n{0}\t<y>{{1}}</y>\n"
+                    "{0}</{1}>\n").format(indent, tag)
+            else:
+                template = "<{0}><x>{{0}}</x><y>{{1}}</y></{0}>".format(tag)
+            self._point_templates[(tag, self._level)] = template
+        fmt = self._format
+        self._file.write("".join(template.format(fmt(x), fmt(y))
+            for (x, y) in points.tolist()))
+
+    def write_declaration(self):
+        self._file.write('<?xml version="1.0" encoding="UTF-8"?>' +
+            self._newline())
+
+def write_boundary(w, tag, boundary):
+    w.start(tag)
+    w.points("point", boundary.points)
+    if boundary.lineMarking is not None:
+        w.text("lineMarking", boundary.lineMarking)
+    w.end(tag)
+
+def write_ref_list(w, tag, ids):
+    if len(ids) == 0:
+        w.empty(tag)
+        return
+    w.start(tag)
+    for id in ids:
+        w.empty("lanelet", [("ref", id)])
+    w.end(tag)
+
+def write_lanelet(w, lanelet):
+    w.start("lanelet", [("id", lanelet.id)])
+    if lanelet.type is not None:
+        w.text("type", lanelet.type)
+    if lanelet.isStart:
+        w.text("isStart", "true")
+    write_boundary(w, "leftBoundary", lanelet.leftBoundary)
+    write_boundary(w, "rightBoundary", lanelet.rightBoundary)
+    write_ref_list(w, "predecessor", lanelet.predecessor)
+    write_ref_list(w, "successor", lanelet.successor)
+    for (tag, adjacent) in [("adjacentLeft", lanelet.adjacentLeft),
+            ("adjacentRight", lanelet.adjacentRight)]:
+        if adjacent is not None:
+            w.empty(tag, [("drivingDir", adjacent.drivingDir),
+                ("ref", adjacent.ref)])
+    if lanelet.stopLine is not None:
+        w.text("stopLine", lanelet.stopLine)
+    if lanelet.stopLineAttributes is not None:
+        w.start("stopLineAttributes")
+        w.number("lineWidth", lanelet.stopLineAttributes.lineWidth)
+        w.number("segmentLength", lanelet.stopLineAttributes.segmentLength)
+        w.number("segmentGap", lanelet.stopLineAttributes.segmentGap)
+        w.end("stopLineAttributes")
+    w.end("lanelet")
+
+def write_center_point(w, point):
+    w.points("centerPoint", point.reshape(1, 2))
+
+def write_obstacle(w, obstacle):
+    w.start("obstacle", [("id", obstacle.id)])
+    w.text("role", obstacle.role)
+    w.text("type", obstacle.type)
+    w.start("shape")
+    for rect in obstacle.shape.rectangle:
+        w.start("rectangle")
+        w.number("length", rect.length)
+        w.number("width", rect.width)
+        w.number("orientation", rect.orientation)
+        write_center_point(w, rect.centerPoint)
+        w.end("rectangle")
+    for circle in obstacle.shape.circle:
+        w.start("circle")
+        w.number("radius", circle.radius)
+        write_center_point(w, circle.centerPoint)
+        w.end("circle")
+    for polygon in obstacle.shape.polygon:
+        w.start("polygon")
+        w.points("point", polygon.points)
+        w.end("polygon")
+    w.end("shape")
+    w.end("obstacle")
+
+def write_oriented(w, tag, obj, with_type=True):
+    w.start(tag, [("id", obj.id)])
+    if with_type:
+        w.text("type", obj.type)
+    w.number("orientation", obj.orientation)
+    write_center_point(w, obj.centerPoint)
+    w.end(tag)
+
+def write_island_junction(w, junction):
+    w.start("islandJunction")
+    w.points("point", junction.points)
+    w.end("islandJunction")
+
+def write(scenario, file, pretty=True, float_format=None):
+    w = Writer(file, pretty, float_format)
+    w.write_declaration()
+    w.start("commonRoad", [("commonRoadVersion", "1.0")])
+    for lanelet in scenario.lanelet:
+        write_lanelet(w, lanelet)
+    for obstacle in scenario.obstacle:
+        write_obstacle(w, obstacle)
+    for sign in scenario.trafficSign:
+        write_oriented(w, "trafficSign", sign)
+    for ramp in scenario.ramp:
+        write_oriented(w, "ramp", ramp, with_type=False)
+    for junction in scenario.islandJunction:
+        write_island_junction(w, junction)
+    for marking in scenario.roadMarking:
+        write_oriented(w, "roadMarking", marking)
+    w.end("commonRoad")
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+from multiprocessing import Pool
+import argparse, os
+
+# commonroad modules are imported where needed to keep --help fast
+
+def convert_file(name):
+    from commonroad import corpus, reader
+    return corpus.scenario_rows(reader.read_file(name), name)
+
+def generate_scenario(task):
+    from commonroad import corpus, api
+    (preset, name) = task
+    return corpus.scenario_rows(api.generate(preset), name)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export scenarios as Parquet tables for corpus analytics")
+    parser.add_argument("input", nargs="*",
+        help="CommonRoad XML or binary scenarios, may be compressed")
+    parser.add_argument("--output", "-o", required=True,
+        help="directory for the .parquet files")
+    parser.add_argument("--preset",
+        help="generate scenarios from this preset instead of reading files")
+    parser.add_argument("--count", type=int, default=1,
+        help="number of scenarios to generate with --preset")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    if args.preset is not None:
+        prefix = os.path.splitext(os.path.basename(args.preset))[0]
+        tasks = [(args.preset, "{0}-{1:06d}".format(prefix, i))
+            for i in range(args.count)]
+        function = generate_scenario
+    else:
+        tasks = args.input
+        function = convert_file
+
+    from commonroad import corpus
+    from tqdm import tqdm
+
+    with Pool(args.jobs) as pool, corpus.CorpusWriter(args.output) as writer:
+        for rows in tqdm(pool.imap(function, tasks, chunksize=8),
+                total=len(tasks)):
+            writer.add_rows(rows)
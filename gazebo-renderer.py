@@ -1,15 +1,39 @@
 #!/usr/bin/env python3
-from commonroad.renderer import sdf
+from commonroad import streams
 import argparse, sys, os
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Generate Gazebo SDF files from CommonRoad XML")
-    parser.add_argument("input", nargs="?", type=argparse.FileType("r"),
-        default=sys.stdin)
+    parser.add_argument("input", nargs="?", default="-",
+        help="CommonRoad XML or binary scenario, may be gzip or zstd "
+        "compressed (default: stdin)")
     parser.add_argument("--output", "-o", required=True)
     parser.add_argument("--force", "-f", action="store_true")
     parser.add_argument("--add_vehicle", "-av", action="store_true")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(),
+        help="processes rendering ground tiles (default: number of CPUs)")
+    parser.add_argument("--tile-cache", metavar="DIR",
+        help="directory of rendered ground tiles reused across renders")
+    parser.add_argument("--tile-cache-size", type=int, default=1024, metavar="MB",
+        help="size of the tile cache, least recently used tiles are removed "
+        "beyond it (default: 1024)")
+    parser.add_argument("--png-level", type=int, default=6, choices=range(10),
+        metavar="0-9", help="zlib compression of the ground textures, 1 is "
+        "fastest, 9 smallest (default: 6)")
+    parser.add_argument("--resolution", type=int, nargs="+", default=[500],
+        metavar="PX_PER_M", help="ground texture resolutions, rendered in one pass "
+        "and downsampled from the highest, which the others must divide by a "
+        "power of two. The first goes into worlds/world.sdf, the others into "
+        "worlds/world-<resolution>.sdf (default: 500)")
+    parser.add_argument("--markings", choices=["texture", "mesh"], default="texture",
+        help="draw road markings into ground textures or as one mesh on a "
+        "plain ground, which is much faster and resolution independent "
+        "(default: texture)")
+    parser.add_argument("--compression", choices=streams.COMPRESSIONS,
+        help="input compression (default: detected)")
+    parser.add_argument("--pyxb", action="store_true",
+        help="parse with the full PyXB bindings instead of the fast reader")
     args = parser.parse_args()
 
     os.makedirs(args.output, exist_ok=True)
@@ -18,7 +42,19 @@ if __name__ == "__main__":
         print("Use --force")
         sys.exit(1)
 
-    with args.input as input_file:
-        xml = input_file.read()
+    # imported after argument parsing to keep --help and errors fast
+    from commonroad import reader
+    from commonroad.renderer import groundplane, sdf, tilecache
 
-    sdf.generate_sdf(xml, args.output, args.add_vehicle)
+    doc = reader.read_file(args.input, args.compression, args.pyxb)
+    tile_cache = None
+    if args.tile_cache:
+        tile_cache = tilecache.TileCache(args.tile_cache, args.tile_cache_size << 20)
+    tile_times = groundplane.TileTimes()
+
+    sdf.generate_sdf(doc, args.output, args.add_vehicle, args.jobs, tile_cache,
+        args.png_level, args.resolution, args.markings, tile_times)
+    if tile_times.raster:
+        print(tile_times.statistics(), file=sys.stderr)
+    if tile_cache:
+        print(tile_cache.statistics(), file=sys.stderr)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+from commonroad import streams
+import argparse, sys, os
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate a randomized road from a preset file and render "
+        "it as Gazebo world in one step")
+    parser.add_argument("input", nargs="?", default="-",
+        help="preset file, may be compressed (default: stdin)")
+    parser.add_argument("--output", "-o", required=True)
+    parser.add_argument("--seed", type=int,
+        help="random seed, the same seed gives the same world")
+    parser.add_argument("--force", "-f", action="store_true")
+    parser.add_argument("--add_vehicle", "-av", action="store_true")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(),
+        help="processes rendering ground tiles (default: number of CPUs)")
+    parser.add_argument("--tile-cache", metavar="DIR",
+        help="directory of rendered ground tiles reused across renders")
+    parser.add_argument("--tile-cache-size", type=int, default=1024, metavar="MB",
+        help="size of the tile cache, least recently used tiles are removed "
+        "beyond it (default: 1024)")
+    parser.add_argument("--png-level", type=int, default=6, choices=range(10),
+        metavar="0-9", help="zlib compression of the ground textures, 1 is "
+        "fastest, 9 smallest (default: 6)")
+    parser.add_argument("--resolution", type=int, nargs="+", default=[500],
+        metavar="PX_PER_M", help="ground texture resolutions, rendered in one pass "
+        "and downsampled from the highest, which the others must divide by a "
+        "power of two. The first goes into worlds/world.sdf, the others into "
+        "worlds/world-<resolution>.sdf (default: 500)")
+    parser.add_argument("--markings", choices=["texture", "mesh"], default="texture",
+        help="draw road markings into ground textures or as one mesh on a "
+        "plain ground, which is much faster and resolution independent "
+        "(default: texture)")
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    if os.listdir(args.output) != [] and not args.force:
+        print("Output directory is not empty.")
+        print("Use --force")
+        sys.exit(1)
+
+    # imported after argument parsing to keep --help and errors fast
+    from commonroad import api
+    from commonroad.renderer import groundplane, tilecache
+
+    with streams.open_input(args.input) as input_file:
+        doc = api.generate(input_file, args.seed)
+    tile_cache = None
+    if args.tile_cache:
+        tile_cache = tilecache.TileCache(args.tile_cache, args.tile_cache_size << 20)
+    tile_times = groundplane.TileTimes()
+    api.render(doc, args.output, args.add_vehicle, args.jobs, tile_cache,
+        args.png_level, args.resolution, args.markings, tile_times)
+    if tile_times.raster:
+        print(tile_times.statistics(), file=sys.stderr)
+    if tile_cache:
+        print(tile_cache.statistics(), file=sys.stderr)
@@ -1,73 +1,71 @@
 #!/usr/bin/env python3
-import sys, argparse
-from commonroad import schema
-from commonroad.generator import road_generation, preset_parser
-import pkg_resources
-from lxml import etree
-import xml.dom.minidom
-
-SCHEMA = etree.XMLSchema(etree.parse(pkg_resources.resource_stream(
-    "commonroad.generator", "template-schema.xsd")))
-
-class Config:
-    def __init__(self):
-        self.road_width = 0.4
-        # TODO: move this to an enum in the generated pyxb schema
-        self.turn_road_marking_width = 0.072
-
+import sys, argparse, io
+from commonroad import streams
 
 def main():
     parser = argparse.ArgumentParser(
         description="Generate a randomized CommonRoad XML from a preset file")
-    parser.add_argument("input", nargs="?", type=argparse.FileType("r"),
-        default=sys.stdin)
-    parser.add_argument("--output", "-o", type=argparse.FileType("w"),
-        default=sys.stdout)
+    parser.add_argument("input", nargs="?", default="-",
+        help="preset file, may be compressed (default: stdin)")
+    parser.add_argument("--output", "-o", default="-",
+        help="output file (default: stdout)")
+    parser.add_argument("--format", choices=["xml", "binary"],
+        help="output format (default: binary for .crb files, else xml)")
+    parser.add_argument("--seed", type=int,
+        help="random seed, the same seed gives the same scenario")
+    parser.add_argument("--simplify", type=float, metavar="TOLERANCE",
+        help="simplify lanelet boundaries, allowing TOLERANCE metres deviation")
+    rounding = parser.add_mutually_exclusive_group()
+    rounding.add_argument("--decimals", type=int, metavar="N",
+        help="round coordinates, orientations and sizes to N decimal places; "
+        "curve points are millimetres apart and need N >= 3")
+    rounding.add_argument("--significant-digits", type=int, metavar="N",
+        help="round coordinates, orientations and sizes to N significant "
+        "digits; curve points are millimetres apart, N must resolve "
+        "millimetres at the largest coordinates")
+    parser.add_argument("--compact", action="store_true",
+        help="write XML without indentation")
+    parser.add_argument("--float-format", metavar="SPEC",
+        help="format spec for floats, e.g. '.4f' (default: full precision)")
+    parser.add_argument("--compression", choices=streams.COMPRESSIONS + ["none"],
+        help="compress the output (default: by extension, .gz or .zst)")
+    parser.add_argument("--compression-level", type=int, metavar="LEVEL")
     args = parser.parse_args()
 
-    parser = etree.XMLParser(schema=SCHEMA)
-    root = etree.parse(args.input, parser)
-
-    primitives = road_generation.generate(root)
+    # imported after argument parsing to keep --help and errors fast
+    from commonroad import writer, binary, api
+    from commonroad.generator import simplify, precision
 
-    doc = schema.commonRoad()
-    doc.commonRoadVersion = "1.0"
-    #doc.append(ego_vehicle())
-    id = 0
-    lanelet_pairs = []
-    for p in primitives:
-        export = p.export(Config())
-        lanelet_pairs += export.lanelet_pairs
-        for obj in export.objects:
-            id -= 1
-            obj.id = id
-            doc.append(obj)
+    with streams.open_input(args.input) as input_file:
+        doc = api.generate(input_file, args.seed)
 
-    # adjacents
-    for pair in lanelet_pairs:
-        pair[0].adjacentLeft = schema.laneletAdjacentRef(ref=pair[1].id, drivingDir="opposite")
-        pair[1].adjacentLeft = schema.laneletAdjacentRef(ref=pair[0].id, drivingDir="opposite")
-        pair[0].successor = schema.laneletRefList()
-        pair[0].predecessor = schema.laneletRefList()
-        pair[1].successor = schema.laneletRefList()
-        pair[1].predecessor = schema.laneletRefList()
+    if args.simplify is not None:
+        stats = simplify.simplify_lanelets(doc.lanelet, args.simplify)
+        print(stats, file=sys.stderr)
 
-    # right lanes
-    for i in range(len(lanelet_pairs)-1):
-        lanelet_pairs[i][0].successor.lanelet.append(schema.laneletRef(ref=lanelet_pairs[i+1][0].id))
-        lanelet_pairs[i+1][0].predecessor.lanelet.append(schema.laneletRef(ref=lanelet_pairs[i][0].id))
+    if args.decimals is not None or args.significant_digits is not None:
+        try:
+            precision.quantize(doc, args.decimals, args.significant_digits)
+        except ValueError as e:
+            parser.error(str(e))
 
-    # left lanes
-    for i in range(len(lanelet_pairs)-1, 0, -1):
-        lanelet_pairs[i][1].successor.lanelet.append(schema.laneletRef(ref=lanelet_pairs[i-1][1].id))
-        lanelet_pairs[i-1][1].predecessor.lanelet.append(schema.laneletRef(ref=lanelet_pairs[i][1].id))
+    output_format = args.format
+    if output_format is None:
+        output_name = streams.strip_compression_extension(args.output)
+        output_format = "binary" if output_name.endswith(binary.EXTENSION) else "xml"
 
-    with args.output as file:
-        doc_parsed = xml.dom.minidom.parseString(doc.toxml())
-        prettyfied_xml = doc_parsed.toprettyxml()
-        file.write(prettyfied_xml)
+    with streams.open_output(args.output, args.compression,
+            args.compression_level) as file:
+        if output_format == "binary":
+            binary.write(doc, file)
+        else:
+            text = io.TextIOWrapper(file, encoding="utf-8")
+            writer.write(doc, text, pretty=not args.compact,
+                float_format=writer.float_formatter(args.float_format))
+            text.detach()
 
 def ego_vehicle():
+    from commonroad import schema
     shape = schema.shape()
     shape.rectangle.append(schema.rectangle(length=0.4, width=0.4,
         orientation=0, centerPoint=schema.point(x=0, y=0)))